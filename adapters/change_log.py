@@ -0,0 +1,31 @@
+from typing import Dict, List, Any, Optional
+
+
+class ChangeLog:
+    """Журнал изменений с последовательными версиями; хранит не более max_entries последних записей."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: List[Dict[str, Any]] = []
+        self._first_version = 1
+
+    def append(self, change: Dict[str, Any]) -> int:
+        self.version += 1
+        change["version"] = self.version
+        self._entries.append(change)
+
+        if len(self._entries) > self.max_entries:
+            # Удаляем сразу половину, чтобы не сдвигать список при каждой записи
+            dropped = len(self._entries) - self.max_entries // 2
+            del self._entries[:dropped]
+            self._first_version += dropped
+
+        return self.version
+
+    def since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        if version >= self.version:
+            return []
+        if version + 1 < self._first_version:
+            return None
+        return self._entries[max(version + 1 - self._first_version, 0):]
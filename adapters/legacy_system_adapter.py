@@ -1,4 +1,12 @@
-from typing import Dict, List, Any
+import copy
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Callable, Set, Tuple, Mapping, Optional
+
+from adapters.read_views import InventoryView, StaffView, freeze
+from adapters.change_log import ChangeLog
+from adapters.shift_intervals import ShiftIntervalIndex, Interval, shift_intervals, describe_interval
 
 
 class LegacyInventorySystem:
@@ -17,6 +25,10 @@ class LegacyInventorySystem:
                 "plastic_utensils": {"qty": 150, "unit": "pcs", "min_qty": 50}
             }
         }
+        self.change_log = ChangeLog()
+
+    def _log_change(self, category: str, name: str, new_qty: float):
+        self.change_log.append({"category": category, "name": name, "qty": new_qty})
 
     def get_product_quantity(self, product_name: str) -> float:
         if product_name in self._inventory["products"]:
@@ -26,6 +38,7 @@ class LegacyInventorySystem:
     def update_product_quantity(self, product_name: str, new_qty: float) -> bool:
         if product_name in self._inventory["products"]:
             self._inventory["products"][product_name]["qty"] = new_qty
+            self._log_change("products", product_name, new_qty)
             return True
         return False
 
@@ -37,13 +50,116 @@ class LegacyInventorySystem:
     def update_supply_quantity(self, supply_name: str, new_qty: int) -> bool:
         if supply_name in self._inventory["supplies"]:
             self._inventory["supplies"][supply_name]["qty"] = new_qty
+            self._log_change("supplies", supply_name, new_qty)
             return True
         return False
 
+    def update_quantities(self, updates: Dict[Tuple[str, str], float]) -> bool:
+        success = True
+        for (category, name), new_qty in updates.items():
+            if name in self._inventory.get(category, {}):
+                self._inventory[category][name]["qty"] = new_qty
+                self._log_change(category, name, new_qty)
+            else:
+                success = False
+        return success
+
 
 class InventoryAdapter:
-    def __init__(self, legacy_system: LegacyInventorySystem):
+    CATEGORY_NAMES = {
+        "products": "Продукты",
+        "supplies": "Расходные материалы"
+    }
+
+    def __init__(self, legacy_system: LegacyInventorySystem,
+                 on_low_stock_change: Callable[[Dict[str, Any], bool], None] = None,
+                 write_behind: bool = False, flush_interval: float = 1.0, max_pending: int = 1000):
         self.legacy_system = legacy_system
+        self.on_low_stock_change = None
+        self._low_stock: Dict[Tuple[str, str], bool] = {}
+        self.version = 0
+        self._snapshot = None
+
+        # В режиме отложенной записи чтение и запись идут в локальную копию,
+        # а накопленные изменения периодически отправляются в устаревшую систему пачкой
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._store = copy.deepcopy(legacy_system._inventory) if write_behind else legacy_system._inventory
+        self._pending: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        # Держится на время всей отправки: иначе старая пачка может дойти позже новой
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._stop_flushing = threading.Event()
+        self._flush_thread = None
+        self._view = InventoryView(self._store)
+
+        for category, items in self._store.items():
+            for name in items:
+                self._refresh_low_stock(category, name)
+
+        self.on_low_stock_change = on_low_stock_change
+
+        if write_behind and flush_interval:
+            self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flush_thread.start()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = time.monotonic()
+
+            if pending and not self.legacy_system.update_quantities(pending):
+                # Неотправленная пачка возвращается в очередь, более новые значения сохраняются
+                with self._lock:
+                    for key, quantity in pending.items():
+                        self._pending.setdefault(key, quantity)
+                print(f"Ошибка записи {len(pending)} позиций инвентаря в устаревшую систему, повтор при следующей отправке")
+                return 0
+        return len(pending)
+
+    def close(self):
+        if self._flush_thread is not None:
+            self._stop_flushing.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush()
+
+    def _get_quantity(self, category: str, name: str) -> float:
+        item = self._store[category].get(name)
+        return item["qty"] if item is not None else 0
+
+    def _write_quantity(self, category: str, name: str, quantity: float) -> bool:
+        if self.write_behind:
+            with self._lock:
+                item = self._store[category].get(name)
+                if item is None:
+                    return False
+                item["qty"] = quantity
+                self._pending[(category, name)] = quantity
+                flush_due = (len(self._pending) >= self.max_pending
+                             or time.monotonic() - self._last_flush >= self.flush_interval)
+            if flush_due:
+                self.flush()
+            return True
+
+        if category == "products":
+            return self.legacy_system.update_product_quantity(name, quantity)
+        return self.legacy_system.update_supply_quantity(name, quantity)
+
+    def get_inventory_view(self) -> InventoryView:
+        return self._view
+
+    def get_inventory_snapshot(self) -> Tuple[int, Mapping]:
+        if self._snapshot is None or self._snapshot[0] != self.version:
+            self._snapshot = (self.version, freeze(self._view))
+        return self._snapshot
 
     def get_all_inventory(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
         result = {
@@ -51,14 +167,14 @@ class InventoryAdapter:
             "Расходные материалы": {}
         }
 
-        for product_name, product_data in self.legacy_system._inventory["products"].items():
+        for product_name, product_data in self._store["products"].items():
             result["Продукты"][product_name] = {
                 "quantity": product_data["qty"],
                 "unit": product_data["unit"],
                 "min_quantity": product_data["min_qty"]
             }
 
-        for supply_name, supply_data in self.legacy_system._inventory["supplies"].items():
+        for supply_name, supply_data in self._store["supplies"].items():
             result["Расходные материалы"][supply_name] = {
                 "quantity": supply_data["qty"],
                 "unit": supply_data["unit"],
@@ -68,42 +184,127 @@ class InventoryAdapter:
         return result
 
     def update_product(self, name: str, quantity: float) -> bool:
-        return self.legacy_system.update_product_quantity(name, quantity)
+        if self._write_quantity("products", name, quantity):
+            self.version += 1
+            self._refresh_low_stock("products", name)
+            return True
+        return False
 
     def update_supply(self, name: str, quantity: int) -> bool:
-        return self.legacy_system.update_supply_quantity(name, quantity)
+        if self._write_quantity("supplies", name, quantity):
+            self.version += 1
+            self._refresh_low_stock("supplies", name)
+            return True
+        return False
+
+    def changes_since(self, version: int) -> Tuple[int, Optional[List[Dict[str, Any]]]]:
+        """Изменения инвентаря после указанной версии.
+
+        Возвращает текущую версию и список изменений; None вместо списка означает,
+        что журнал уже не содержит нужных записей и данные нужно перечитать целиком.
+        """
+        if self.write_behind:
+            self.flush()
+
+        change_log = self.legacy_system.change_log
+        changes = change_log.since(version)
+        if changes is None:
+            return change_log.version, None
+
+        return change_log.version, [
+            {
+                "version": change["version"],
+                "category": self.CATEGORY_NAMES[change["category"]],
+                "name": change["name"],
+                "quantity": change["qty"]
+            }
+            for change in changes
+        ]
 
     def get_low_stock_items(self) -> List[Dict[str, Any]]:
-        low_stock = []
-        inventory = self.get_all_inventory()
-
-        for name, data in inventory["Продукты"].items():
-            if data["quantity"] < data["min_quantity"]:
-                low_stock.append({
-                    "name": name,
-                    "category": "Продукты",
-                    "current": data["quantity"],
-                    "minimum": data["min_quantity"],
-                    "unit": data["unit"]
-                })
-
-        for name, data in inventory["Расходные материалы"].items():
-            if data["quantity"] < data["min_quantity"]:
-                low_stock.append({
-                    "name": name,
-                    "category": "Расходные материалы",
-                    "current": data["quantity"],
-                    "minimum": data["min_quantity"],
-                    "unit": data["unit"]
-                })
-
-        return low_stock
+        return [self._low_stock_entry(category, name) for category, name in self._low_stock]
+
+    def _low_stock_entry(self, category: str, name: str) -> Dict[str, Any]:
+        data = self._store[category][name]
+        return {
+            "name": name,
+            "category": self.CATEGORY_NAMES[category],
+            "current": data["qty"],
+            "minimum": data["min_qty"],
+            "unit": data["unit"]
+        }
+
+    def _refresh_low_stock(self, category: str, name: str):
+        data = self._store[category][name]
+        key = (category, name)
+        is_low = data["qty"] < data["min_qty"]
+
+        if is_low == (key in self._low_stock):
+            return
+
+        if is_low:
+            self._low_stock[key] = True
+        else:
+            del self._low_stock[key]
+
+        if self.on_low_stock_change:
+            self.on_low_stock_change(self._low_stock_entry(category, name), is_low)
+
+    def find_shortages(self, requirements: Dict[str, float]) -> Dict[str, float]:
+        shortages = {}
+        for product_name, quantity in requirements.items():
+            available = self._get_quantity("products", product_name)
+            if available < quantity:
+                shortages[product_name] = quantity - available
+        return shortages
+
+    def reserve_products(self, requirements: Dict[str, float]) -> bool:
+        current = {
+            product_name: self._get_quantity("products", product_name)
+            for product_name in requirements
+        }
+        for product_name, quantity in requirements.items():
+            if current[product_name] < quantity:
+                return False
+
+        applied = []
+        for product_name, quantity in requirements.items():
+            if not self.update_product(product_name, current[product_name] - quantity):
+                for applied_name in reversed(applied):
+                    self.update_product(applied_name, current[applied_name])
+                return False
+            applied.append(product_name)
+
+        return True
+
+    def reserve_products_batch(self, requirements_list: List[Dict[str, float]]) -> List[bool]:
+        # Каждый набор резервируется целиком или не резервируется вовсе; в устаревшую
+        # систему записывается только итоговый остаток по каждому продукту
+        current: Dict[str, float] = {}
+        results = []
+
+        for requirements in requirements_list:
+            for product_name in requirements:
+                if product_name not in current:
+                    current[product_name] = self._get_quantity("products", product_name)
+
+            reserved = all(current[name] >= quantity for name, quantity in requirements.items())
+            if reserved:
+                for product_name, quantity in requirements.items():
+                    current[product_name] -= quantity
+            results.append(reserved)
+
+        for product_name, quantity in current.items():
+            if quantity != self._get_quantity("products", product_name):
+                self.update_product(product_name, quantity)
+
+        return results
 
     def use_product_for_order(self, product_name: str, quantity: float) -> bool:
-        current_qty = self.legacy_system.get_product_quantity(product_name)
+        current_qty = self._get_quantity("products", product_name)
         if current_qty >= quantity:
             new_qty = current_qty - quantity
-            return self.legacy_system.update_product_quantity(product_name, new_qty)
+            return self.update_product(product_name, new_qty)
         return False
 
 
@@ -124,6 +325,13 @@ class LegacyEmployeeSystem:
             "4": [{"date": "2025-04-10", "start": "18:00", "end": "02:00"}],
             "5": [{"date": "2025-04-10", "start": "10:00", "end": "19:00"}]
         }
+        self.change_log = ChangeLog()
+
+        self._intervals = ShiftIntervalIndex()
+        intervals, _ = shift_intervals([
+            dict(shift, emp_id=emp_id) for emp_id, shifts in self._shifts.items() for shift in shifts
+        ])
+        self._intervals.add_many(intervals)
 
     def get_employee(self, emp_id: str) -> Dict:
         return self._employees.get(emp_id, {})
@@ -132,22 +340,99 @@ class LegacyEmployeeSystem:
         return self._shifts.get(emp_id, [])
 
     def add_shift(self, emp_id: str, date: str, start: str, end: str) -> bool:
-        if emp_id in self._employees:
-            if emp_id not in self._shifts:
-                self._shifts[emp_id] = []
-
-            self._shifts[emp_id].append({
-                "date": date,
-                "start": start,
-                "end": end
-            })
-            return True
-        return False
+        return self.add_shifts([{"emp_id": emp_id, "date": date, "start": start, "end": end}])
+
+    def check_shifts(self, shifts: List[Dict[str, str]]) -> List[str]:
+        """Проверить пакет смен: формат, сотрудника и пересечения между собой и с уже назначенными."""
+        errors = [f"Сотрудник {shift['emp_id']} не найден"
+                  for shift in shifts if shift["emp_id"] not in self._employees]
+        intervals, parse_errors = shift_intervals(shifts)
+        errors.extend(parse_errors)
+
+        for interval, other in self._intervals.find_batch_conflicts(intervals):
+            errors.append(f"Смена {describe_interval(interval)} пересекается со сменой {describe_interval(other)}")
+        return errors
+
+    def add_shifts(self, shifts: List[Dict[str, str]]) -> bool:
+        # Пакет применяется целиком или не применяется вовсе
+        if any(shift["emp_id"] not in self._employees for shift in shifts):
+            return False
+
+        intervals, parse_errors = shift_intervals(shifts)
+        if parse_errors or self._intervals.find_batch_conflicts(intervals):
+            return False
+
+        if len(intervals) == 1:
+            self._intervals.add(intervals[0])
+        else:
+            self._intervals.add_many(intervals)
+
+        for _, _, emp_id, shift in intervals:
+            self._shifts.setdefault(emp_id, []).append(shift)
+            self.change_log.append({"emp_id": emp_id, "shift": dict(shift)})
+        return True
+
+    def get_shifts_at(self, moment: datetime) -> List[Interval]:
+        return self._intervals.working_at(moment)
+
+    def get_shifts_between(self, start: datetime, end: datetime) -> List[Interval]:
+        return self._intervals.overlapping(start, end)
 
 
 class StaffAdapter:
     def __init__(self, legacy_system: LegacyEmployeeSystem):
         self.legacy_system = legacy_system
+        self.version = 0
+        self._view = StaffView(self.legacy_system._employees, self.legacy_system._shifts)
+        self._snapshot = None
+
+        # Индексы "дата -> смены" и "должность -> сотрудники" догоняют устаревшую систему
+        # по журналу изменений, поэтому учитывают и смены, добавленные в обход адаптера
+        self._shifts_by_date: Dict[str, Dict[str, Dict]] = {}
+        self._staff_by_role: Dict[str, List[str]] = {}
+        self._employee_rank: Dict[str, int] = {}
+        self._indexed_version = 0
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        self._shifts_by_date = {}
+        self._staff_by_role = {}
+        self._employee_rank = {}
+
+        for rank, (emp_id, emp_data) in enumerate(self.legacy_system._employees.items()):
+            self._employee_rank[emp_id] = rank
+            self._staff_by_role.setdefault(emp_data["position"], []).append(emp_id)
+            for shift in self.legacy_system.get_employee_shifts(emp_id):
+                self._index_shift(emp_id, shift)
+
+        self._indexed_version = self.legacy_system.change_log.version
+
+    def _index_shift(self, emp_id: str, shift: Dict):
+        # Для даты хранится первая смена сотрудника, как и при полном просмотре
+        self._shifts_by_date.setdefault(shift["date"], {}).setdefault(emp_id, shift)
+
+    def _sync_indexes(self):
+        if len(self._employee_rank) != len(self.legacy_system._employees):
+            self._rebuild_indexes()
+            return
+
+        changes = self.legacy_system.change_log.since(self._indexed_version)
+        if changes is None:
+            self._rebuild_indexes()
+            return
+
+        for change in changes:
+            self._index_shift(change["emp_id"], change["shift"])
+        if changes:
+            self._indexed_version = changes[-1]["version"]
+
+    def get_staff_view(self) -> StaffView:
+        return self._view
+
+    def get_staff_snapshot(self) -> Tuple[int, Tuple]:
+        if self._snapshot is None or self._snapshot[0] != self.version:
+            self._snapshot = (self.version, freeze(self._view))
+        return self._snapshot
 
     def get_all_staff(self) -> List[Dict[str, Any]]:
         result = []
@@ -167,27 +452,84 @@ class StaffAdapter:
 
         return result
 
-    def get_staff_by_role(self, role: str) -> List[Dict[str, Any]]:
-        all_staff = self.get_all_staff()
-        return [staff for staff in all_staff if staff["role"] == role]
+    def changes_since(self, version: int) -> Tuple[int, Optional[List[Dict[str, Any]]]]:
+        change_log = self.legacy_system.change_log
+        changes = change_log.since(version)
+        if changes is None:
+            return change_log.version, None
+
+        return change_log.version, [
+            {
+                "version": change["version"],
+                "id": change["emp_id"],
+                "shift_date": change["shift"]["date"],
+                "shift_start": change["shift"]["start"],
+                "shift_end": change["shift"]["end"]
+            }
+            for change in changes
+        ]
+
+    def get_staff_by_role(self, role: str) -> List[Mapping]:
+        self._sync_indexes()
+        return [self._view.get(emp_id) for emp_id in self._staff_by_role.get(role, [])]
 
     def get_staff_on_shift(self, date: str) -> List[Dict[str, Any]]:
-        all_staff = self.get_all_staff()
+        self._sync_indexes()
+        shifts = self._shifts_by_date.get(date, {})
+        result = []
+
+        for emp_id in sorted(shifts, key=self._employee_rank.__getitem__):
+            staff = self._view.get(emp_id)
+            shift = shifts[emp_id]
+            result.append({
+                "id": emp_id,
+                "name": staff["name"],
+                "role": staff["role"],
+                "shift_start": shift["start"],
+                "shift_end": shift["end"]
+            })
+
+        return result
+
+    def get_busy_days(self, start_day: date, end_day: date) -> Set[Tuple[str, date]]:
+        """Пары (сотрудник, день), в которые у сотрудника есть хотя бы часть любой смены."""
+        range_start = datetime.combine(start_day, datetime.min.time())
+        range_end = datetime.combine(end_day + timedelta(days=1), datetime.min.time())
+
+        busy = set()
+        for shift_start, shift_end, emp_id, _ in self.legacy_system.get_shifts_between(range_start, range_end):
+            day = max(shift_start, range_start).date()
+            # Смена, заканчивающаяся ровно в полночь, следующий день не занимает
+            last_day = (min(shift_end, range_end) - timedelta(microseconds=1)).date()
+            while day <= last_day:
+                busy.add((emp_id, day))
+                day += timedelta(days=1)
+        return busy
+
+    def get_staff_working_at(self, moment: datetime) -> List[Dict[str, Any]]:
         result = []
 
-        for staff in all_staff:
-            for shift in staff["shifts"]:
-                if shift["date"] == date:
-                    result.append({
-                        "id": staff["id"],
-                        "name": staff["name"],
-                        "role": staff["role"],
-                        "shift_start": shift["start"],
-                        "shift_end": shift["end"]
-                    })
-                    break
+        for _, _, emp_id, shift in self.legacy_system.get_shifts_at(moment):
+            staff = self._view.get(emp_id)
+            result.append({
+                "id": emp_id,
+                "name": staff["name"],
+                "role": staff["role"],
+                "shift_date": shift["date"],
+                "shift_start": shift["start"],
+                "shift_end": shift["end"]
+            })
 
         return result
 
     def schedule_shift(self, staff_id: str, date: str, start_time: str, end_time: str) -> bool:
-        return self.legacy_system.add_shift(staff_id, date, start_time, end_time)
+        return self.import_schedule([{"emp_id": staff_id, "date": date, "start": start_time, "end": end_time}])
+
+    def import_schedule(self, shifts: List[Dict[str, str]]) -> bool:
+        if self.legacy_system.add_shifts(shifts):
+            self.version += 1
+            return True
+
+        for error in self.legacy_system.check_shifts(shifts):
+            print(error)
+        return False
@@ -0,0 +1,161 @@
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterator
+
+INVENTORY_CATEGORIES = {
+    "Продукты": "products",
+    "Расходные материалы": "supplies"
+}
+
+INVENTORY_ITEM_KEYS = {
+    "quantity": "qty",
+    "unit": "unit",
+    "min_quantity": "min_qty"
+}
+
+
+class InventoryItemView(Mapping):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[INVENTORY_ITEM_KEYS[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(INVENTORY_ITEM_KEYS)
+
+    def __len__(self) -> int:
+        return len(INVENTORY_ITEM_KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class InventoryCategoryView(Mapping):
+    __slots__ = ("_items", "_views")
+
+    def __init__(self, items: Dict[str, Dict[str, Any]]):
+        self._items = items
+        self._views: Dict[str, InventoryItemView] = {}
+
+    def __getitem__(self, name: str) -> InventoryItemView:
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = InventoryItemView(self._items[name])
+        return view
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class InventoryView(Mapping):
+    """Представление инвентаря только для чтения: ключи переводятся при обращении, данные не копируются."""
+
+    __slots__ = ("_categories",)
+
+    def __init__(self, inventory: Dict[str, Dict[str, Dict[str, Any]]]):
+        self._categories = {
+            name: InventoryCategoryView(inventory[legacy_name])
+            for name, legacy_name in INVENTORY_CATEGORIES.items()
+        }
+
+    def __getitem__(self, category: str) -> InventoryCategoryView:
+        return self._categories[category]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class StaffMemberView(Mapping):
+    __slots__ = ("_emp_id", "_data", "_shifts")
+
+    KEYS = ("id", "name", "role", "salary", "shifts")
+
+    def __init__(self, emp_id: str, data: Dict[str, Any], shifts: Dict[str, List[Dict]]):
+        self._emp_id = emp_id
+        self._data = data
+        self._shifts = shifts
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "id":
+            return self._emp_id
+        if key == "role":
+            return self._data["position"]
+        if key == "shifts":
+            # Смены меняются только через систему (журнал изменений, индексы), поэтому наружу - копия только для чтения
+            return tuple(MappingProxyType(shift) for shift in self._shifts.get(self._emp_id, ()))
+        if key in ("name", "salary"):
+            return self._data[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class StaffView(Sequence):
+    """Список сотрудников только для чтения поверх данных устаревшей системы."""
+
+    __slots__ = ("_employees", "_shifts", "_views", "_ids")
+
+    def __init__(self, employees: Dict[str, Dict[str, Any]], shifts: Dict[str, List[Dict]]):
+        self._employees = employees
+        self._shifts = shifts
+        self._views: Dict[str, StaffMemberView] = {}
+        self._ids: List[str] = list(employees)
+
+    def _emp_ids(self) -> List[str]:
+        # Устаревшая система сотрудников не удаляет, а только добавляет, поэтому достаточно сверить размер
+        if len(self._ids) != len(self._employees):
+            self._ids = list(self._employees)
+        return self._ids
+
+    def get(self, emp_id: str) -> StaffMemberView:
+        view = self._views.get(emp_id)
+        if view is None and emp_id in self._employees:
+            view = self._views[emp_id] = StaffMemberView(emp_id, self._employees[emp_id], self._shifts)
+        return view
+
+    def __getitem__(self, index):
+        emp_ids = self._emp_ids()
+        if isinstance(index, slice):
+            return [self.get(emp_id) for emp_id in emp_ids[index]]
+        return self.get(emp_ids[index])
+
+    def __iter__(self) -> Iterator[StaffMemberView]:
+        for emp_id in self._employees:
+            yield self.get(emp_id)
+
+    def __len__(self) -> int:
+        return len(self._employees)
+
+    def __repr__(self) -> str:
+        return repr([dict(member) for member in self])
+
+
+def freeze(value: Any) -> Any:
+    """Глубокая копия только для чтения: словари становятся MappingProxyType, списки — кортежами."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        return tuple(freeze(item) for item in value)
+    return value
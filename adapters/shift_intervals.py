@@ -0,0 +1,112 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as Date, datetime, time, timedelta
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Tuple
+
+MAX_SHIFT_DURATION = timedelta(days=1)
+
+# (начало, конец, ID сотрудника, смена в формате устаревшей системы)
+Interval = Tuple[datetime, datetime, str, Dict[str, str]]
+
+
+def parse_shift(date: str, start: str, end: str) -> Tuple[datetime, datetime]:
+    """Границы смены; если конец не позже начала, смена заканчивается на следующий день."""
+    # fromisoformat в разы быстрее strptime, что заметно при импорте больших расписаний
+    day = Date.fromisoformat(date)
+    start_at = datetime.combine(day, time.fromisoformat(start))
+    end_at = datetime.combine(day, time.fromisoformat(end))
+    if end_at <= start_at:
+        end_at += timedelta(days=1)
+    return start_at, end_at
+
+
+class ShiftIntervalIndex:
+    """Смены каждого сотрудника, упорядоченные по началу, и общий список смен по началу.
+
+    Смена длится не больше суток, поэтому смены, идущие в момент t, начинаются
+    в интервале (t - 1 день, t] и находятся двоичным поиском.
+    """
+
+    def __init__(self):
+        self._by_employee: Dict[str, List[Interval]] = {}
+        self._by_start: List[Interval] = []
+
+    def find_conflict(self, emp_id: str, start: datetime, end: datetime) -> Optional[Interval]:
+        intervals = self._by_employee.get(emp_id, [])
+        position = bisect_left(intervals, start, key=itemgetter(0))
+
+        if position > 0 and intervals[position - 1][1] > start:
+            return intervals[position - 1]
+        if position < len(intervals) and intervals[position][0] < end:
+            return intervals[position]
+        return None
+
+    def find_batch_conflicts(self, intervals: List[Interval]) -> List[Tuple[Interval, Interval]]:
+        conflicts = []
+        by_employee: Dict[str, List[Interval]] = {}
+        for interval in intervals:
+            by_employee.setdefault(interval[2], []).append(interval)
+
+        for emp_id, new_intervals in by_employee.items():
+            new_intervals.sort(key=itemgetter(0))
+            for previous, current in zip(new_intervals, new_intervals[1:]):
+                if previous[1] > current[0]:
+                    conflicts.append((current, previous))
+            for interval in new_intervals:
+                existing = self.find_conflict(emp_id, interval[0], interval[1])
+                if existing is not None:
+                    conflicts.append((interval, existing))
+
+        return conflicts
+
+    def add(self, interval: Interval):
+        insort(self._by_employee.setdefault(interval[2], []), interval, key=itemgetter(0))
+        insort(self._by_start, interval, key=itemgetter(0))
+
+    def add_many(self, intervals: List[Interval]):
+        by_employee: Dict[str, List[Interval]] = {}
+        for interval in intervals:
+            by_employee.setdefault(interval[2], []).append(interval)
+
+        # Сортировка слиянием упорядоченных серий укладывается в O(n log n)
+        for emp_id, new_intervals in by_employee.items():
+            existing = self._by_employee.setdefault(emp_id, [])
+            existing.extend(new_intervals)
+            existing.sort(key=itemgetter(0))
+
+        self._by_start.extend(intervals)
+        self._by_start.sort(key=itemgetter(0))
+
+    def working_at(self, moment: datetime) -> List[Interval]:
+        low = bisect_right(self._by_start, moment - MAX_SHIFT_DURATION, key=itemgetter(0))
+        high = bisect_right(self._by_start, moment, key=itemgetter(0))
+        return [interval for interval in self._by_start[low:high] if interval[1] > moment]
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Interval]:
+        """Смены, пересекающиеся с полуинтервалом [start, end)."""
+        low = bisect_right(self._by_start, start - MAX_SHIFT_DURATION, key=itemgetter(0))
+        high = bisect_left(self._by_start, end, key=itemgetter(0))
+        return [interval for interval in self._by_start[low:high] if interval[1] > start]
+
+    def __len__(self) -> int:
+        return len(self._by_start)
+
+
+def describe_interval(interval: Interval) -> str:
+    shift = interval[3]
+    return f"сотрудник {interval[2]}, {shift['date']} {shift['start']}-{shift['end']}"
+
+
+def shift_intervals(shifts: List[Dict[str, Any]]) -> Tuple[List[Interval], List[str]]:
+    intervals = []
+    errors = []
+    for shift in shifts:
+        record = {"date": shift["date"], "start": shift["start"], "end": shift["end"]}
+        try:
+            start_at, end_at = parse_shift(record["date"], record["start"], record["end"])
+        except ValueError:
+            errors.append(f"Некорректные дата или время смены: сотрудник {shift['emp_id']}, "
+                          f"{record['date']} {record['start']}-{record['end']}")
+            continue
+        intervals.append((start_at, end_at, shift["emp_id"], record))
+    return intervals, errors
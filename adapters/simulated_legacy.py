@@ -0,0 +1,38 @@
+import time
+from typing import Dict, Tuple
+
+from adapters.legacy_system_adapter import LegacyInventorySystem
+
+
+class SimulatedLatencyInventorySystem(LegacyInventorySystem):
+    """Устаревшая система инвентаря с искусственной задержкой на каждое обращение."""
+
+    def __init__(self, latency: float = 0.001):
+        super().__init__()
+        self.latency = latency
+        self.calls = 0
+
+    def _round_trip(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def get_product_quantity(self, product_name: str) -> float:
+        self._round_trip()
+        return super().get_product_quantity(product_name)
+
+    def update_product_quantity(self, product_name: str, new_qty: float) -> bool:
+        self._round_trip()
+        return super().update_product_quantity(product_name, new_qty)
+
+    def get_supply_quantity(self, supply_name: str) -> int:
+        self._round_trip()
+        return super().get_supply_quantity(supply_name)
+
+    def update_supply_quantity(self, supply_name: str, new_qty: int) -> bool:
+        self._round_trip()
+        return super().update_supply_quantity(supply_name, new_qty)
+
+    def update_quantities(self, updates: Dict[Tuple[str, str], float]) -> bool:
+        # Пакет изменений отправляется за одно обращение
+        self._round_trip()
+        return super().update_quantities(updates)
@@ -0,0 +1,52 @@
+import argparse
+import io
+import json
+import random
+
+from benchmarks.common import default_menu_items, silenced
+from facade.restaurant_facade import RestaurantFacade
+from services.batch_runner import BatchRunner, format_batch_stats
+
+
+def make_day_script(orders: int, seed: int) -> list:
+    rng = random.Random(seed)
+    dishes = [item.name for item in default_menu_items()]
+
+    lines = []
+    for product in ("tomatoes", "potatoes", "onions", "beef", "chicken"):
+        lines.append(json.dumps({"op": "update_inventory", "category": "Продукты",
+                                 "name": product, "quantity": orders * 2.0}, ensure_ascii=False))
+
+    for _ in range(orders):
+        lines.append(f"create_order {rng.randint(1, 40)}")
+        for dish in rng.sample(dishes, rng.randint(1, 3)):
+            lines.append(f'add_item $last "{dish}" {rng.randint(1, 2)}')
+        lines.append("submit $last")
+        lines.append("complete $last")
+        lines.append("deliver $last")
+        lines.append(f"pay $last {rng.choice(['cash', 'online'])}")
+
+    lines.append("sales_report 1")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизведение дня операций в пакетном режиме")
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    lines = make_day_script(args.orders, args.seed)
+    facade = RestaurantFacade()
+    errors = io.StringIO()
+    with silenced():
+        stats = BatchRunner(facade, errors=errors).run(lines)
+    facade.shutdown()
+
+    print(format_batch_stats(stats))
+    if errors.getvalue():
+        print(errors.getvalue()[:1000])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+from datetime import date
+
+from benchmarks.common import silenced
+from facade.restaurant_facade import RestaurantFacade
+from services.day_simulator import DaySimulator
+
+
+def simulate(scale: float, seed: int, instrumented: bool):
+    facade = RestaurantFacade()
+    if instrumented:
+        facade.enable_instrumentation()
+    with silenced():
+        stats = DaySimulator(facade, seed=seed, day=date(2025, 4, 10), scale=scale).run()
+    facade.shutdown()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость проигрывания модельного дня")
+    parser.add_argument("--scales", default="1,5,20,50", help="множители потока гостей через запятую")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'масштаб':>8} {'заказов':>8} {'замеры':>7} {'время, с':>9} {'вызовов/с':>10} {'заказов/с':>10}")
+    for scale in (float(value) for value in args.scales.split(",")):
+        for instrumented in (False, True):
+            stats = simulate(scale, args.seed, instrumented)
+            wall = stats["wall_seconds"]
+            print(f"{scale:>8g} {stats['orders']:>8} {'да' if instrumented else 'нет':>7} {wall:>9.3f} "
+                  f"{stats['facade_calls'] / wall:>10,.0f} {stats['orders'] / wall:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
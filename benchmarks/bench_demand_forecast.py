@@ -0,0 +1,47 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import make_order_manager
+from facade.restaurant_facade import RestaurantFacade
+from services.demand_forecast import DemandForecaster
+
+
+def fit_incrementally(forecaster: DemandForecaster, orders, today) -> DemandForecaster:
+    for order in orders:
+        forecaster.record_order(order, order.creation_time)
+    forecaster.daily_rates(today)
+    return forecaster
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Прогноз расхода ингредиентов по истории заказов")
+    parser.add_argument("--orders", type=int, default=500_000)
+    parser.add_argument("--days", type=int, default=3 * 365)
+    args = parser.parse_args()
+
+    recipe_book = RestaurantFacade().recipe_book
+    end = datetime.now()
+    orders = make_order_manager(args.orders, days=args.days, end=end - timedelta(days=1)).get_all_orders()
+    today = end.date()
+
+    started = time.perf_counter()
+    vectorized = DemandForecaster(recipe_book)
+    vectorized.fit(orders, today)
+    vectorized_rates = vectorized.daily_rates(today)
+    vectorized_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    incremental_rates = fit_incrementally(DemandForecaster(recipe_book), orders, today).daily_rates(today)
+    incremental_elapsed = time.perf_counter() - started
+
+    print(f"История: {len(orders)} заказов за {args.days} дней")
+    print(f"Векторный проход: {vectorized_elapsed:.3f} с")
+    print(f"Построчное обновление: {incremental_elapsed:.3f} с "
+          f"({len(orders) / incremental_elapsed:,.0f} заказов/с)")
+    for name, rate in vectorized_rates.items():
+        print(f"  {name}: {rate:.3f} в день (построчно: {incremental_rates[name]:.3f})")
+
+
+if __name__ == "__main__":
+    main()
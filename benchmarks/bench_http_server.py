@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from typing import List, Tuple
+
+from server.http_server import RestaurantHTTPServer
+
+
+def build_request(method: str, path: str, body: dict = None) -> bytes:
+    payload = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(payload)}\r\n"
+    if payload:
+        head += "Content-Type: application/json\r\n"
+    return (head + "\r\n").encode("latin-1") + payload
+
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    return status, await reader.readexactly(length)
+
+
+async def connection_worker(host: str, port: int, requests: List[bytes], pipeline: int,
+                            deadline: float, counters: dict):
+    reader, writer = await asyncio.open_connection(host, port)
+    index = 0
+    try:
+        while time.perf_counter() < deadline:
+            # Отправляем пачку запросов подряд и только потом читаем ответы
+            batch = [requests[(index + offset) % len(requests)] for offset in range(pipeline)]
+            index += pipeline
+            writer.write(b"".join(batch))
+            await writer.drain()
+            for _ in batch:
+                status, _ = await read_response(reader)
+                counters["responses"] += 1
+                if status >= 400:
+                    counters["errors"] += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, requests: List[bytes], connections: int,
+                   pipeline: int, duration: float) -> dict:
+    counters = {"responses": 0, "errors": 0}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        connection_worker(host, port, requests, pipeline, started + duration, counters)
+        for _ in range(connections)
+    ))
+    counters["elapsed"] = time.perf_counter() - started
+    return counters
+
+
+def start_server_thread() -> RestaurantHTTPServer:
+    server = RestaurantHTTPServer(port=0)
+    ready = threading.Event()
+
+    def serve():
+        async def main():
+            await server.start()
+            ready.set()
+            await server.serve_forever()
+        asyncio.run(main())
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP/JSON API")
+    parser.add_argument("--host", default=None, help="адрес уже запущенного сервера; по умолчанию запускается локальный")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--pipeline", type=int, default=8, help="запросов в конвейере на соединение")
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    host, port = args.host, args.port
+    if host is None:
+        server = start_server_thread()
+        host, port = server.host, server.port
+
+    scenarios = (
+        ("GET /health", [build_request("GET", "/health")]),
+        ("GET /menu", [build_request("GET", "/menu")]),
+        ("смешанная нагрузка", [
+            build_request("POST", "/orders", {"table_number": 7}),
+            build_request("GET", "/orders/1"),
+            build_request("GET", "/inventory"),
+            build_request("GET", "/inventory/low-stock"),
+            build_request("GET", "/staff/on-shift?date=2025-04-10")
+        ])
+    )
+
+    for name, requests in scenarios:
+        for pipeline in sorted({1, args.pipeline}):
+            result = asyncio.run(run_load(host, port, requests, args.connections, pipeline, args.duration))
+            print(f"{name:>20}, конвейер {pipeline:>2}: {result['responses'] / result['elapsed']:,.0f} запросов/с "
+                  f"({result['responses']} ответов, ошибок: {result['errors']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+
+from benchmarks.common import best_of, silenced
+from facade.restaurant_facade import RestaurantFacade
+
+
+def make_facade(mode: str, orders: int) -> RestaurantFacade:
+    facade = RestaurantFacade()
+    with silenced():
+        for product in facade.check_inventory()["Продукты"]:
+            facade.update_inventory_item("Продукты", product, orders * 10.0)
+    if mode in ("enabled", "disabled"):
+        facade.enable_instrumentation()
+    if mode == "disabled":
+        facade.disable_instrumentation()
+    return facade
+
+
+def order_cycle(facade: RestaurantFacade, dish_names, orders: int):
+    with silenced():
+        for i in range(orders):
+            order_id = facade.create_order(i % 40 + 1).order_id
+            facade.add_item_to_order(order_id, dish_names[i % len(dish_names)], 2)
+            facade.add_item_to_order(order_id, dish_names[(i * 7) % len(dish_names)], 1)
+            facade.submit_order_to_kitchen(order_id)
+            facade.complete_order(order_id)
+            facade.deliver_order(order_id)
+            facade.process_payment(order_id, "cash")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Накладные расходы инструментации фасада")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = {}
+    for mode in ("off", "enabled", "disabled"):
+        def run():
+            facade = make_facade(mode, args.orders)
+            dish_names = [item.name for item in facade.menu.get_all_items()]
+            order_cycle(facade, dish_names, args.orders)
+            return facade
+
+        elapsed, facade = best_of(run, args.repeat)
+        timings[mode] = elapsed
+        print(f"{mode:>9}: {elapsed / args.orders * 1e6:8.1f} мкс на заказ "
+              f"(+{(elapsed / timings['off'] - 1) * 100:5.1f}%)")
+
+    facade = make_facade("enabled", args.orders)
+    order_cycle(facade, [item.name for item in facade.menu.get_all_items()], 50)
+    print()
+    print(facade.get_metrics())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import time
+
+from adapters.legacy_system_adapter import LegacyInventorySystem, InventoryAdapter
+from benchmarks.common import make_order_manager
+from facade.restaurant_facade import RestaurantFacade
+
+
+def stocked_adapter(quantity: float) -> InventoryAdapter:
+    legacy_system = LegacyInventorySystem()
+    for product in legacy_system._inventory["products"].values():
+        product["qty"] = quantity
+    return InventoryAdapter(legacy_system)
+
+
+def deduct_per_item(adapter: InventoryAdapter, recipe_book, orders) -> int:
+    deducted = 0
+    for order in orders:
+        for item in order.items:
+            for product_name, quantity in recipe_book.get_recipe(item.menu_item.name).items():
+                adapter.use_product_for_order(product_name, quantity * item.quantity)
+        deducted += 1
+    return deducted
+
+
+def deduct_batched(adapter: InventoryAdapter, recipe_book, orders) -> int:
+    deducted = 0
+    for order in orders:
+        if adapter.reserve_products(recipe_book.get_requirements(order)):
+            deducted += 1
+    return deducted
+
+
+def deduct_whole_batch(facade: RestaurantFacade, orders) -> int:
+    return sum(facade.reserve_ingredients(orders))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Списание продуктов по рецептам")
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--stock", type=float, default=None,
+                        help="запас каждого продукта; по умолчанию хватает на все заказы")
+    args = parser.parse_args()
+
+    facade = RestaurantFacade()
+    recipe_book = facade.recipe_book
+    orders = make_order_manager(args.orders, days=30).get_all_orders()
+    stock = args.stock if args.stock is not None else float(args.orders * 10)
+
+    modes = (
+        ("по позициям", lambda adapter: deduct_per_item(adapter, recipe_book, orders)),
+        ("заказ за проход", lambda adapter: deduct_batched(adapter, recipe_book, orders)),
+        ("все заказы за проход", lambda adapter: deduct_whole_batch(facade, orders))
+    )
+    for name, deduct in modes:
+        adapter = facade.inventory_adapter = stocked_adapter(stock)
+        started = time.perf_counter()
+        deducted = deduct(adapter)
+        elapsed = time.perf_counter() - started
+        remaining = {name: round(data["quantity"], 3) for name, data in adapter.get_inventory_view()["Продукты"].items()}
+        print(f"{name:>20}: {deducted} заказов за {elapsed:.3f} с ({deducted / elapsed:,.0f} заказов/с), "
+              f"остаток {remaining}")
+
+
+if __name__ == "__main__":
+    main()
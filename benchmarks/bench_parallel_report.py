@@ -0,0 +1,50 @@
+import argparse
+import os
+from datetime import datetime, timedelta
+
+from benchmarks.common import make_order_manager, best_of
+from services.parallel_report import ParallelReportExecutor
+from services.report_service import ReportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Параллельный отчет по продажам: ускорение по числу процессов")
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Генерация {args.orders} заказов за {args.days} дней (ядер: {os.cpu_count()})...")
+    order_manager = make_order_manager(args.orders, args.days)
+    report_service = ReportService(order_manager)
+    for order in order_manager.orders.values():
+        order.mark_as_paid("Наличные")
+        report_service.record_paid_order(order)
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=args.days)
+    expected = report_service.generate_sales_report(start_date, end_date)
+    render = report_service.generators["sales"].render_summary
+    orders = order_manager.get_all_orders()
+
+    # Базовая строка - тот же подсчет в текущем процессе, без пула
+    inline = ParallelReportExecutor(1)
+    baseline, summary = best_of(lambda: inline.summarize_sales(orders, start_date, end_date), args.repeat)
+    assert render(summary) == expected, "Отчет без пула не совпадает с агрегатами"
+    print(f"{'без пула':>14}: {baseline:8.3f} с")
+
+    for workers in args.workers:
+        # Пул создается и прогревается до замеров, в замер попадают только отчеты
+        executor = ParallelReportExecutor(workers, always_pool=True)
+        executor.summarize_sales(orders, start_date, end_date, generation=0)
+        elapsed, summary = best_of(
+            lambda: executor.summarize_sales(orders, start_date, end_date, generation=0), args.repeat)
+        executor.close()
+
+        assert render(summary) == expected, f"Отчет с {workers} процессами не совпадает с агрегатами"
+        print(f"{workers:>2} процесс(ов): {elapsed:8.3f} с, ускорение x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
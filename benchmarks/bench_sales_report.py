@@ -0,0 +1,57 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import make_order_manager, best_of
+from services.report_service import ReportService
+
+
+def rescan_report(report_service: ReportService, start_date: datetime, end_date: datetime) -> str:
+    filtered_orders = [
+        order for order in report_service.order_manager.get_all_orders()
+        if start_date.date() <= order.creation_time.date() <= end_date.date()
+    ]
+    return report_service.generators["sales"].generate_report(filtered_orders)
+
+
+def uncached_report(report_service: ReportService, start_date: datetime, end_date: datetime) -> str:
+    report_service.cache.clear()
+    return report_service.generate_sales_report(start_date, end_date)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Отчет по продажам: полный проход против дневных агрегатов")
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Генерация {args.orders} заказов за {args.days} дней...")
+    order_manager = make_order_manager(args.orders, args.days)
+    report_service = ReportService(order_manager)
+
+    started = time.perf_counter()
+    for order in order_manager.orders.values():
+        report_service.record_paid_order(order)
+    record_time = time.perf_counter() - started
+    print(f"Построение агрегатов: {record_time:.3f} с "
+          f"({record_time / max(args.orders, 1) * 1e6:.2f} мкс на заказ)")
+
+    end_date = datetime.now()
+    for days in (1, 30, args.days):
+        start_date = end_date - timedelta(days=days)
+        old_time, old_report = best_of(lambda: rescan_report(report_service, start_date, end_date), args.repeat)
+        # Кэш отчетов сбрасывается перед каждым прогоном, иначе замерялся бы только поиск в словаре
+        new_time, new_report = best_of(
+            lambda: uncached_report(report_service, start_date, end_date), args.repeat)
+        cached_time, cached_report = best_of(
+            lambda: report_service.generate_sales_report(start_date, end_date), args.repeat)
+
+        assert old_report == new_report == cached_report, f"Отчеты за {days} дн. не совпадают"
+        print(f"{days:>4} дн.: полный проход {old_time * 1000:10.3f} мс, "
+              f"агрегаты {new_time * 1000:8.3f} мс, ускорение x{old_time / new_time:,.0f}, "
+              f"из кэша {cached_time * 1000:8.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
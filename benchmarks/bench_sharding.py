@@ -0,0 +1,95 @@
+import argparse
+import os
+import time
+
+from benchmarks.common import silenced
+from facade.restaurant_facade import RestaurantFacade
+from server.venue_shards import VenueRouter
+
+DISHES = ("Цезарь с курицей", "Стейк Рибай", "Чай", "Тирамису", "Лимонад", "Филе лосося")
+
+
+def order_calls(venue_ids, order_ids, round_number: int):
+    calls = []
+    for venue_id, venue_orders in zip(venue_ids, order_ids):
+        for i, order_id in enumerate(venue_orders):
+            dish = DISHES[(round_number + i) % len(DISHES)]
+            calls.extend([
+                (venue_id, "add_item_to_order", (order_id, dish, 2), {}),
+                (venue_id, "add_item_to_order", (order_id, "Эспрессо", 1), {}),
+                (venue_id, "submit_order_to_kitchen", (order_id,), {}),
+                (venue_id, "complete_order", (order_id,), {}),
+                (venue_id, "deliver_order", (order_id,), {}),
+                (venue_id, "process_payment", (order_id, "cash"), {})
+            ])
+    return calls
+
+
+def restock_calls(venue_ids, quantity: float):
+    return [
+        (venue_id, "update_inventory_item", ("Продукты", product, quantity), {})
+        for venue_id in venue_ids
+        for product in ("tomatoes", "potatoes", "onions", "beef", "chicken")
+    ]
+
+
+def run_sharded(shards: int, venues: int, rounds: int, orders_per_round: int) -> float:
+    venue_ids = [f"venue-{index}" for index in range(venues)]
+    with VenueRouter(shards) as router:
+        router.call_batch(restock_calls(venue_ids, rounds * orders_per_round * 10.0))
+        calls = 0
+        started = time.perf_counter()
+        for round_number in range(rounds):
+            created = router.call_batch(
+                [(venue_id, "create_order", (1,), {}) for venue_id in venue_ids for _ in range(orders_per_round)])
+            order_ids = [
+                [order.order_id for order in created[index * orders_per_round:(index + 1) * orders_per_round]]
+                for index in range(venues)
+            ]
+            batch = order_calls(venue_ids, order_ids, round_number)
+            router.call_batch(batch)
+            calls += len(created) + len(batch)
+        elapsed = time.perf_counter() - started
+        report = router.generate_sales_report(1)
+    assert f"{rounds * orders_per_round * venues}" in report
+    return calls / elapsed
+
+
+def run_in_process(venues: int, rounds: int, orders_per_round: int) -> float:
+    facades = {f"venue-{index}": RestaurantFacade() for index in range(venues)}
+    with silenced():
+        for venue_id, method, args, kwargs in restock_calls(facades, rounds * orders_per_round * 10.0):
+            getattr(facades[venue_id], method)(*args, **kwargs)
+
+        calls = 0
+        started = time.perf_counter()
+        for round_number in range(rounds):
+            order_ids = [
+                [facade.create_order(1).order_id for _ in range(orders_per_round)] for facade in facades.values()
+            ]
+            batch = order_calls(list(facades), order_ids, round_number)
+            for venue_id, method, args, kwargs in batch:
+                getattr(facades[venue_id], method)(*args, **kwargs)
+            calls += venues * orders_per_round + len(batch)
+        elapsed = time.perf_counter() - started
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пропускная способность шардированного режима")
+    parser.add_argument("--venues", type=int, default=8)
+    parser.add_argument("--shards", default="1,2,4,8", help="количество шардов через запятую")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--orders-per-round", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"Заведений: {args.venues}, ядер: {os.cpu_count()}")
+    baseline = run_in_process(args.venues, args.rounds, args.orders_per_round)
+    print(f"{'один процесс':>14}: {baseline:>10,.0f} вызовов/с")
+    for shards in (int(value) for value in args.shards.split(",")):
+        rate = run_sharded(shards, args.venues, args.rounds, args.orders_per_round)
+        print(f"{shards:>7} шардов: {rate:>10,.0f} вызовов/с (x{rate / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
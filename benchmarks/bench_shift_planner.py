@@ -0,0 +1,47 @@
+import argparse
+import random
+import time
+from datetime import date
+
+from benchmarks.common import make_order_manager
+from services.shift_planner import ShiftPlanner, hourly_load_profile
+
+
+def make_staff(count: int, seed: int):
+    rng = random.Random(seed)
+    roles = (("Шеф-повар", 70000, 0.05), ("Повар", 45000, 0.35),
+             ("Официант", 35000, 0.45), ("Администратор", 50000, 0.15))
+    staff = []
+    for i in range(count):
+        role, salary, _ = rng.choices(roles, weights=[weight for _, _, weight in roles])[0]
+        staff.append({"id": str(i + 1), "role": role, "salary": salary + rng.randint(-5000, 5000)})
+    return staff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Автоматическое планирование смен")
+    parser.add_argument("--staff", type=int, default=120)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    orders = make_order_manager(args.orders, days=90, seed=args.seed).get_all_orders()
+    staff = make_staff(args.staff, args.seed)
+
+    started = time.perf_counter()
+    load_profile = hourly_load_profile(orders)
+    profile_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    plan = ShiftPlanner().plan(staff, load_profile, date.today(), args.days)
+    plan_elapsed = time.perf_counter() - started
+
+    print(f"Профиль нагрузки по {len(orders)} заказам: {profile_elapsed:.3f} с")
+    print(f"План на {args.days} дней для {args.staff} сотрудников: {plan_elapsed:.3f} с, "
+          f"{len(plan['shifts'])} смен, стоимость {plan['cost']:.2f} лей.")
+    print(f"Непокрытые часы: {plan['uncovered'] or 'нет'}")
+
+
+if __name__ == "__main__":
+    main()
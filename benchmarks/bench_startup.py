@@ -0,0 +1,91 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from functools import cached_property
+
+from benchmarks.common import best_of
+
+# Для сравнения: фасад, у которого все ленивые подсистемы создаются сразу после __init__
+EAGER_FACADE = (
+    "from functools import cached_property\n"
+    "from facade.restaurant_facade import RestaurantFacade\n"
+    "facade = RestaurantFacade()\n"
+    "for name, value in vars(RestaurantFacade).items():\n"
+    "    if isinstance(value, cached_property):\n"
+    "        getattr(facade, name)"
+)
+
+# Сценарий: код, выполняемый в новом процессе после запуска интерпретатора
+SCENARIOS = (
+    ("импорт фасада", "from facade.restaurant_facade import RestaurantFacade"),
+    ("создание фасада", "from facade.restaurant_facade import RestaurantFacade; RestaurantFacade()"),
+    ("отчет по продажам",
+     "from facade.restaurant_facade import RestaurantFacade; RestaurantFacade().generate_sales_report(30)"),
+    ("первый заказ",
+     "from facade.restaurant_facade import RestaurantFacade\n"
+     "facade = RestaurantFacade()\n"
+     "order = facade.create_order(1)\n"
+     "facade.add_item_to_order(order.order_id, 'Чай', 1)"),
+    ("консоль (main.py)", "import main")
+)
+
+TIMED = (
+    "import time, io, contextlib\n"
+    "started = time.perf_counter()\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "{body}\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+
+def cold_start(code: str, repeat: int) -> float:
+    body = "\n".join("    " + line for line in code.splitlines())
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", TIMED.format(body=body)],
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def eager_facade():
+    from facade.restaurant_facade import RestaurantFacade
+    facade = RestaurantFacade()
+    for name, value in vars(RestaurantFacade).items():
+        if isinstance(value, cached_property):
+            getattr(facade, name)
+    return facade
+
+
+def warm_start(factory, repeat: int) -> float:
+    factory()
+    elapsed, _ = best_of(factory, repeat)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время запуска и импорта")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    from facade.restaurant_facade import RestaurantFacade
+
+    for name, code in SCENARIOS:
+        print(f"{name:>20}: {cold_start(code, args.repeat) * 1000:.1f} мс (холодный запуск)")
+
+    lazy = cold_start(SCENARIOS[1][1], args.repeat)
+    eager = cold_start(EAGER_FACADE, args.repeat)
+    print(f"\n{'холодный запуск':>20}: лениво {lazy * 1000:.1f} мс, все подсистемы сразу {eager * 1000:.1f} мс "
+          f"(x{eager / lazy:.2f})")
+
+    lazy = warm_start(RestaurantFacade, args.repeat * 100)
+    eager = warm_start(eager_facade, args.repeat * 100)
+    print(f"{'модули загружены':>20}: лениво {lazy * 1000:.3f} мс, все подсистемы сразу {eager * 1000:.3f} мс "
+          f"(x{eager / lazy:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import random
+import time
+
+from adapters.legacy_system_adapter import InventoryAdapter
+from adapters.simulated_legacy import SimulatedLatencyInventorySystem
+
+
+def run_updates(adapter: InventoryAdapter, updates: int, seed: int) -> float:
+    rng = random.Random(seed)
+    names = list(adapter.get_inventory_view()["Продукты"])
+
+    started = time.perf_counter()
+    for _ in range(updates):
+        adapter.use_product_for_order(rng.choice(names), 0.001)
+    adapter.close()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Отложенная запись в устаревшую систему инвентаря")
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.001, help="задержка одного обращения, с")
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    modes = (
+        ("сквозная запись", {}),
+        ("отложенная запись", {"write_behind": True, "flush_interval": args.flush_interval})
+    )
+    for name, options in modes:
+        legacy_system = SimulatedLatencyInventorySystem(args.latency)
+        for product in legacy_system._inventory["products"].values():
+            product["qty"] = float(args.updates)
+
+        adapter = InventoryAdapter(legacy_system, **options)
+        elapsed = run_updates(adapter, args.updates, args.seed)
+        remaining = {name: round(data["qty"], 3) for name, data in legacy_system._inventory["products"].items()}
+        print(f"{name:>18}: {args.updates} изменений за {elapsed:.3f} с "
+              f"({args.updates / elapsed:,.0f} изменений/с), обращений к системе: {legacy_system.calls}, "
+              f"остаток {remaining}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import random
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+from models.menu_item import MenuItem
+from models.order import OrderManager
+
+
+def default_menu_items() -> List[MenuItem]:
+    from facade.restaurant_facade import RestaurantFacade
+    return RestaurantFacade().menu.get_all_items()
+
+
+def make_order_manager(count: int, days: int = 365, seed: int = 42,
+                       end: datetime = None) -> OrderManager:
+    rng = random.Random(seed)
+    menu_items = default_menu_items()
+    weights = [1.0 / (rank + 1) for rank in range(len(menu_items))]
+
+    if end is None:
+        end = datetime.now()
+    start = end - timedelta(days=days)
+    step = (end - start) / max(count, 1)
+
+    manager = OrderManager()
+    for i in range(count):
+        order = manager.create_order(rng.randint(1, 40))
+        order.creation_time = start + step * i
+        for menu_item in rng.choices(menu_items, weights=weights, k=rng.randint(1, 4)):
+            order.add_item(menu_item, rng.randint(1, 3))
+
+    return manager
+
+
+@contextmanager
+def silenced():
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
+
+
+def best_of(func: Callable, repeat: int = 3) -> Tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
@@ -0,0 +1,238 @@
+"""Набор нагрузочных тестов фасада с проверкой регрессий относительно эталона.
+
+Эталон (baseline.json) хранит абсолютные времена и пропускную способность и поэтому
+действителен только для машины, на которой снят. На другой машине сначала нужно снять
+свой эталон (--save-baseline), а затем сравнивать с ним; файл в репозитории - пример
+для машины разработки, а не общий порог.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Callable
+
+from benchmarks.common import silenced
+from facade.restaurant_facade import RestaurantFacade
+from models.order import STATUS_COMPLETED
+from services.latency_histogram import LatencyHistogram
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+# Результаты прогона не хранятся в репозитории (см. .gitignore)
+DEFAULT_RESULTS = os.path.join(os.path.dirname(__file__), "results", "benchmark_results.json")
+# Эталон снят на конкретной машине, см. описание модуля
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def populate(facade: RestaurantFacade, count: int, days: int, seed: int):
+    """Историю заказов наполняем напрямую через модели, минуя вывод фасада."""
+    rng = random.Random(seed)
+    menu_items = facade.menu.get_all_items()
+    weights = [1.0 / (rank + 1) for rank in range(len(menu_items))]
+    end = datetime.now()
+    step = timedelta(days=days) / max(count, 1)
+    start = end - timedelta(days=days)
+
+    order_manager = facade.order_manager
+    report_service = facade.report_service
+    for i in range(count):
+        order = order_manager.create_order(rng.randint(1, 40))
+        order.creation_time = start + step * i
+        for menu_item in rng.choices(menu_items, weights=weights, k=rng.randint(1, 4)):
+            order.add_item(menu_item, rng.randint(1, 3))
+        # Примерно каждый двадцатый заказ остается открытым
+        if rng.random() < 0.95:
+            order.mark_as_paid("Наличные")
+            order.change_status(STATUS_COMPLETED)
+            report_service.record_paid_order(order)
+
+
+def measure(operation: Callable[[int], Any], count: int) -> Dict[str, float]:
+    histogram = LatencyHistogram()
+    started = time.perf_counter()
+    for i in range(count):
+        operation_started = time.perf_counter_ns()
+        operation(i)
+        histogram.record((time.perf_counter_ns() - operation_started) / 1000)
+    elapsed = time.perf_counter() - started
+
+    percentiles = histogram.percentiles((50, 95, 99))
+    return {
+        "count": count,
+        "ops_per_sec": count / elapsed if elapsed > 0 else 0.0,
+        "p50_us": percentiles[50],
+        "p95_us": percentiles[95],
+        "p99_us": percentiles[99],
+        "max_us": histogram.max
+    }
+
+
+def run_scale(orders: int, ops: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    facade = RestaurantFacade()
+
+    with silenced():
+        started = time.perf_counter()
+        populate(facade, orders, days=365, seed=seed)
+        setup_seconds = time.perf_counter() - started
+
+        dish_names = [item.name for item in facade.menu.get_all_items()]
+        for product in facade.check_inventory()["Продукты"]:
+            facade.update_inventory_item("Продукты", product, ops * 10.0)
+
+        new_orders: List[int] = []
+        report_ops = max(ops // 20, 10)
+        report_cache = facade.report_service.cache
+        roles = ("Повар", "Официант", "Администратор")
+
+        operations = {
+            "menu_lookup": (lambda i: facade.find_menu_item(rng.choice(dish_names)), ops),
+            "create_order": (lambda i: new_orders.append(facade.create_order(rng.randint(1, 40)).order_id), ops),
+            "add_item": (lambda i: facade.add_item_to_order(new_orders[i], rng.choice(dish_names), 2), ops),
+            "submit_order": (lambda i: facade.submit_order_to_kitchen(new_orders[i]), ops),
+            "payment": (lambda i: facade.process_payment(new_orders[i], "cash"), ops),
+            # Отчеты замеряются без кэша; попадание в кэш - отдельная операция
+            "sales_report": (lambda i: (report_cache.clear(), facade.generate_sales_report(30 + i % 7)), report_ops),
+            "sales_report_cached": (lambda i: facade.generate_sales_report(30), ops),
+            "financial_report": (lambda i: (report_cache.clear(), facade.generate_financial_report("текущий год")),
+                                 report_ops),
+            "active_orders_page": (lambda i: [str(order) for order in facade.get_active_orders_page(20)[0]], ops),
+            "inventory_check": (lambda i: (facade.check_inventory(), facade.check_low_stock()), ops),
+            "staff_queries": (lambda i: (facade.get_staff_on_shift("2025-04-10"),
+                                         facade.get_staff_by_role(roles[i % 3])), ops)
+        }
+
+        results = {name: measure(operation, count) for name, (operation, count) in operations.items()}
+        facade.shutdown()
+
+    return {
+        "orders": orders,
+        "setup_seconds": setup_seconds,
+        # ru_maxrss в Linux измеряется в килобайтах, в macOS - в байтах
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "operations": results
+    }
+
+
+def run_suite(scales: List[int], ops: int, seed: int) -> Dict[str, Any]:
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ops": ops,
+        "seed": seed,
+        "scales": {}
+    }
+
+    # Каждый масштаб запускается в отдельном процессе, чтобы пиковая память не накапливалась
+    for orders in scales:
+        print(f"Масштаб {orders} заказов...", file=sys.stderr)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "--worker", str(orders), "--ops", str(ops), "--seed", str(seed)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results["scales"][str(orders)] = json.loads(output)
+
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            latency_tolerance: float) -> List[str]:
+    regressions = []
+    for scale, scale_results in results["scales"].items():
+        baseline_scale = baseline.get("scales", {}).get(scale)
+        if baseline_scale is None:
+            continue
+
+        for name, current in scale_results["operations"].items():
+            previous = baseline_scale["operations"].get(name)
+            if previous is None:
+                continue
+            if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - tolerance):
+                regressions.append(f"{scale} заказов, {name}: {current['ops_per_sec']:,.0f} операций/с "
+                                   f"против {previous['ops_per_sec']:,.0f} в эталоне")
+            if current["p95_us"] > previous["p95_us"] * (1 + latency_tolerance):
+                regressions.append(f"{scale} заказов, {name}: p95 {current['p95_us']:.1f} мкс "
+                                   f"против {previous['p95_us']:.1f} мкс в эталоне")
+    return regressions
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    result = ""
+    for scale, scale_results in results["scales"].items():
+        result += (f"\n=== {scale} заказов (подготовка {scale_results['setup_seconds']:.1f} с, "
+                   f"пиковая память {scale_results['peak_rss_mb']:.0f} МБ) ===\n")
+        result += f"{'операция':>20} {'операций/с':>12} {'p50, мкс':>10} {'p95, мкс':>10} {'p99, мкс':>10}\n"
+        for name, stats in scale_results["operations"].items():
+            result += (f"{name:>20} {stats['ops_per_sec']:>12,.0f} {stats['p50_us']:>10.1f} "
+                       f"{stats['p95_us']:>10.1f} {stats['p99_us']:>10.1f}\n")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Набор нагрузочных тестов фасада ресторана")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in DEFAULT_SCALES),
+                        help="размеры истории заказов через запятую, например 1000,10000,10000000")
+    parser.add_argument("--ops", type=int, default=2000, help="операций каждого вида на масштаб")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=DEFAULT_RESULTS, help="файл результатов JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="эталонные результаты для сравнения (снятые на этой же машине)")
+    parser.add_argument("--save-baseline", action="store_true", help="сохранить результаты как эталон")
+    parser.add_argument("--tolerance", type=float, default=0.4, help="допустимое снижение пропускной способности")
+    parser.add_argument("--latency-tolerance", type=float, default=1.0, help="допустимый рост p95")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_scale(args.worker, args.ops, args.seed)))
+        return
+
+    results = run_suite([int(scale) for scale in args.scales.split(",")], args.ops, args.seed)
+    print(format_results(results))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(results, output, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(results, output, ensure_ascii=False, indent=2)
+        print(f"Эталон сохранен в {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"Эталон {args.baseline} не найден, сравнение пропущено")
+        return
+
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    # С другим числом операций или другим seed нагрузка другая, и сравнение дало бы ложные регрессии
+    mismatched = [name for name in ("ops", "seed") if baseline.get(name) != results[name]]
+    if mismatched:
+        print("Нагрузка не совпадает с эталоном (" +
+              ", ".join(f"{name}: {results[name]} против {baseline.get(name)}" for name in mismatched) +
+              "), сравнение пропущено")
+        return
+
+    if (baseline.get("platform"), baseline.get("python")) != (results["platform"], results["python"]):
+        print(f"Внимание: эталон снят в другом окружении ({baseline.get('platform')}, Python {baseline.get('python')}); "
+              f"для честного сравнения снимите эталон на этой машине: --save-baseline")
+    regressions = compare(results, baseline, args.tolerance, args.latency_tolerance)
+
+    if regressions:
+        print("\nОБНАРУЖЕНЫ РЕГРЕССИИ:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("Регрессий относительно эталона не обнаружено")
+
+
+if __name__ == "__main__":
+    main()
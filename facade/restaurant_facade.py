@@ -1,34 +1,71 @@
-from typing import Dict, List, Any, Optional
+from functools import cached_property
+from typing import Dict, List, Any, Optional, Mapping, Sequence, Tuple
 from datetime import datetime, timedelta
 
 from models.menu_item import MenuItem, MenuCategory
-from models.order import Order, OrderManager
-from services.payment_service import PaymentService
-from services.notification_service import StaffNotificationService
-from services.report_service import ReportService
-from adapters.legacy_system_adapter import (
-    LegacyInventorySystem,
-    InventoryAdapter,
-    LegacyEmployeeSystem,
-    StaffAdapter
+from models.recipe import RecipeBook
+from models.order import (
+    Order,
+    OrderManager,
+    STATUS_COOKING,
+    STATUS_READY,
+    STATUS_DELIVERED,
+    STATUS_COMPLETED
 )
+from services.report_service import ReportService
+
+# Служебные методы фасада, которые не замеряются
+_NOT_INSTRUMENTED = ("enable_instrumentation", "disable_instrumentation", "get_metrics", "export_metrics", "shutdown")
 
 
 class RestaurantFacade:
-    def __init__(self):
+    def __init__(self, inventory_write_behind: bool = False, inventory_flush_interval: float = 1.0):
+        # Сразу создаются только заказы и отчеты: сервис отчетов подписывается на изменения заказов.
+        # Остальные подсистемы и их модули загружаются при первом обращении
         self.order_manager = OrderManager()
-
-        legacy_inventory = LegacyInventorySystem()
-        self.inventory_adapter = InventoryAdapter(legacy_inventory)
-
-        legacy_staff = LegacyEmployeeSystem()
-        self.staff_adapter = StaffAdapter(legacy_staff)
-
-        self.payment_service = PaymentService()
-        self.notification_service = StaffNotificationService()
         self.report_service = ReportService(self.order_manager)
-
-        self.menu = self._initialize_menu()
+        self.inventory_write_behind = inventory_write_behind
+        self.inventory_flush_interval = inventory_flush_interval
+        self._demand_forecaster = None
+        self.instrumentation = None
+
+    @cached_property
+    def notification_service(self):
+        from services.notification_service import StaffNotificationService
+        return StaffNotificationService()
+
+    @cached_property
+    def inventory_adapter(self):
+        from adapters.legacy_system_adapter import LegacyInventorySystem, InventoryAdapter
+        return InventoryAdapter(
+            LegacyInventorySystem(),
+            self._on_low_stock_change,
+            write_behind=self.inventory_write_behind,
+            flush_interval=self.inventory_flush_interval
+        )
+
+    @cached_property
+    def staff_adapter(self):
+        from adapters.legacy_system_adapter import LegacyEmployeeSystem, StaffAdapter
+        return StaffAdapter(LegacyEmployeeSystem())
+
+    @cached_property
+    def payment_service(self):
+        from services.payment_service import PaymentService
+        return PaymentService()
+
+    @cached_property
+    def export_service(self):
+        from services.export_service import ExportService
+        return ExportService(self.order_manager, self.payment_service)
+
+    @cached_property
+    def menu(self) -> MenuCategory:
+        return self._initialize_menu()
+
+    @cached_property
+    def recipe_book(self) -> RecipeBook:
+        return self._initialize_recipes()
 
     def _initialize_menu(self) -> MenuCategory:
         menu = MenuCategory("Меню ресторана")
@@ -71,6 +108,22 @@ class RestaurantFacade:
 
         return menu
 
+    def _initialize_recipes(self) -> RecipeBook:
+        recipe_book = RecipeBook()
+        recipes = {
+            "Цезарь с курицей": {"chicken": 0.15, "tomatoes": 0.05},
+            "Брускетта с томатами": {"tomatoes": 0.1, "onions": 0.02},
+            "Карпаччо из говядины": {"beef": 0.1},
+            "Стейк Рибай": {"beef": 0.35, "potatoes": 0.2},
+            "Паста Карбонара": {"onions": 0.03},
+            "Филе лосося": {"potatoes": 0.15, "onions": 0.05}
+        }
+
+        for dish_name, ingredients in recipes.items():
+            recipe_book.add_recipe(self.find_menu_item(dish_name), ingredients)
+
+        return recipe_book
+
     # --- Menu ---
 
     def display_menu(self) -> str:
@@ -96,6 +149,9 @@ class RestaurantFacade:
         print(f"Создан новый заказ #{order.order_id} для стола {table_number}")
         return order
 
+    def get_active_orders_page(self, page_size: int = 10, cursor: str = None) -> Tuple[List[Order], Optional[str]]:
+        return self.order_manager.get_orders_page(page_size, cursor)
+
     def add_item_to_order(self, order_id: int, item_name: str, quantity: int = 1) -> bool:
         order = self.order_manager.get_order(order_id)
         if not order:
@@ -117,18 +173,41 @@ class RestaurantFacade:
             print(f"Заказ #{order_id} не найден")
             return False
 
-        order.change_status("Готовится")
+        # Продукты списываются один раз, при первой отправке заказа на кухню
+        if order.get_status_time(STATUS_COOKING) is None:
+            requirements = self.recipe_book.get_requirements(order)
+            if not self.inventory_adapter.reserve_products(requirements):
+                shortages = self.inventory_adapter.find_shortages(requirements)
+                details = ", ".join(f"{name}: не хватает {qty:.2f}" for name, qty in shortages.items())
+                self.notification_service.notify_management_about_issue(
+                    "Недостаточно продуктов", f"Заказ #{order_id}: {details}")
+                print(f"Недостаточно продуктов для заказа #{order_id}: {details}")
+                return False
+
+            if self._demand_forecaster is not None:
+                self._demand_forecaster.record_consumption(requirements)
+
+        order.change_status(STATUS_COOKING)
         self.notification_service.notify_kitchen_about_new_order(order)
         print(f"Заказ #{order_id} отправлен на кухню")
         return True
 
+    def reserve_ingredients(self, orders: List[Order]) -> List[bool]:
+        # Если запаса хватает на всю пачку, она списывается одним проходом по матрице рецептов
+        total = self.recipe_book.get_batch_requirements(orders)
+        if self.inventory_adapter.reserve_products(total):
+            return [True] * len(orders)
+
+        return self.inventory_adapter.reserve_products_batch(
+            [self.recipe_book.get_requirements(order) for order in orders])
+
     def complete_order(self, order_id: int) -> bool:
         order = self.order_manager.get_order(order_id)
         if not order:
             print(f"Заказ #{order_id} не найден")
             return False
 
-        order.change_status("Готов")
+        order.change_status(STATUS_READY)
         self.notification_service.notify_waiters_about_order_status(order, "готов к подаче")
         print(f"Заказ #{order_id} готов к подаче")
         return True
@@ -139,7 +218,7 @@ class RestaurantFacade:
             print(f"Заказ #{order_id} не найден")
             return False
 
-        order.change_status("Доставлен")
+        order.change_status(STATUS_DELIVERED)
         print(f"Заказ #{order_id} доставлен клиенту")
         return True
 
@@ -170,7 +249,8 @@ class RestaurantFacade:
             return False
 
         if transaction_id:
-            order.change_status("Завершен")
+            order.change_status(STATUS_COMPLETED)
+            self.report_service.record_paid_order(order)
             print(f"Заказ #{order_id} оплачен и завершен. ID транзакции: {transaction_id}")
             return True
         else:
@@ -184,17 +264,55 @@ class RestaurantFacade:
         start_date = end_date - timedelta(days=days)
         return self.report_service.generate_sales_report(start_date, end_date)
 
+    def generate_lifecycle_report(self, hours: int = 24) -> str:
+        end_date = datetime.now()
+        start_date = end_date - timedelta(hours=hours)
+        return self.report_service.generate_lifecycle_report(start_date, end_date)
+
     def generate_inventory_report(self) -> str:
-        inventory_data = self.inventory_adapter.get_all_inventory()
+        inventory_data = self.inventory_adapter.get_inventory_view()
         return self.report_service.generate_inventory_report(inventory_data)
 
     def generate_financial_report(self, period: str = "текущий месяц") -> str:
         return self.report_service.generate_financial_report(period)
 
+    def record_expense(self, category: str, amount: float, date: str = None) -> bool:
+        day = None
+        if date:
+            try:
+                day = datetime.strptime(date, "%Y-%m-%d").date()
+            except ValueError:
+                print(f"Некорректная дата: {date}")
+                return False
+        return self.report_service.record_expense(category, amount, day)
+
+    # --- Export ---
+
+    def export_data(self, dataset: str, path: str, fmt: str = "csv",
+                    start_date: datetime = None, end_date: datetime = None) -> Optional[int]:
+        exporters = {
+            "orders": self.export_service.export_orders,
+            "order_items": self.export_service.export_order_items,
+            "transactions": self.export_service.export_transactions
+        }
+
+        if dataset not in exporters:
+            print(f"Неизвестный набор данных для выгрузки: {dataset}")
+            return None
+
+        try:
+            rows = exporters[dataset](path, fmt, start_date=start_date, end_date=end_date)
+        except (ValueError, OSError) as error:
+            print(f"Ошибка выгрузки {dataset}: {error}")
+            return None
+
+        print(f"Выгружено {rows} строк ({dataset}) в {path}")
+        return rows
+
     # --- Inventory ---
 
-    def check_inventory(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
-        return self.inventory_adapter.get_all_inventory()
+    def check_inventory(self) -> Mapping[str, Mapping[str, Mapping[str, Any]]]:
+        return self.inventory_adapter.get_inventory_view()
 
     def update_inventory_item(self, category: str, name: str, quantity: float) -> bool:
         if category == "Продукты":
@@ -208,12 +326,74 @@ class RestaurantFacade:
     def check_low_stock(self) -> List[Dict[str, Any]]:
         return self.inventory_adapter.get_low_stock_items()
 
+    def get_demand_forecaster(self):
+        # numpy нужен только для прогноза, поэтому модуль загружается при первом обращении
+        if self._demand_forecaster is None:
+            from services.demand_forecast import DemandForecaster
+
+            self._demand_forecaster = DemandForecaster(self.recipe_book)
+            self._demand_forecaster.fit([
+                order for order in self.order_manager.get_all_orders()
+                if order.get_status_time(STATUS_COOKING) is not None
+            ])
+        return self._demand_forecaster
+
+    def generate_reorder_report(self) -> str:
+        products = self.inventory_adapter.get_inventory_view()["Продукты"]
+        forecast = self.get_demand_forecaster().forecast(products)
+        return self.report_service.generate_report("reorder", forecast)
+
+    def flush_inventory(self) -> int:
+        return self.inventory_adapter.flush()
+
+    def shutdown(self):
+        if "inventory_adapter" in self.__dict__:
+            self.inventory_adapter.close()
+        self.report_service.close()
+
+    # --- Instrumentation ---
+
+    def enable_instrumentation(self):
+        # Замеры ставятся обертками на экземпляр; без них вызовы идут напрямую
+        if self.instrumentation is None:
+            from services.instrumentation import Instrumentation
+            self.instrumentation = Instrumentation(exclude=_NOT_INSTRUMENTED)
+        if not self.instrumentation.attached:
+            self.instrumentation.attach(self)
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        # Накопленные метрики сохраняются до следующего включения
+        if self.instrumentation is not None:
+            self.instrumentation.detach()
+
+    def get_metrics(self, fmt: str = "text") -> str:
+        if self.instrumentation is None:
+            return "Инструментация не включена"
+        if fmt == "prometheus":
+            return self.instrumentation.format_prometheus()
+        return self.instrumentation.format_text()
+
+    def export_metrics(self, path: str, fmt: str = None) -> bool:
+        if self.instrumentation is None:
+            print("Инструментация не включена")
+            return False
+        return self.instrumentation.export(path, fmt)
+
+    def _on_low_stock_change(self, item: Dict[str, Any], is_low: bool):
+        if is_low:
+            self.notification_service.notify_management_about_issue(
+                "Низкий запас",
+                f"{item['name']} ({item['category']}): {item['current']} {item['unit']}, "
+                f"мин. запас {item['minimum']} {item['unit']}"
+            )
+
     # --- Employees ---
 
-    def get_all_staff(self) -> List[Dict[str, Any]]:
-        return self.staff_adapter.get_all_staff()
+    def get_all_staff(self) -> Sequence[Mapping[str, Any]]:
+        return self.staff_adapter.get_staff_view()
 
-    def get_staff_by_role(self, role: str) -> List[Dict[str, Any]]:
+    def get_staff_by_role(self, role: str) -> List[Mapping[str, Any]]:
         return self.staff_adapter.get_staff_by_role(role)
 
     def get_staff_on_shift(self, date: str = None) -> List[Dict[str, Any]]:
@@ -221,5 +401,51 @@ class RestaurantFacade:
             date = datetime.now().strftime("%Y-%m-%d")
         return self.staff_adapter.get_staff_on_shift(date)
 
+    def get_staff_working_at(self, moment: datetime = None) -> List[Dict[str, Any]]:
+        if moment is None:
+            moment = datetime.now()
+        return self.staff_adapter.get_staff_working_at(moment)
+
     def schedule_shift(self, staff_id: str, date: str, start_time: str, end_time: str) -> bool:
         return self.staff_adapter.schedule_shift(staff_id, date, start_time, end_time)
+
+    def plan_shifts(self, start_date: str = None, days: int = 7, apply: bool = True) -> Optional[Dict[str, Any]]:
+        if start_date is None:
+            start = datetime.now().date() + timedelta(days=1)
+        else:
+            try:
+                start = datetime.strptime(start_date, "%Y-%m-%d").date()
+            except ValueError:
+                print(f"Некорректная дата: {start_date}")
+                return None
+
+        # Сотрудники, у которых в этот день уже есть любая смена (включая вторую и ночную накануне), не планируются
+        busy = self.staff_adapter.get_busy_days(start, start + timedelta(days=days - 1))
+
+        from services.shift_planner import ShiftPlanner, hourly_load_profile
+
+        load_profile = hourly_load_profile(self.order_manager.get_all_orders())
+        plan = ShiftPlanner().plan(self.staff_adapter.get_staff_view(), load_profile, start, days, busy)
+        plan["applied"] = bool(apply and plan["shifts"] and self.staff_adapter.import_schedule(plan["shifts"]))
+        return plan
+
+    def import_schedule(self, path: str) -> Optional[int]:
+        # Файл CSV с колонками emp_id, date, start, end
+        import csv
+
+        try:
+            with open(path, newline="", encoding="utf-8") as schedule_file:
+                shifts = [
+                    {key: row[key].strip() for key in ("emp_id", "date", "start", "end")}
+                    for row in csv.DictReader(schedule_file)
+                ]
+        except (OSError, KeyError, AttributeError) as error:
+            print(f"Ошибка чтения расписания {path}: {error}")
+            return None
+
+        if not self.staff_adapter.import_schedule(shifts):
+            print(f"Расписание из {path} не импортировано")
+            return None
+
+        print(f"Импортировано смен: {len(shifts)}")
+        return len(shifts)
@@ -1,7 +1,13 @@
+import heapq
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 from datetime import datetime
 from models.order import Order
+from services.heavy_hitters import SpaceSavingCounter
+from services.latency_histogram import LatencyHistogram
+
+EXACT_TOP_DISHES = "exact"
+APPROXIMATE_TOP_DISHES = "approximate"
 
 
 class ReportGenerator(ABC):
@@ -11,21 +17,34 @@ class ReportGenerator(ABC):
 
 
 class SalesReportGenerator(ReportGenerator):
+    def __init__(self, top_dishes_mode: str = EXACT_TOP_DISHES, epsilon: float = 0.01):
+        self.top_dishes_mode = top_dishes_mode
+        self.epsilon = epsilon
+
     def generate_report(self, orders: List[Order]) -> str:
         if not orders:
             return "Нет данных для отчета по продажам"
 
-        total_revenue = sum(order.get_total_price() for order in orders)
-        avg_order_value = total_revenue / len(orders)
+        return self.render_summary(self.summarize(orders))
 
-        result = "=== ОТЧЕТ ПО ПРОДАЖАМ ===\n"
-        result += f"Период: {orders[0].creation_time.strftime('%Y-%m-%d')} - "
-        result += f"{orders[-1].creation_time.strftime('%Y-%m-%d')}\n"
-        result += f"Количество заказов: {len(orders)}\n"
-        result += f"Общая выручка: {total_revenue:.2f} лей.\n"
-        result += f"Средний чек: {avg_order_value:.2f} лей.\n"
+    def summarize(self, orders: List[Order]) -> Dict[str, Any]:
+        summary = {
+            "start": orders[0].creation_time.date(),
+            "end": orders[-1].creation_time.date(),
+            "orders": len(orders),
+            "revenue": sum(order.get_total_price() for order in orders)
+        }
 
         # Популярные блюда
+        if self.top_dishes_mode == APPROXIMATE_TOP_DISHES:
+            sketch = SpaceSavingCounter(epsilon=self.epsilon)
+            for order in orders:
+                for item in order.items:
+                    sketch.add(item.menu_item.name, item.quantity)
+            summary["dish_counts"] = sketch.counts
+            summary["dish_count_error"] = sketch.error_bound()
+            return summary
+
         dish_counts = {}
         for order in orders:
             for item in order.items:
@@ -35,8 +54,29 @@ class SalesReportGenerator(ReportGenerator):
                 else:
                     dish_counts[dish_name] = item.quantity
 
-        result += "\nПопулярные блюда:\n"
-        for dish, count in sorted(dish_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
+        summary["dish_counts"] = dish_counts
+        return summary
+
+    def render_summary(self, summary: Dict[str, Any]) -> str:
+        if not summary or not summary["orders"]:
+            return "Нет данных для отчета по продажам"
+
+        total_revenue = summary["revenue"]
+        avg_order_value = total_revenue / summary["orders"]
+
+        result = "=== ОТЧЕТ ПО ПРОДАЖАМ ===\n"
+        result += f"Период: {summary['start'].strftime('%Y-%m-%d')} - "
+        result += f"{summary['end'].strftime('%Y-%m-%d')}\n"
+        result += f"Количество заказов: {summary['orders']}\n"
+        result += f"Общая выручка: {total_revenue:.2f} лей.\n"
+        result += f"Средний чек: {avg_order_value:.2f} лей.\n"
+
+        if summary.get("dish_count_error") is None:
+            result += "\nПопулярные блюда:\n"
+        else:
+            result += f"\nПопулярные блюда (приблизительно, погрешность до {summary['dish_count_error']} шт.):\n"
+        top_dishes = heapq.nlargest(5, summary["dish_counts"].items(), key=lambda x: x[1])
+        for dish, count in top_dishes:
             result += f"  {dish}: {count} шт.\n"
 
         return result
@@ -64,6 +104,30 @@ class InventoryReportGenerator(ReportGenerator):
         return result
 
 
+class ReorderReportGenerator(ReportGenerator):
+    def generate_report(self, forecast: List[Dict[str, Any]]) -> str:
+        if not forecast:
+            return "Нет данных для прогноза расхода"
+
+        result = "=== ПРОГНОЗ РАСХОДА И ЗАКАЗ ПРОДУКТОВ ===\n"
+        result += f"Дата: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+
+        for entry in forecast:
+            result += f"{entry['name']}: {entry['current']:.2f} {entry['unit']}, "
+            result += f"расход {entry['daily_rate']:.2f} {entry['unit']}/день\n"
+
+            if entry["stockout_at"] is None:
+                result += "  Расхода нет, запаса хватит\n"
+            else:
+                result += f"  Закончится через {entry['days_left']:.1f} дн. "
+                result += f"({entry['stockout_at'].strftime('%Y-%m-%d %H:%M')})\n"
+
+            if entry["reorder_quantity"] > 0:
+                result += f"  Рекомендуется заказать: {entry['reorder_quantity']:.2f} {entry['unit']}\n"
+
+        return result
+
+
 class FinancialReportGenerator(ReportGenerator):
     def generate_report(self, data: Dict) -> str:
         revenue = data.get("revenue", 0)
@@ -85,3 +149,41 @@ class FinancialReportGenerator(ReportGenerator):
         result += f"Прибыль: {profit:.2f} лей.\n"
 
         return result
+
+
+class LifecycleReportGenerator(ReportGenerator):
+    def generate_report(self, buckets: List[Dict]) -> str:
+        if not buckets:
+            return "Нет данных для отчета по времени обслуживания"
+
+        totals = {}
+        result = "=== ОТЧЕТ ПО ВРЕМЕНИ ОБСЛУЖИВАНИЯ ===\n"
+
+        for bucket in buckets:
+            result += f"\n{bucket['start'].strftime('%Y-%m-%d %H:%M')}: {bucket['orders']} заказов\n"
+            for stage, histogram in bucket["stages"].items():
+                if not histogram.count:
+                    continue
+                result += f"  {stage}: {self._format_percentiles(histogram)}\n"
+
+                if stage not in totals:
+                    totals[stage] = LatencyHistogram(histogram.sub_buckets)
+                totals[stage].merge(histogram)
+
+        if totals:
+            result += "\nИтого за период:\n"
+            for stage, histogram in totals.items():
+                result += f"  {stage}: {self._format_percentiles(histogram)}\n"
+
+            stages = {stage: histogram for stage, histogram in totals.items() if stage != "Полный цикл"}
+            if stages:
+                bottleneck = max(stages, key=lambda stage: stages[stage].percentile(50))
+                result += f"\nУзкое место: {bottleneck}\n"
+
+        return result
+
+    def _format_percentiles(self, histogram: LatencyHistogram) -> str:
+        values = ", ".join(
+            f"p{level:g} {value / 60:.1f} мин" for level, value in histogram.percentiles((50, 95, 99)).items()
+        )
+        return f"{values} ({histogram.count} шт.)"
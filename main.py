@@ -1,6 +1,9 @@
+import argparse
 import os
+import sys
 import time
-from datetime import datetime
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
 
 from facade.restaurant_facade import RestaurantFacade
 
@@ -54,6 +57,33 @@ class ConsoleUI:
             print("-" * 80)
             input("Нажмите Enter для возврата...")
 
+    def show_active_orders(self, page_size: int = 10):
+        """Постраничный просмотр активных заказов"""
+        cursor = None
+        page_number = 1
+
+        while True:
+            orders, next_cursor = self.facade.get_active_orders_page(page_size, cursor)
+            self.clear_screen()
+            self.display_header()
+            print(f"АКТИВНЫЕ ЗАКАЗЫ (страница {page_number}):")
+            print("-" * 80)
+
+            if not orders:
+                print("Активные заказы отсутствуют")
+            else:
+                print(("\n" + "-" * 80 + "\n").join(str(order) for order in orders))
+                print("-" * 80)
+
+            if next_cursor is None:
+                input("Нажмите Enter для возврата...")
+                return
+
+            if input("Enter - следующая страница, 0 - назад: ") == "0":
+                return
+            cursor = next_cursor
+            page_number += 1
+
     def handle_order_management(self):
         while True:
             self.clear_screen()
@@ -76,20 +106,7 @@ class ConsoleUI:
                 break
             elif choice == "1":
                 # Показать активные заказы
-                active_orders = self.facade.order_manager.get_active_orders()
-                self.clear_screen()
-                self.display_header()
-                print("АКТИВНЫЕ ЗАКАЗЫ:")
-                print("-" * 80)
-
-                if not active_orders:
-                    print("Активные заказы отсутствуют")
-                else:
-                    for order in active_orders:
-                        print(order)
-                        print("-" * 80)
-
-                input("Нажмите Enter для возврата...")
+                self.show_active_orders()
 
             elif choice == "2":
                 try:
@@ -209,6 +226,7 @@ class ConsoleUI:
             print("1. Показать текущий инвентарь")
             print("2. Обновить количество товара")
             print("3. Проверить товары с низким запасом")
+            print("4. Прогноз расхода и заказ продуктов")
             print("0. Назад")
             print("-" * 80)
 
@@ -303,6 +321,15 @@ class ConsoleUI:
                 print("-" * 80)
                 input("Нажмите Enter для возврата...")
 
+            elif choice == "4":
+                # Прогноз расхода и заказ продуктов
+                report = self.facade.generate_reorder_report()
+                self.clear_screen()
+                self.display_header()
+                print(report)
+                print("-" * 80)
+                input("Нажмите Enter для возврата...")
+
     def handle_staff_management(self):
         """Обработка раздела управления персоналом"""
         while True:
@@ -314,6 +341,9 @@ class ConsoleUI:
             print("2. Показать сотрудников по должности")
             print("3. Показать сотрудников на смене")
             print("4. Запланировать смену")
+            print("5. Кто работает в указанное время")
+            print("6. Импортировать расписание из CSV")
+            print("7. Автоматически спланировать смены")
             print("0. Назад")
             print("-" * 80)
 
@@ -402,6 +432,63 @@ class ConsoleUI:
                     print("Некорректный ввод")
                     time.sleep(1)
 
+            elif choice == "5":
+                # Кто работает в указанное время
+                try:
+                    moment = input("Введите дату и время (ГГГГ-ММ-ДД ЧЧ:ММ) или оставьте пустым для текущего: ")
+                    moment = datetime.strptime(moment, "%Y-%m-%d %H:%M") if moment else datetime.now()
+                    staff = self.facade.get_staff_working_at(moment)
+
+                    self.clear_screen()
+                    self.display_header()
+                    print(f"СОТРУДНИКИ НА РАБОТЕ {moment.strftime('%Y-%m-%d %H:%M')}:")
+                    print("-" * 80)
+
+                    if not staff:
+                        print("В это время никто не работает")
+                    else:
+                        for employee in staff:
+                            print(f"{employee['name']} ({employee['role']}): смена {employee['shift_date']} "
+                                  f"{employee['shift_start']} - {employee['shift_end']}")
+
+                    print("-" * 80)
+                    input("Нажмите Enter для возврата...")
+                except ValueError:
+                    print("Некорректный ввод")
+                    time.sleep(1)
+
+            elif choice == "6":
+                # Импортировать расписание из CSV
+                path = input("Путь к файлу CSV (emp_id,date,start,end): ")
+                self.facade.import_schedule(path)
+                input("Нажмите Enter для возврата...")
+
+            elif choice == "7":
+                # Автоматически спланировать смены
+                try:
+                    start_date = input("Введите дату начала (ГГГГ-ММ-ДД) или оставьте пустым для завтрашней: ")
+                    days = int(input("Количество дней (по умолчанию 7): ") or "7")
+                    plan = self.facade.plan_shifts(start_date or None, days)
+
+                    self.clear_screen()
+                    self.display_header()
+                    print("ПЛАН СМЕН:")
+                    print("-" * 80)
+
+                    if plan:
+                        for shift in plan["shifts"]:
+                            print(f"{shift['date']} {shift['start']} - {shift['end']}: сотрудник {shift['emp_id']}")
+                        print(f"\nСмен: {len(plan['shifts'])}, стоимость: {plan['cost']:.2f} лей.")
+                        for role, hours in plan["uncovered"].items():
+                            print(f"Не покрыто ({role}): {hours} ч.")
+                        print("План сохранен" if plan["applied"] else "План не сохранен")
+
+                    print("-" * 80)
+                    input("Нажмите Enter для возврата...")
+                except ValueError:
+                    print("Некорректный ввод")
+                    time.sleep(1)
+
     def handle_reports(self):
         """Обработка раздела отчетов"""
         while True:
@@ -412,6 +499,8 @@ class ConsoleUI:
             print("1. Отчет по продажам")
             print("2. Отчет по инвентарю")
             print("3. Финансовый отчет")
+            print("4. Записать расход")
+            print("5. Отчет по времени обслуживания")
             print("0. Назад")
             print("-" * 80)
 
@@ -446,7 +535,8 @@ class ConsoleUI:
 
             elif choice == "3":
                 # Финансовый отчет
-                period = input("Введите период отчета (по умолчанию 'текущий месяц'): ") or "текущий месяц"
+                period = input("Введите период отчета (день, неделя, месяц, год, ГГГГ-ММ, "
+                               "ГГГГ-ММ-ДД - ГГГГ-ММ-ДД; по умолчанию 'текущий месяц'): ") or "текущий месяц"
                 report = self.facade.generate_financial_report(period)
 
                 self.clear_screen()
@@ -455,6 +545,35 @@ class ConsoleUI:
                 print("-" * 80)
                 input("Нажмите Enter для возврата...")
 
+            elif choice == "4":
+                # Записать расход
+                try:
+                    category = input("Введите категорию расхода: ")
+                    amount = float(input("Введите сумму: "))
+                    date = input("Введите дату (ГГГГ-ММ-ДД) или оставьте пустым для текущей даты: ")
+
+                    if self.facade.record_expense(category, amount, date or None):
+                        print(f"Расход '{category}' на сумму {amount:.2f} лей. записан")
+                    time.sleep(1)
+                except ValueError:
+                    print("Некорректный ввод")
+                    time.sleep(1)
+
+            elif choice == "5":
+                # Отчет по времени обслуживания
+                try:
+                    hours = int(input("Введите количество часов для отчета (по умолчанию 24): ") or "24")
+                    report = self.facade.generate_lifecycle_report(hours)
+
+                    self.clear_screen()
+                    self.display_header()
+                    print(report)
+                    print("-" * 80)
+                    input("Нажмите Enter для возврата...")
+                except ValueError:
+                    print("Некорректный ввод")
+                    time.sleep(1)
+
     def run(self):
         """Запустить пользовательский интерфейс"""
         while self.running:
@@ -478,6 +597,143 @@ class ConsoleUI:
                 time.sleep(1)
 
 
+def run_batch(path: str, verbose: bool = False, stop_on_error: bool = False, metrics_path: str = None) -> int:
+    """Выполнить сценарий или поток JSONL без экранов и пауз; "-" - читать из стандартного ввода."""
+    from services.batch_runner import BatchRunner, format_batch_stats
+
+    try:
+        source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    except OSError as error:
+        print(f"Ошибка чтения сценария {path}: {error}")
+        return 1
+
+    facade = RestaurantFacade()
+    if metrics_path:
+        facade.enable_instrumentation()
+    runner = BatchRunner(facade, stop_on_error=stop_on_error)
+
+    try:
+        if verbose:
+            stats = runner.run(source)
+        else:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                stats = runner.run(source)
+    except (OSError, UnicodeDecodeError) as error:
+        print(f"Ошибка чтения сценария {path}: {error}")
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        facade.shutdown()
+
+    print(format_batch_stats(stats))
+    if metrics_path and facade.export_metrics(metrics_path):
+        print(f"Метрики сохранены в {metrics_path}")
+    return 1 if stats["failed"] else 0
+
+
+def run_simulation(seed: int = 42, scale: float = 1.0, day: str = None, metrics_path: str = None) -> int:
+    """Проиграть модельный рабочий день и вывести достигнутую пропускную способность."""
+    from services.day_simulator import DaySimulator, format_simulation_summary
+
+    try:
+        simulated_day = datetime.strptime(day, "%Y-%m-%d").date() if day else None
+    except ValueError:
+        print(f"Некорректная дата: {day}")
+        return 1
+
+    facade = RestaurantFacade()
+    facade.enable_instrumentation()
+    simulator = DaySimulator(facade, seed=seed, day=simulated_day, scale=scale)
+    try:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            stats = simulator.run()
+    finally:
+        facade.shutdown()
+
+    print(format_simulation_summary(stats))
+    if metrics_path and facade.export_metrics(metrics_path):
+        print(f"Метрики сохранены в {metrics_path}")
+    return 0
+
+
+def run_sharded_simulation(venues: int, shards: int = None, seed: int = 42, scale: float = 1.0,
+                           day: str = None) -> int:
+    """Проиграть модельный день в нескольких заведениях, распределенных по процессам-шардам."""
+    from server.venue_shards import VenueRouter
+
+    try:
+        simulated_day = datetime.strptime(day, "%Y-%m-%d").date() if day else datetime.now().date()
+    except ValueError:
+        print(f"Некорректная дата: {day}")
+        return 1
+
+    venue_ids = [f"venue-{index + 1}" for index in range(venues)]
+    with VenueRouter(shards) as router:
+        started = time.perf_counter()
+        results = router.call_batch([
+            (venue_id, "simulate_day", (seed + index, scale, simulated_day), {})
+            for index, venue_id in enumerate(venue_ids)
+        ])
+        elapsed = time.perf_counter() - started
+
+        total_orders = 0
+        total_calls = 0
+        print(f"=== МОДЕЛЬ ДНЯ {simulated_day}: {venues} заведений, {router.shards} шардов ===")
+        for venue_id, stats in zip(venue_ids, results):
+            if isinstance(stats, Exception):
+                print(f"{venue_id}: ошибка - {stats}")
+                continue
+            total_orders += stats["orders"]
+            total_calls += stats["facade_calls"]
+            print(f"{venue_id}: {stats['orders']} заказов, {stats['revenue']:.2f} лей., "
+                  f"{stats['wall_seconds']:.3f} с в шарде")
+        print(f"Всего: {total_orders} заказов за {elapsed:.3f} с, "
+              f"{total_calls / elapsed:,.0f} вызовов фасада/с, {total_orders / elapsed:,.0f} заказов/с\n")
+
+        print(router.generate_sales_report((datetime.now().date() - simulated_day).days + 1))
+        day_end = datetime.combine(simulated_day, datetime.min.time()) + timedelta(days=1, hours=2)
+        print(router.generate_lifecycle_report(26, end_time=day_end))
+    return 0
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Система управления рестораном")
+    parser.add_argument("--batch", metavar="PATH",
+                        help="выполнить сценарий или JSONL без интерактивного интерфейса (- для stdin)")
+    parser.add_argument("--verbose", action="store_true", help="показывать вывод команд в пакетном режиме")
+    parser.add_argument("--stop-on-error", action="store_true", help="остановиться на первой ошибке")
+    parser.add_argument("--serve", action="store_true", help="запустить HTTP/JSON API вместо консоли")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="замерять операции и записать снимок при завершении (.prom - формат Prometheus); "
+                             "сервер также отдает его по GET /metrics")
+    parser.add_argument("--simulate", action="store_true", help="проиграть модельный рабочий день и вывести сводку")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора для модели дня")
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель потока гостей в модели дня")
+    parser.add_argument("--day", metavar="ГГГГ-ММ-ДД", help="дата модельного дня (по умолчанию сегодня)")
+    parser.add_argument("--venues", type=int, default=1,
+                        help="число заведений в модели дня; больше одного - шардированный режим")
+    parser.add_argument("--shards", type=int, help="число процессов-шардов (по умолчанию по числу ядер)")
+    options = parser.parse_args()
+
+    if options.batch:
+        sys.exit(run_batch(options.batch, options.verbose, options.stop_on_error, options.metrics))
+
+    if options.simulate and options.venues > 1:
+        sys.exit(run_sharded_simulation(options.venues, options.shards, options.seed, options.scale, options.day))
+
+    if options.simulate:
+        sys.exit(run_simulation(options.seed, options.scale, options.day, options.metrics))
+
+    if options.serve:
+        from server.http_server import run_server
+        run_server(options.host, options.port, metrics_path=options.metrics)
+        sys.exit(0)
+
     ui = ConsoleUI()
-    ui.run()
+    try:
+        ui.run()
+    finally:
+        ui.facade.shutdown()
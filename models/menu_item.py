@@ -26,12 +26,24 @@ class MenuComponent(ABC):
 
 
 class MenuItem(MenuComponent):
+    # Растет при каждом изменении цены любого блюда; по нему заказы сбрасывают кэш своего вывода
+    price_version = 0
+
     def __init__(self, name: str, description: str, price: float):
         super().__init__(name, description)
-        self.price = price
+        self._price = price
+
+    @property
+    def price(self) -> float:
+        return self._price
+
+    @price.setter
+    def price(self, value: float):
+        self._price = value
+        MenuItem.price_version += 1
 
     def get_price(self) -> float:
-        return self.price
+        return self._price
 
     def display(self, indent: int = 0) -> str:
         return " " * indent + f"- {self.name}: {self.price:.2f} лей ({self.description})"
@@ -56,6 +68,16 @@ class MenuCategory(MenuComponent):
     def get_price(self) -> float:
         return sum(component.get_price() for component in self.menu_components)
 
+    def get_all_items(self) -> List[MenuItem]:
+        # Блюда всех вложенных категорий в порядке обхода меню
+        items = []
+        for component in self.menu_components:
+            if isinstance(component, MenuCategory):
+                items.extend(component.get_all_items())
+            else:
+                items.append(component)
+        return items
+
     def display(self, indent: int = 0) -> str:
         result = " " * indent + f"{self.name}:" + ("\n" if self.menu_components else "")
 
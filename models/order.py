@@ -1,7 +1,15 @@
-from typing import List, Dict
+from bisect import bisect_right, insort
+from typing import List, Dict, Callable, Iterator, Optional, Tuple
 from datetime import datetime
 from models.menu_item import MenuItem
 
+STATUS_CREATED = "Created"
+STATUS_COOKING = "Готовится"
+STATUS_READY = "Готов"
+STATUS_DELIVERED = "Доставлен"
+STATUS_COMPLETED = "Завершен"
+PAID = "Paid"
+REFUNDED = "Refunded"
 
 class OrderItem:
     def __init__(self, menu_item: MenuItem, quantity: int = 1):
@@ -16,21 +24,53 @@ class OrderItem:
 
 
 class Order:
-    def __init__(self, order_id: int, table_number: int):
+    # Источник времени для отметок заказа; OrderManager передает свой
+    clock: Callable[[], datetime] = datetime.now
+
+    def __init__(self, order_id: int, table_number: int, clock: Callable[[], datetime] = None):
         self.order_id = order_id
         self.table_number = table_number
+        if clock is not None:
+            self.clock = clock
         self.items: List[OrderItem] = []
-        self.creation_time = datetime.now()
-        self.status = "Created"
+        self.creation_time = self.clock()
+        self.status = STATUS_CREATED
         self.payment_status = "Unpaid"
+        self.status_times: Dict[str, datetime] = {}
+        self.last_transition: Optional[str] = STATUS_CREATED
+        self.observers: List[Callable[["Order"], None]] = []
+        self._rendered: Optional[str] = None
+        # Версия цен меню, при которой построен кэш вывода: цены меняются без уведомления заказа
+        self._rendered_prices = MenuItem.price_version
+
+    def add_observer(self, observer: Callable[["Order"], None]):
+        self.observers.append(observer)
+
+    def notify_observers(self):
+        # Любое изменение заказа проходит через уведомление, поэтому здесь сбрасывается кэш вывода
+        self._rendered = None
+        for observer in self.observers:
+            observer(self)
+
+    def __getstate__(self) -> Dict:
+        # Наблюдатели и часы привязаны к процессу-владельцу и не сериализуются
+        state = self.__dict__.copy()
+        state.pop("clock", None)
+        state["observers"] = []
+        state["_rendered"] = None
+        return state
 
     def add_item(self, menu_item: MenuItem, quantity: int = 1):
         for item in self.items:
             if item.menu_item.name == menu_item.name:
                 item.quantity += quantity
+                self.last_transition = None
+                self.notify_observers()
                 return
 
         self.items.append(OrderItem(menu_item, quantity))
+        self.last_transition = None
+        self.notify_observers()
 
     def remove_item(self, item_name: str, quantity: int = 1):
         for i, item in enumerate(self.items):
@@ -39,6 +79,8 @@ class Order:
                     self.items.pop(i)
                 else:
                     item.quantity -= quantity
+                self.last_transition = None
+                self.notify_observers()
                 return True
         return False
 
@@ -47,41 +89,125 @@ class Order:
 
     def change_status(self, status: str):
         self.status = status
+        self._record_transition(status)
 
     def mark_as_paid(self, payment_method: str):
-        self.payment_status = f"Paid ({payment_method})"
+        self.payment_status = f"{PAID} ({payment_method})"
+        self._record_transition(PAID)
 
-    def __str__(self) -> str:
-        result = f"Заказ #{self.order_id} (Стол {self.table_number})\n"
-        result += f"Статус: {self.status}, Оплата: {self.payment_status}\n"
-        result += "Элементы заказа:\n"
+    def mark_as_refunded(self):
+        self.payment_status = REFUNDED
+        self.last_transition = None
+        self.notify_observers()
 
-        for item in self.items:
-            result += f"  {item}\n"
+    def get_status_time(self, status: str) -> Optional[datetime]:
+        if status == STATUS_CREATED:
+            return self.creation_time
+        return self.status_times.get(status)
 
-        result += f"Итого: {self.get_total_price():.2f} лей."
-        return result
+    def _record_transition(self, status: str):
+        self.status_times[status] = self.clock()
+        self.last_transition = status
+        self.notify_observers()
+
+    def is_paid(self) -> bool:
+        return self.payment_status.startswith(PAID)
+
+    def __str__(self) -> str:
+        if self._rendered is None or self._rendered_prices != MenuItem.price_version:
+            lines = [
+                f"Заказ #{self.order_id} (Стол {self.table_number})",
+                f"Статус: {self.status}, Оплата: {self.payment_status}",
+                "Элементы заказа:"
+            ]
+            lines.extend(f"  {item}" for item in self.items)
+            lines.append(f"Итого: {self.get_total_price():.2f} лей.")
+            self._rendered = "\n".join(lines)
+            self._rendered_prices = MenuItem.price_version
+        return self._rendered
 
 
 class OrderManager:
-    def __init__(self):
+    def __init__(self, clock: Callable[[], datetime] = None):
+        # Часы можно заменить в любой момент (симулятор подставляет модельное время): заказы обращаются к ним через now
+        self.clock = clock or datetime.now
         self.orders: Dict[int, Order] = {}
         self.next_order_id = 1
+        self.listeners: List[Callable[[Order], None]] = []
+        # Номера незавершенных заказов по возрастанию, для постраничного вывода
+        self._active_ids: List[int] = []
+
+    def add_listener(self, listener: Callable[[Order], None]):
+        self.listeners.append(listener)
+
+    def now(self) -> datetime:
+        return self.clock()
 
     def create_order(self, table_number: int) -> Order:
-        order = Order(self.next_order_id, table_number)
+        order = Order(self.next_order_id, table_number, self.now)
+        order.add_observer(self._on_order_changed)
         self.orders[self.next_order_id] = order
         self.next_order_id += 1
+        self._on_order_changed(order)
         return order
 
+    def _on_order_changed(self, order: Order):
+        self._update_active(order)
+        for listener in self.listeners:
+            listener(order)
+
     def get_order(self, order_id: int) -> Order:
         return self.orders.get(order_id)
 
     def get_all_orders(self) -> List[Order]:
         return list(self.orders.values())
 
+    def iter_orders(self, start_date: datetime = None, end_date: datetime = None) -> Iterator[Order]:
+        for order in self.orders.values():
+            if start_date is not None and order.creation_time < start_date:
+                continue
+            if end_date is not None and order.creation_time > end_date:
+                continue
+            yield order
+
+    def _update_active(self, order: Order):
+        position = bisect_right(self._active_ids, order.order_id)
+        is_listed = position > 0 and self._active_ids[position - 1] == order.order_id
+        is_active = order.status != STATUS_COMPLETED
+
+        if is_active and not is_listed:
+            insort(self._active_ids, order.order_id)
+        elif is_listed and not is_active:
+            del self._active_ids[position - 1]
+
     def get_active_orders(self) -> List[Order]:
-        return [order for order in self.orders.values() if order.status != "Completed"]
+        return [self.orders[order_id] for order_id in self._active_ids]
+
+    def get_orders_page(self, page_size: int = 20, cursor: str = None,
+                        active_only: bool = True) -> Tuple[List[Order], Optional[str]]:
+        """Страница заказов по возрастанию номера и курсор следующей страницы (None - страниц больше нет)."""
+        if page_size < 1:
+            raise ValueError(f"Некорректный размер страницы: {page_size}")
+        try:
+            after_id = int(cursor) if cursor else 0
+        except ValueError:
+            raise ValueError(f"Некорректный курсор: {cursor}")
+
+        if active_only:
+            start = bisect_right(self._active_ids, after_id)
+            page = [self.orders[order_id] for order_id in self._active_ids[start:start + page_size]]
+            has_more = start + page_size < len(self._active_ids)
+        else:
+            page = []
+            order_id = after_id + 1
+            while order_id < self.next_order_id and len(page) < page_size:
+                if order_id in self.orders:
+                    page.append(self.orders[order_id])
+                order_id += 1
+            has_more = order_id < self.next_order_id
+
+        next_cursor = str(page[-1].order_id) if page and has_more else None
+        return page, next_cursor
 
     def get_table_orders(self, table_number: int) -> List[Order]:
         return [order for order in self.orders.values() if order.table_number == table_number]
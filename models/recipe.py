@@ -0,0 +1,50 @@
+from typing import Dict, List, Tuple, Iterable
+from models.menu_item import MenuItem
+from models.order import Order
+
+
+class RecipeBook:
+    def __init__(self):
+        self.recipes: Dict[str, Dict[str, float]] = {}
+        self.ingredients: List[str] = []
+        self._ingredient_index: Dict[str, int] = {}
+        # Строки разреженной матрицы "блюдо x ингредиент": (индекс ингредиента, количество на порцию)
+        self._rows: Dict[str, Tuple[Tuple[int, float], ...]] = {}
+
+    def add_recipe(self, menu_item: MenuItem, ingredients: Dict[str, float]):
+        self.recipes[menu_item.name] = dict(ingredients)
+
+        row = []
+        for ingredient, quantity in ingredients.items():
+            index = self._ingredient_index.get(ingredient)
+            if index is None:
+                index = self._ingredient_index[ingredient] = len(self.ingredients)
+                self.ingredients.append(ingredient)
+            row.append((index, quantity))
+        self._rows[menu_item.name] = tuple(row)
+
+    def get_recipe(self, dish_name: str) -> Dict[str, float]:
+        return self.recipes.get(dish_name, {})
+
+    def get_requirements(self, order: Order) -> Dict[str, float]:
+        totals: Dict[int, float] = {}
+
+        for item in order.items:
+            for index, quantity in self._rows.get(item.menu_item.name, ()):
+                totals[index] = totals.get(index, 0.0) + quantity * item.quantity
+
+        return {self.ingredients[index]: quantity for index, quantity in totals.items()}
+
+    def get_batch_requirements(self, orders: Iterable[Order]) -> Dict[str, float]:
+        dish_counts: Dict[str, int] = {}
+        for order in orders:
+            for item in order.items:
+                dish_name = item.menu_item.name
+                dish_counts[dish_name] = dish_counts.get(dish_name, 0) + item.quantity
+
+        totals: Dict[int, float] = {}
+        for dish_name, count in dish_counts.items():
+            for index, quantity in self._rows.get(dish_name, ()):
+                totals[index] = totals.get(index, 0.0) + quantity * count
+
+        return {self.ingredients[index]: quantity for index, quantity in totals.items()}
@@ -0,0 +1,410 @@
+import asyncio
+import io
+import json
+import re
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+from facade.restaurant_facade import RestaurantFacade
+from models.menu_item import MenuComponent, MenuCategory
+from models.order import Order
+
+MAX_BODY_SIZE = 1024 * 1024
+MAX_HEADER_SIZE = 64 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented"
+}
+
+
+class PlainText(str):
+    """Ответ обработчика, отдаваемый как есть, без JSON-обертки."""
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def order_to_dict(order: Order) -> Dict[str, Any]:
+    return {
+        "order_id": order.order_id,
+        "table_number": order.table_number,
+        "status": order.status,
+        "payment_status": order.payment_status,
+        "creation_time": order.creation_time.isoformat(timespec="seconds"),
+        "items": [
+            {"name": item.menu_item.name, "quantity": item.quantity, "price": item.menu_item.get_price()}
+            for item in order.items
+        ],
+        "total": order.get_total_price()
+    }
+
+
+def menu_to_dict(component: MenuComponent) -> Dict[str, Any]:
+    if isinstance(component, MenuCategory):
+        return {
+            "name": component.name,
+            "description": component.description,
+            "items": [menu_to_dict(child) for child in component.menu_components]
+        }
+    return {"name": component.name, "description": component.description, "price": component.get_price()}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="seconds")
+    if hasattr(value, "items"):
+        return dict(value.items())
+    if hasattr(value, "__iter__"):
+        return list(value)
+    return str(value)
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body", "params")
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path.rstrip("/") or "/"
+        self.query = dict(parse_qsl(url.query))
+        self.headers = headers
+        self.body = body
+        self.params: Dict[str, str] = {}
+
+    def json(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Тело запроса не является JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Ожидался JSON-объект")
+        return data
+
+    def field(self, data: Dict[str, Any], name: str, kind: type = str, default: Any = ...) -> Any:
+        if name not in data:
+            if default is ...:
+                raise HTTPError(400, f"Не указано поле {name}")
+            return default
+        try:
+            return kind(data[name])
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"Некорректное значение поля {name}")
+
+
+Handler = Callable[[Request], Tuple[int, Any]]
+
+
+class RestaurantHTTPServer:
+    """HTTP/1.1 JSON API поверх RestaurantFacade.
+
+    Все обращения к фасаду выполняются в потоке цикла событий, поэтому общее состояние
+    не требует блокировок. Соединения keep-alive; конвейерные запросы читаются из буфера
+    соединения и обслуживаются по порядку.
+    """
+
+    def __init__(self, facade: RestaurantFacade = None, host: str = "127.0.0.1", port: int = 8080):
+        self.facade = facade or RestaurantFacade()
+        self.host = host
+        self.port = port
+        self.requests_served = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes: List[Tuple[str, re.Pattern, Handler]] = []
+        self._register_routes()
+
+    def route(self, method: str, pattern: str, handler: Handler):
+        self._routes.append((method, re.compile(f"^{pattern}$"), handler))
+
+    def _register_routes(self):
+        self.route("GET", "/health", lambda request: (200, {"requests_served": self.requests_served}))
+        self.route("GET", "/menu", lambda request: (200, menu_to_dict(self.facade.menu)))
+
+        self.route("GET", "/orders", self._list_orders)
+        self.route("POST", "/orders", self._create_order)
+        self.route("GET", r"/orders/(?P<order_id>\d+)", self._get_order)
+        self.route("POST", r"/orders/(?P<order_id>\d+)/items", self._add_item)
+        self.route("POST", r"/orders/(?P<order_id>\d+)/submit", self._order_action("submit_order_to_kitchen"))
+        self.route("POST", r"/orders/(?P<order_id>\d+)/complete", self._order_action("complete_order"))
+        self.route("POST", r"/orders/(?P<order_id>\d+)/deliver", self._order_action("deliver_order"))
+        self.route("POST", r"/orders/(?P<order_id>\d+)/payment", self._pay_order)
+
+        self.route("GET", "/inventory", lambda request: (200, self.facade.check_inventory()))
+        self.route("PUT", "/inventory", self._update_inventory)
+        self.route("GET", "/inventory/low-stock", lambda request: (200, self.facade.check_low_stock()))
+        self.route("GET", "/inventory/changes", self._inventory_changes)
+
+        self.route("GET", "/staff", lambda request: (200, [dict(member) for member in self.facade.get_all_staff()]))
+        self.route("GET", "/staff/on-shift", lambda request: (200, self.facade.get_staff_on_shift(request.query.get("date"))))
+        self.route("GET", "/staff/working", self._staff_working)
+        self.route("POST", "/staff/shifts", self._schedule_shift)
+
+        self.route("GET", "/reports/sales", self._report(
+            lambda request: self.facade.generate_sales_report(request.field(request.query, "days", int, 30))))
+        self.route("GET", "/reports/financial", self._report(
+            lambda request: self.facade.generate_financial_report(request.query.get("period", "текущий месяц"))))
+        self.route("GET", "/reports/inventory", self._report(lambda request: self.facade.generate_inventory_report()))
+        self.route("GET", "/reports/lifecycle", self._report(
+            lambda request: self.facade.generate_lifecycle_report(request.field(request.query, "hours", int, 24))))
+        self.route("GET", "/reports/reorder", self._report(lambda request: self.facade.generate_reorder_report()))
+        self.route("POST", "/expenses", self._record_expense)
+
+        self.route("GET", "/metrics", self._metrics)
+
+    # --- Обработчики ---
+
+    def _order(self, request: Request) -> Order:
+        order = self.facade.order_manager.get_order(int(request.params["order_id"]))
+        if order is None:
+            raise HTTPError(404, f"Заказ #{request.params['order_id']} не найден")
+        return order
+
+    def _list_orders(self, request: Request) -> Tuple[int, Any]:
+        active_only = request.query.get("active") == "1"
+        if "limit" in request.query:
+            try:
+                orders, next_cursor = self.facade.order_manager.get_orders_page(
+                    request.field(request.query, "limit", int), request.query.get("cursor"), active_only)
+            except ValueError as error:
+                raise HTTPError(400, str(error))
+            return 200, {"orders": [order_to_dict(order) for order in orders], "next_cursor": next_cursor}
+
+        orders = self.facade.order_manager.get_active_orders() if active_only else self.facade.order_manager.get_all_orders()
+        return 200, [order_to_dict(order) for order in orders]
+
+    def _create_order(self, request: Request) -> Tuple[int, Any]:
+        data = request.json()
+        order = self.facade.create_order(request.field(data, "table_number", int))
+        return 201, order_to_dict(order)
+
+    def _get_order(self, request: Request) -> Tuple[int, Any]:
+        return 200, order_to_dict(self._order(request))
+
+    def _add_item(self, request: Request) -> Tuple[int, Any]:
+        order = self._order(request)
+        data = request.json()
+        result = self.facade.add_item_to_order(
+            order.order_id, request.field(data, "item_name"), request.field(data, "quantity", int, 1))
+        return self._result(result, order_to_dict(order))
+
+    def _order_action(self, action: str) -> Handler:
+        # Метод фасада берется при каждом запросе: инструментация подменяет его на экземпляре
+        def handler(request: Request) -> Tuple[int, Any]:
+            order = self._order(request)
+            return self._result(getattr(self.facade, action)(order.order_id), order_to_dict(order))
+        return handler
+
+    def _pay_order(self, request: Request) -> Tuple[int, Any]:
+        order = self._order(request)
+        data = request.json()
+        result = self.facade.process_payment(
+            order.order_id, request.field(data, "payment_type"), request.field(data, "details", dict, None))
+        return self._result(result, order_to_dict(order))
+
+    def _update_inventory(self, request: Request) -> Tuple[int, Any]:
+        data = request.json()
+        result = self.facade.update_inventory_item(
+            request.field(data, "category"), request.field(data, "name"), request.field(data, "quantity", float))
+        return self._result(result)
+
+    def _inventory_changes(self, request: Request) -> Tuple[int, Any]:
+        version, changes = self.facade.inventory_adapter.changes_since(request.field(request.query, "since", int, 0))
+        return 200, {"version": version, "changes": changes}
+
+    def _staff_working(self, request: Request) -> Tuple[int, Any]:
+        moment = None
+        if "at" in request.query:
+            try:
+                moment = datetime.fromisoformat(request.query["at"])
+            except ValueError:
+                raise HTTPError(400, "Некорректное время: ожидается ГГГГ-ММ-ДДTЧЧ:ММ")
+        return 200, self.facade.get_staff_working_at(moment)
+
+    def _schedule_shift(self, request: Request) -> Tuple[int, Any]:
+        data = request.json()
+        result = self.facade.schedule_shift(
+            request.field(data, "staff_id"), request.field(data, "date"),
+            request.field(data, "start_time"), request.field(data, "end_time"))
+        return self._result(result)
+
+    def _record_expense(self, request: Request) -> Tuple[int, Any]:
+        data = request.json()
+        result = self.facade.record_expense(
+            request.field(data, "category"), request.field(data, "amount", float), request.field(data, "date", str, None))
+        return self._result(result)
+
+    def _metrics(self, request: Request) -> Tuple[int, Any]:
+        if self.facade.instrumentation is None:
+            raise HTTPError(404, "Инструментация не включена")
+        if request.query.get("format") == "text":
+            return 200, PlainText(self.facade.get_metrics("text"))
+        return 200, PlainText(self.facade.get_metrics("prometheus"))
+
+    def _report(self, build: Callable[[Request], str]) -> Handler:
+        return lambda request: (200, {"report": build(request)})
+
+    def _result(self, succeeded: bool, payload: Any = None) -> Tuple[int, Any]:
+        if not succeeded:
+            raise HTTPError(400, "Операция не выполнена")
+        return 200, payload if payload is not None else {}
+
+    # --- HTTP ---
+
+    def dispatch(self, request: Request) -> Tuple[int, Any]:
+        method_allowed = False
+        for method, pattern, handler in self._routes:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                method_allowed = True
+                continue
+
+            request.params = match.groupdict()
+            # Фасад сообщает о результатах через print; сообщения возвращаются клиенту
+            output = io.StringIO()
+            try:
+                with redirect_stdout(output):
+                    status, data = handler(request)
+                if isinstance(data, PlainText):
+                    return status, data
+                body = {"ok": True, "data": data}
+            except HTTPError as error:
+                status, body = error.status, {"ok": False, "error": str(error)}
+
+            messages = output.getvalue().splitlines()
+            if messages:
+                body["messages"] = messages
+            return status, body
+
+        if method_allowed:
+            return 405, {"ok": False, "error": f"Метод {request.method} не поддерживается для {request.path}"}
+        return 404, {"ok": False, "error": f"Неизвестный путь: {request.path}"}
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(400, "Слишком большой заголовок запроса")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Некорректная строка запроса")
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        headers[":version"] = version
+
+        # Тело читается только по Content-Length; chunked и другие кодирования передачи не поддерживаются
+        if "transfer-encoding" in headers:
+            raise HTTPError(501, "Transfer-Encoding не поддерживается, укажите Content-Length")
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Некорректный Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Некорректный Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(413, "Слишком большое тело запроса")
+
+        body = await reader.readexactly(length) if length else b""
+        return Request(method, target, headers, body)
+
+    def _response(self, status: int, body: Any, keep_alive: bool) -> bytes:
+        if isinstance(body, PlainText):
+            payload = body.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            payload = json.dumps(body, ensure_ascii=False, default=_json_default).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + payload
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as error:
+                    writer.write(self._response(error.status, {"ok": False, "error": str(error)}, False))
+                    break
+                if request is None:
+                    break
+
+                connection = request.headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (
+                    request.headers[":version"] != "HTTP/1.0" or connection == "keep-alive")
+
+                try:
+                    status, body = self.dispatch(request)
+                except Exception as error:
+                    status, body = 500, {"ok": False, "error": f"Внутренняя ошибка: {error}"}
+                self.requests_served += 1
+
+                writer.write(self._response(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_SIZE)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8080, facade: RestaurantFacade = None,
+               metrics_path: str = None):
+    server = RestaurantHTTPServer(facade, host, port)
+    if metrics_path:
+        server.facade.enable_instrumentation()
+    print(f"Сервер API запущен на http://{host}:{port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.facade.shutdown()
+        if metrics_path and server.facade.export_metrics(metrics_path):
+            print(f"Метрики сохранены в {metrics_path}")
+        print("Сервер API остановлен")
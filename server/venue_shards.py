@@ -0,0 +1,256 @@
+import io
+import multiprocessing
+import pickle
+import zlib
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# Вызов: (номер, заведение, метод фасада, позиционные аргументы, именованные аргументы)
+Call = Tuple[int, str, str, tuple, dict]
+
+# Ответ: (номер, успех, результат или текст ошибки, сообщения фасада); по каналу идет в виде pickle
+Reply = Tuple[int, bool, Any, List[str]]
+
+STOP = None
+
+
+class ShardError(Exception):
+    pass
+
+
+def _venue_sales_summary(facade, start_day: date, end_day: date) -> Dict[str, Any]:
+    return facade.report_service.sales_aggregator.summarize(start_day, end_day)
+
+
+def _venue_lifecycle(facade, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+    return facade.report_service.lifecycle_tracker.snapshot(start_time, end_time)
+
+
+def _venue_simulate_day(facade, seed: int = 42, scale: float = 1.0, day: date = None) -> Dict[str, Any]:
+    from services.day_simulator import DaySimulator
+    return DaySimulator(facade, seed=seed, day=day, scale=scale).run()
+
+
+# Служебные операции шарда: имя: функция (фасад, аргументы...)
+SHARD_OPERATIONS = {
+    "sales_summary": _venue_sales_summary,
+    "lifecycle_buckets": _venue_lifecycle,
+    "simulate_day": _venue_simulate_day
+}
+
+
+def _execute(facade, method: str, args: tuple, kwargs: dict) -> Any:
+    operation = SHARD_OPERATIONS.get(method)
+    if operation is not None:
+        return operation(facade, *args, **kwargs)
+    if method.startswith("_"):
+        raise ValueError(f"Метод недоступен через маршрутизатор: {method}")
+    return getattr(facade, method)(*args, **kwargs)
+
+
+def _shard_main(connection, instrumented: bool):
+    """Цикл процесса шарда: принимает пачки вызовов и отвечает пачкой результатов."""
+    from facade.restaurant_facade import RestaurantFacade
+
+    facades: Dict[str, RestaurantFacade] = {}
+    try:
+        while True:
+            calls = connection.recv()
+            if calls is STOP:
+                break
+
+            # Каждый ответ сериализуется отдельно: несериализуемый результат портит только свой вызов
+            replies: List[bytes] = []
+            for call_id, venue_id, method, args, kwargs in calls:
+                facade = facades.get(venue_id)
+                if facade is None:
+                    facade = facades[venue_id] = RestaurantFacade()
+                    if instrumented:
+                        facade.enable_instrumentation()
+
+                output = io.StringIO()
+                try:
+                    with redirect_stdout(output):
+                        result = _execute(facade, method, args, kwargs)
+                    replies.append(pickle.dumps((call_id, True, result, output.getvalue().splitlines())))
+                except Exception as error:
+                    replies.append(pickle.dumps(
+                        (call_id, False, f"{type(error).__name__}: {error}", output.getvalue().splitlines())))
+            connection.send(replies)
+    except (EOFError, OSError, KeyboardInterrupt):
+        pass
+    finally:
+        for facade in facades.values():
+            facade.shutdown()
+        connection.close()
+
+
+def shard_for(venue_id: str, shards: int) -> int:
+    # crc32 вместо hash(): номер шарда не должен меняться между запусками
+    return zlib.crc32(venue_id.encode("utf-8")) % shards
+
+
+class VenueRouter:
+    """Шардированный режим: фасады заведений живут в отдельных процессах.
+
+    Заведение закрепляется за шардом по crc32 своего идентификатора; вызовы передаются по
+    каналу multiprocessing.Pipe. Результаты возвращаются копиями (заказы без наблюдателей),
+    сообщения фасада - в списке messages последнего вызова. Сводные отчеты собираются из
+    частичных результатов шардов.
+    """
+
+    def __init__(self, shards: int = None, instrumented: bool = False):
+        self.shards = shards or multiprocessing.cpu_count()
+        self.instrumented = instrumented
+        self.venues: set = set()
+        self.last_messages: List[str] = []
+        self._connections = []
+        self._processes = []
+        # Шарды, процесс или канал которых перестал отвечать
+        self._dead: set = set()
+        self._next_call_id = 0
+
+    def start(self):
+        if self._processes:
+            return
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        for _ in range(self.shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_shard_main, args=(child, self.instrumented), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def shutdown(self):
+        for connection in self._connections:
+            try:
+                connection.send(STOP)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._processes = []
+        self._dead = set()
+
+    def __enter__(self) -> "VenueRouter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    # --- Вызовы ---
+
+    def call(self, venue_id: str, method: str, *args, **kwargs) -> Any:
+        reply = self.call_batch([(venue_id, method, args, kwargs)])[0]
+        if isinstance(reply, ShardError):
+            raise reply
+        return reply
+
+    def call_batch(self, calls: Iterable[Tuple[str, str, tuple, dict]]) -> List[Any]:
+        """Выполнить пачку вызовов: каждый шард получает свою часть одним сообщением, шарды работают параллельно.
+
+        Порядок вызовов одного заведения сохраняется. Вместо результата неудачного вызова
+        возвращается ShardError; если шард недоступен, ShardError выбрасывается после того,
+        как получены ответы остальных шардов, а следующие вызовы к нему сразу завершаются ошибкой.
+        """
+        if not self._processes:
+            raise ShardError("Маршрутизатор не запущен")
+
+        batches: Dict[int, List[Call]] = {}
+        order: List[int] = []
+        for venue_id, method, args, kwargs in calls:
+            call_id = self._next_call_id
+            self._next_call_id += 1
+            self.venues.add(venue_id)
+            batches.setdefault(shard_for(venue_id, self.shards), []).append(
+                (call_id, venue_id, method, tuple(args), dict(kwargs)))
+            order.append(call_id)
+
+        dead = sorted(self._dead.intersection(batches))
+        if dead:
+            raise ShardError(f"Недоступные шарды: {', '.join(map(str, dead))}")
+
+        failures: List[str] = []
+        sent = []
+        for shard, batch in batches.items():
+            try:
+                self._connections[shard].send(batch)
+            except (BrokenPipeError, OSError) as error:
+                self._dead.add(shard)
+                failures.append(f"шард {shard} не принял вызовы ({error})")
+                continue
+            except (pickle.PicklingError, TypeError, AttributeError) as error:
+                # Пачка не сериализовалась и в канал не попала, шард остается рабочим
+                failures.append(f"аргументы для шарда {shard} не сериализуются ({error})")
+                continue
+            sent.append(shard)
+
+        # Ответы забираются у всех шардов, получивших пачку, иначе они достались бы следующему вызову
+        results: Dict[int, Any] = {}
+        self.last_messages = []
+        for shard in sent:
+            try:
+                replies = self._connections[shard].recv()
+            except (EOFError, OSError):
+                self._dead.add(shard)
+                failures.append(f"шард {shard} завершился аварийно")
+                continue
+            for payload in replies:
+                call_id, succeeded, result, messages = pickle.loads(payload)
+                results[call_id] = result if succeeded else ShardError(result)
+                self.last_messages.extend(messages)
+
+        if failures:
+            raise ShardError("; ".join(failures))
+
+        return [results[call_id] for call_id in order]
+
+    def broadcast(self, method: str, *args, venues: Iterable[str] = None, **kwargs) -> Dict[str, Any]:
+        venue_ids = sorted(venues if venues is not None else self.venues)
+        replies = self.call_batch([(venue_id, method, args, kwargs) for venue_id in venue_ids])
+        for reply in replies:
+            if isinstance(reply, ShardError):
+                raise reply
+        return dict(zip(venue_ids, replies))
+
+    # --- Сводные отчеты ---
+
+    def generate_sales_report(self, days: int = 30, venues: Iterable[str] = None) -> str:
+        from interfaces.report_interface import SalesReportGenerator
+        from services.parallel_report import merge_sales_summaries
+
+        end_day = date.today()
+        summaries = self.broadcast("sales_summary", end_day - timedelta(days=days), end_day, venues=venues)
+        merged = merge_sales_summaries(list(summaries.values()))
+
+        report = SalesReportGenerator().render_summary(merged)
+        if merged["orders"]:
+            report += "\nПо заведениям:\n"
+            for venue_id, summary in summaries.items():
+                report += f"  {venue_id}: {summary['orders']} заказов, {summary['revenue']:.2f} лей.\n"
+        return report
+
+    def generate_lifecycle_report(self, hours: int = 24, venues: Iterable[str] = None,
+                                  end_time: Optional[datetime] = None) -> str:
+        from interfaces.report_interface import LifecycleReportGenerator
+        from services.order_lifecycle import merge_lifecycle_buckets
+
+        end_time = end_time or datetime.now()
+        snapshots = self.broadcast("lifecycle_buckets", end_time - timedelta(hours=hours), end_time, venues=venues)
+        return LifecycleReportGenerator().generate_report(merge_lifecycle_buckets(list(snapshots.values())))
+
+    def check_low_stock(self, venues: Iterable[str] = None) -> List[Dict[str, Any]]:
+        return [
+            {"venue": venue_id, **item}
+            for venue_id, items in self.broadcast("check_low_stock", venues=venues).items()
+            for item in items
+        ]
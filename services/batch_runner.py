@@ -0,0 +1,131 @@
+import inspect
+import json
+import shlex
+import sys
+import time
+from typing import Dict, List, Any, Iterable, Optional, TextIO, Tuple
+
+from models.order import Order
+
+# Команда пакетного режима: метод фасада
+BATCH_COMMANDS = {
+    "create_order": "create_order",
+    "add_item": "add_item_to_order",
+    "submit": "submit_order_to_kitchen",
+    "complete": "complete_order",
+    "deliver": "deliver_order",
+    "pay": "process_payment",
+    "update_inventory": "update_inventory_item",
+    "schedule_shift": "schedule_shift",
+    "import_schedule": "import_schedule",
+    "plan_shifts": "plan_shifts",
+    "record_expense": "record_expense",
+    "sales_report": "generate_sales_report",
+    "inventory_report": "generate_inventory_report",
+    "financial_report": "generate_financial_report",
+    "lifecycle_report": "generate_lifecycle_report",
+    "reorder_report": "generate_reorder_report",
+    "export": "export_data"
+}
+
+LAST_ORDER = "$last"
+
+
+class BatchRunner:
+    """Выполняет команды из сценария (по строке на команду) или потока JSONL без интерактивного ввода.
+
+    Строка сценария: имя команды и позиционные аргументы, например `add_item 1 "Чай" 2`.
+    Строка JSONL: {"op": "add_item", "order_id": 1, "item_name": "Чай", "quantity": 2}.
+    Вместо номера заказа можно указать "$last" - последний созданный заказ.
+    """
+
+    def __init__(self, facade, stop_on_error: bool = False, errors: TextIO = None):
+        self.facade = facade
+        self.stop_on_error = stop_on_error
+        self.errors = errors or sys.stderr
+        self.last_order_id: Optional[int] = None
+        self._signatures: Dict[str, inspect.Signature] = {}
+
+    def parse_line(self, line: str) -> Optional[Tuple[str, List[Any], Dict[str, Any]]]:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return None
+
+        if line.startswith("{"):
+            command = json.loads(line)
+            op = command.pop("op")
+            return op, command.pop("args", []), command
+
+        parts = shlex.split(line)
+        return parts[0], parts[1:], {}
+
+    def execute(self, op: str, args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        if op not in BATCH_COMMANDS:
+            raise ValueError(f"Неизвестная команда: {op}")
+
+        method = getattr(self.facade, BATCH_COMMANDS[op])
+        signature = self._signatures.get(op)
+        if signature is None:
+            signature = self._signatures[op] = inspect.signature(method)
+
+        bound = signature.bind(*args, **kwargs)
+        for name, value in bound.arguments.items():
+            bound.arguments[name] = self._convert(value, signature.parameters[name].annotation)
+
+        result = method(*bound.args, **bound.kwargs)
+        if isinstance(result, Order):
+            self.last_order_id = result.order_id
+        return result
+
+    def _convert(self, value: Any, annotation: Any) -> Any:
+        if value == LAST_ORDER:
+            if self.last_order_id is None:
+                raise ValueError("Заказ для $last еще не создан")
+            return self.last_order_id
+        if isinstance(value, str) and annotation in (int, float):
+            return annotation(value)
+        return value
+
+    def run(self, lines: Iterable[str]) -> Dict[str, Any]:
+        stats = {"operations": 0, "succeeded": 0, "failed": 0, "by_command": {}}
+        started = time.perf_counter()
+
+        for line_number, line in enumerate(lines, 1):
+            command = None
+            try:
+                command = self.parse_line(line)
+                if command is None:
+                    continue
+                op = command[0]
+                result = self.execute(*command)
+                # Методы фасада сообщают об ошибке значением False или None; 0 и пустой результат - не ошибка
+                succeeded = result is not False and result is not None
+                error = None if succeeded else "команда завершилась неудачей"
+            except (ValueError, TypeError, KeyError) as exception:
+                op = command[0] if command else "?"
+                succeeded = False
+                error = str(exception)
+
+            stats["operations"] += 1
+            stats["succeeded" if succeeded else "failed"] += 1
+            stats["by_command"][op] = stats["by_command"].get(op, 0) + 1
+
+            if error is not None:
+                print(f"Строка {line_number} ({op}): {error}", file=self.errors)
+                if self.stop_on_error:
+                    break
+
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+
+def format_batch_stats(stats: Dict[str, Any]) -> str:
+    elapsed = stats["elapsed"]
+    rate = stats["operations"] / elapsed if elapsed > 0 else 0.0
+
+    result = "=== ПАКЕТНОЕ ВЫПОЛНЕНИЕ ===\n"
+    result += f"Операций: {stats['operations']} (успешно: {stats['succeeded']}, с ошибкой: {stats['failed']})\n"
+    result += f"Время: {elapsed:.3f} с, {rate:,.0f} операций/с\n"
+    for op, count in sorted(stats["by_command"].items()):
+        result += f"  {op}: {count}\n"
+    return result
@@ -0,0 +1,238 @@
+import heapq
+import itertools
+import math
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+from services.latency_histogram import LatencyHistogram
+
+# Среднее число пришедших столиков в час (часы работы 8:00-24:00)
+DEFAULT_ARRIVAL_CURVE = {
+    8: 4, 9: 6, 10: 5, 11: 8, 12: 18, 13: 20, 14: 12, 15: 7,
+    16: 6, 17: 10, 18: 18, 19: 24, 20: 22, 21: 14, 22: 8, 23: 4
+}
+
+DEFAULT_PAYMENT_MIX = {"cash": 0.3, "card": 0.55, "online": 0.15}
+
+# Сколько раз заказ повторно отправляется на кухню после нехватки продуктов
+MAX_SUBMIT_RETRIES = 3
+
+# Событие: (модельное время, порядковый номер, тип, номер заказа)
+Event = Tuple[datetime, int, str, int]
+
+
+class DaySimulator:
+    """Модель одного рабочего дня ресторана поверх фасада в модельном времени.
+
+    Столики приходят по неоднородному пуассоновскому потоку с почасовой интенсивностью,
+    выбирают блюда по закону Ципфа, затем заказ проходит кухню, подачу и оплату с
+    логнормальными задержками. Продукты списываются фасадом при отправке на кухню,
+    а раз в час поставщик довозит позиции с низким запасом. Часы менеджера заказов на время
+    прогона подменяются модельным временем, поэтому день проигрывается без ожидания.
+    """
+
+    def __init__(self, facade, seed: int = 42, day: date = None, scale: float = 1.0,
+                 arrival_curve: Dict[int, float] = None, payment_mix: Dict[str, float] = None,
+                 tables: int = 40, zipf_exponent: float = 1.0, restock_factor: float = 4.0):
+        self.facade = facade
+        self.rng = random.Random(seed)
+        self.day = day or date.today()
+        self.scale = scale
+        self.arrival_curve = arrival_curve or DEFAULT_ARRIVAL_CURVE
+        self.payment_mix = payment_mix or DEFAULT_PAYMENT_MIX
+        self.tables = tables
+        self.restock_factor = restock_factor
+
+        # Популярность блюд: случайный (но воспроизводимый) порядок и веса 1 / rank^s
+        self.dishes = [item.name for item in facade.menu.get_all_items()]
+        self.rng.shuffle(self.dishes)
+        self.dish_weights = [1.0 / (rank + 1) ** zipf_exponent for rank in range(len(self.dishes))]
+
+        self.now = datetime.combine(self.day, datetime.min.time())
+        self._events: List[Event] = []
+        self._sequence = itertools.count()
+        self._retries: Dict[int, int] = {}
+        self.stats: Dict[str, Any] = {}
+
+    def schedule(self, moment: datetime, kind: str, order_id: int = 0):
+        heapq.heappush(self._events, (moment, next(self._sequence), kind, order_id))
+
+    def _minutes(self, median: float, sigma: float = 0.4) -> timedelta:
+        return timedelta(minutes=median * math.exp(self.rng.gauss(0.0, sigma)))
+
+    def _schedule_arrivals(self):
+        day_start = datetime.combine(self.day, datetime.min.time())
+        for hour, per_hour in sorted(self.arrival_curve.items()):
+            rate = per_hour * self.scale
+            if rate <= 0:
+                continue
+            moment = day_start + timedelta(hours=hour)
+            hour_end = moment + timedelta(hours=1)
+            while True:
+                moment += timedelta(seconds=self.rng.expovariate(rate / 3600))
+                if moment >= hour_end:
+                    break
+                self.schedule(moment, "arrive")
+
+        for hour in range(min(self.arrival_curve), max(self.arrival_curve) + 1):
+            self.schedule(day_start + timedelta(hours=hour, minutes=30), "restock")
+
+    def run(self) -> Dict[str, Any]:
+        self.stats = {
+            "day": self.day.isoformat(),
+            "orders": 0,
+            "items": 0,
+            "submitted": 0,
+            "completed": 0,
+            "revenue": 0.0,
+            "payments": {method: 0 for method in self.payment_mix},
+            "shortages": 0,
+            "abandoned": 0,
+            "restocks": 0,
+            "events": 0,
+            "facade_calls": 0
+        }
+        self._schedule_arrivals()
+        handlers = {
+            "arrive": self._on_arrive,
+            "submit": self._on_submit,
+            "ready": self._on_ready,
+            "deliver": self._on_deliver,
+            "pay": self._on_pay,
+            "restock": self._on_restock
+        }
+
+        order_manager = self.facade.order_manager
+        previous_clock = order_manager.clock
+        order_manager.clock = lambda: self.now
+        started = time.perf_counter()
+        try:
+            while self._events:
+                self.now, _, kind, order_id = heapq.heappop(self._events)
+                handlers[kind](order_id)
+                self.stats["events"] += 1
+        finally:
+            order_manager.clock = previous_clock
+        self.stats["wall_seconds"] = time.perf_counter() - started
+
+        day_start = datetime.combine(self.day, datetime.min.time())
+        self.stats["simulated_seconds"] = (self.now - day_start).total_seconds()
+        self.stats["stages"] = self._stage_percentiles(day_start, self.now)
+        if self.facade.instrumentation is not None:
+            self.stats["timings"] = self.facade.instrumentation.snapshot()
+        return self.stats
+
+    def _call(self, method: str, *args):
+        self.stats["facade_calls"] += 1
+        return getattr(self.facade, method)(*args)
+
+    # --- События ---
+
+    def _on_arrive(self, _):
+        order = self._call("create_order", self.rng.randint(1, self.tables))
+        self.stats["orders"] += 1
+
+        guests = self.rng.choices((1, 2, 3, 4, 5, 6), weights=(15, 35, 15, 25, 5, 5))[0]
+        for dish in self.rng.choices(self.dishes, weights=self.dish_weights, k=guests + self.rng.randint(0, guests)):
+            self._call("add_item_to_order", order.order_id, dish, 1)
+            self.stats["items"] += 1
+
+        # Гости изучают меню и делают заказ
+        self.schedule(self.now + self._minutes(5), "submit", order.order_id)
+
+    def _on_submit(self, order_id: int):
+        if not self._call("submit_order_to_kitchen", order_id):
+            # Не хватило продуктов: срочная поставка недостающего и повторная отправка через четверть часа
+            self.stats["shortages"] += 1
+            retries = self._retries[order_id] = self._retries.get(order_id, 0) + 1
+            if retries > MAX_SUBMIT_RETRIES:
+                self.stats["abandoned"] += 1
+                return
+
+            order = self.facade.order_manager.get_order(order_id)
+            requirements = self.facade.recipe_book.get_requirements(order)
+            products = self.facade.check_inventory()["Продукты"]
+            for name, missing in self.facade.inventory_adapter.find_shortages(requirements).items():
+                self._call("update_inventory_item", "Продукты", name,
+                           products[name]["quantity"] + missing + products[name]["min_quantity"] * self.restock_factor)
+                self.stats["restocks"] += 1
+            self.schedule(self.now + timedelta(minutes=15), "submit", order_id)
+            return
+
+        self.stats["submitted"] += 1
+        items = len(self.facade.order_manager.get_order(order_id).items)
+        self.schedule(self.now + self._minutes(10 + 2 * items), "ready", order_id)
+
+    def _on_ready(self, order_id: int):
+        self._call("complete_order", order_id)
+        self.schedule(self.now + self._minutes(2, 0.6), "deliver", order_id)
+
+    def _on_deliver(self, order_id: int):
+        self._call("deliver_order", order_id)
+        self.schedule(self.now + self._minutes(35, 0.3), "pay", order_id)
+
+    def _on_pay(self, order_id: int):
+        methods = list(self.payment_mix)
+        method = self.rng.choices(methods, weights=[self.payment_mix[name] for name in methods])[0]
+        details = {"card_number": f"4000{self.rng.randrange(10 ** 12):012d}", "cardholder": "Гость"} \
+            if method == "card" else None
+
+        if self._call("process_payment", order_id, method, details):
+            order = self.facade.order_manager.get_order(order_id)
+            self.stats["completed"] += 1
+            self.stats["revenue"] += order.get_total_price()
+            self.stats["payments"][method] += 1
+
+    def _on_restock(self, _):
+        for item in self._call("check_low_stock"):
+            self._call("update_inventory_item", item["category"], item["name"],
+                       item["minimum"] * self.restock_factor)
+            self.stats["restocks"] += 1
+
+    def _stage_percentiles(self, start: datetime, end: datetime) -> Dict[str, Dict[str, float]]:
+        merged: Dict[str, LatencyHistogram] = {}
+        for bucket in self.facade.report_service.lifecycle_tracker.snapshot(start, end):
+            for stage, histogram in bucket["stages"].items():
+                merged.setdefault(stage, LatencyHistogram()).merge(histogram)
+
+        return {
+            stage: {"count": histogram.count, **{
+                f"p{level}_min": value / 60 for level, value in histogram.percentiles((50, 95)).items()
+            }}
+            for stage, histogram in merged.items() if histogram.count
+        }
+
+
+def format_simulation_summary(stats: Dict[str, Any], timing_layers: Optional[Sequence[str]] = ("facade",)) -> str:
+    wall = stats["wall_seconds"]
+    speedup = stats["simulated_seconds"] / wall if wall > 0 else 0.0
+
+    result = f"=== МОДЕЛЬ РАБОЧЕГО ДНЯ {stats['day']} ===\n"
+    result += (f"Заказов: {stats['orders']} (позиций: {stats['items']}, отправлено на кухню: {stats['submitted']}, "
+               f"оплачено: {stats['completed']})\n")
+    result += f"Выручка: {stats['revenue']:.2f} лей.\n"
+    result += "Оплата: " + ", ".join(f"{method} - {count}" for method, count in stats["payments"].items()) + "\n"
+    result += (f"Нехватка продуктов: {stats['shortages']} (заказов отменено: {stats['abandoned']}), "
+               f"поставок: {stats['restocks']}\n")
+
+    if stats["stages"]:
+        result += "\nЭтапы заказа (модельное время, мин):\n"
+        for stage, values in stats["stages"].items():
+            result += f"  {stage}: p50 {values['p50_min']:.1f}, p95 {values['p95_min']:.1f} ({values['count']} заказов)\n"
+
+    result += (f"\nПроигрывание: {wall:.3f} с, {stats['events'] / wall if wall > 0 else 0:,.0f} событий/с, "
+               f"{stats['facade_calls'] / wall if wall > 0 else 0:,.0f} вызовов фасада/с, "
+               f"{stats['orders'] / wall if wall > 0 else 0:,.0f} заказов/с, ускорение x{speedup:,.0f}\n")
+
+    for layer in timing_layers or ():
+        operations = stats.get("timings", {}).get(layer)
+        if not operations:
+            continue
+        result += f"\nВнутренние замеры ({layer}):\n"
+        result += f"{'операция':>30} {'вызовов':>9} {'p50, мкс':>10} {'p95, мкс':>10} {'p99, мкс':>10}\n"
+        for operation, values in operations.items():
+            result += (f"{operation:>30} {values['count']:>9} {values['p50_us']:>10.1f} "
+                       f"{values['p95_us']:>10.1f} {values['p99_us']:>10.1f}\n")
+    return result
@@ -0,0 +1,141 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Mapping
+
+import numpy as np
+
+from models.order import Order
+from models.recipe import RecipeBook
+from services.numpy_report_engine import OrderArrays
+
+EPOCH_DAY = date(1970, 1, 1)
+
+
+class DemandForecaster:
+    """Экспоненциально сглаженный дневной расход ингредиентов по истории заказов."""
+
+    def __init__(self, recipe_book: RecipeBook, alpha: float = 0.3,
+                 lead_time_days: float = 2.0, cover_days: float = 7.0):
+        self.recipe_book = recipe_book
+        self.alpha = alpha
+        self.lead_time_days = lead_time_days
+        self.cover_days = cover_days
+
+        self.ingredients = list(recipe_book.ingredients)
+        self._index = {name: i for i, name in enumerate(self.ingredients)}
+        self.rates = np.zeros(len(self.ingredients))
+        self.days_observed = 0
+        self._current_day: date = None
+        self._current = np.zeros(len(self.ingredients))
+
+    def _recipe_matrix(self, dish_names: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(dish_names), len(self.ingredients)))
+        for row, dish_name in enumerate(dish_names):
+            for ingredient, quantity in self.recipe_book.get_recipe(dish_name).items():
+                matrix[row, self._index[ingredient]] = quantity
+        return matrix
+
+    def fit(self, orders: List[Order], today: date = None):
+        """Пересчитать сглаженный расход по всей истории за один векторный проход."""
+        if today is None:
+            today = date.today()
+
+        self.rates[:] = 0.0
+        self._current[:] = 0.0
+        self.days_observed = 0
+        self._current_day = today
+        if not orders:
+            return
+
+        arrays = OrderArrays(orders)
+        order_days = arrays.creation_times.astype("datetime64[D]").astype(np.int64)
+        first_day = int(order_days.min())
+        last_day = max(int(order_days.max()), (today - EPOCH_DAY).days)
+        day_count = last_day - first_day + 1
+        self._current_day = EPOCH_DAY + timedelta(days=last_day)
+        dish_count = len(arrays.dish_names)
+
+        # Матрица "день x блюдо", затем расход ингредиентов через матрицу рецептов
+        item_day = order_days[arrays.item_order] - first_day
+        dishes_by_day = np.bincount(
+            item_day * dish_count + arrays.item_dish,
+            weights=arrays.item_quantity,
+            minlength=day_count * dish_count
+        ).reshape(day_count, dish_count)
+        consumption = dishes_by_day @ self._recipe_matrix(arrays.dish_names)
+
+        # Текущий день еще не закончился и в сглаживание не входит
+        self._current = consumption[-1].copy()
+        closed = consumption[:-1]
+        self.days_observed = len(closed)
+        if not self.days_observed:
+            return
+
+        decay = 1.0 - self.alpha
+        weights = self.alpha * decay ** np.arange(self.days_observed - 1, -1, -1)
+        weights[0] = decay ** (self.days_observed - 1)
+        self.rates = weights @ closed
+
+    def record_order(self, order: Order, when: datetime = None):
+        self.record_consumption(self.recipe_book.get_requirements(order), when)
+
+    def record_consumption(self, requirements: Dict[str, float], when: datetime = None):
+        if when is None:
+            when = datetime.now()
+        self._advance(when.date())
+
+        for ingredient, quantity in requirements.items():
+            index = self._index.get(ingredient)
+            if index is not None:
+                self._current[index] += quantity
+
+    def _advance(self, day: date):
+        if self._current_day is None:
+            self._current_day = day
+            return
+        if day <= self._current_day:
+            return
+
+        # Закрываем текущий день, пропущенные дни считаются днями без расхода
+        if self.days_observed:
+            self.rates = self.alpha * self._current + (1.0 - self.alpha) * self.rates
+        else:
+            self.rates = self._current.copy()
+
+        gap = (day - self._current_day).days - 1
+        if gap:
+            self.rates *= (1.0 - self.alpha) ** gap
+
+        self.days_observed += gap + 1
+        self._current[:] = 0.0
+        self._current_day = day
+
+    def daily_rates(self, today: date = None) -> Dict[str, float]:
+        self._advance(today or date.today())
+        rates = self.rates if self.days_observed else self._current
+        return dict(zip(self.ingredients, rates.tolist()))
+
+    def forecast(self, products: Mapping[str, Mapping[str, Any]], now: datetime = None) -> List[Dict[str, Any]]:
+        """Прогноз исчерпания запасов и рекомендуемые объемы заказа, по возрастанию запаса в днях."""
+        if now is None:
+            now = datetime.now()
+        rates = self.daily_rates(now.date())
+
+        result = []
+        for name, data in products.items():
+            rate = rates.get(name, 0.0)
+            quantity = data["quantity"]
+            days_left = quantity / rate if rate > 0 else None
+            target = rate * (self.lead_time_days + self.cover_days) + data["min_quantity"]
+
+            result.append({
+                "name": name,
+                "unit": data["unit"],
+                "current": quantity,
+                "daily_rate": rate,
+                "days_left": days_left,
+                "stockout_at": now + timedelta(days=days_left) if days_left is not None else None,
+                "reorder_quantity": max(target - quantity, 0.0)
+            })
+
+        result.sort(key=lambda entry: float("inf") if entry["days_left"] is None else entry["days_left"])
+        return result
@@ -0,0 +1,110 @@
+import csv
+import gzip
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Iterator, Tuple, Sequence
+
+from models.order import OrderManager
+from services.payment_service import PaymentService
+
+ORDER_FIELDS = ("order_id", "table_number", "creation_time", "status", "payment_status", "total")
+ORDER_ITEM_FIELDS = ("order_id", "creation_time", "item_name", "quantity", "unit_price", "total")
+TRANSACTION_FIELDS = ("transaction_id", "payment_type", "order_id", "amount", "method", "timestamp")
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+class ExportService:
+    def __init__(self, order_manager: OrderManager, payment_service: PaymentService, chunk_size: int = 10000):
+        self.order_manager = order_manager
+        self.payment_service = payment_service
+        self.chunk_size = chunk_size
+
+    def iter_order_rows(self, start_date: datetime = None, end_date: datetime = None) -> Iterator[Tuple]:
+        for order in self.order_manager.iter_orders(start_date, end_date):
+            yield (
+                order.order_id,
+                order.table_number,
+                order.creation_time.isoformat(),
+                order.status,
+                order.payment_status,
+                round(order.get_total_price(), 2)
+            )
+
+    def iter_order_item_rows(self, start_date: datetime = None, end_date: datetime = None) -> Iterator[Tuple]:
+        for order in self.order_manager.iter_orders(start_date, end_date):
+            creation_time = order.creation_time.isoformat()
+            for item in order.items:
+                yield (
+                    order.order_id,
+                    creation_time,
+                    item.menu_item.name,
+                    item.quantity,
+                    item.menu_item.get_price(),
+                    round(item.get_total_price(), 2)
+                )
+
+    def iter_transaction_rows(self, start_date: datetime = None, end_date: datetime = None) -> Iterator[Tuple]:
+        for transaction in self.payment_service.iter_transactions():
+            timestamp = transaction["timestamp"]
+            if start_date is not None and timestamp < start_date:
+                continue
+            if end_date is not None and timestamp > end_date:
+                continue
+            yield (
+                transaction["transaction_id"],
+                transaction["payment_type"],
+                transaction["order_id"],
+                round(transaction["amount"], 2),
+                transaction["details"].get("method", ""),
+                timestamp.isoformat()
+            )
+
+    def export_orders(self, path: str, fmt: str = "csv", compress: bool = None,
+                      start_date: datetime = None, end_date: datetime = None) -> int:
+        return self.write_rows(self.iter_order_rows(start_date, end_date), ORDER_FIELDS, path, fmt, compress)
+
+    def export_order_items(self, path: str, fmt: str = "csv", compress: bool = None,
+                           start_date: datetime = None, end_date: datetime = None) -> int:
+        return self.write_rows(self.iter_order_item_rows(start_date, end_date), ORDER_ITEM_FIELDS,
+                               path, fmt, compress)
+
+    def export_transactions(self, path: str, fmt: str = "csv", compress: bool = None,
+                            start_date: datetime = None, end_date: datetime = None) -> int:
+        return self.write_rows(self.iter_transaction_rows(start_date, end_date), TRANSACTION_FIELDS,
+                               path, fmt, compress)
+
+    def write_rows(self, rows: Iterator[Tuple], fields: Sequence[str], path: str,
+                   fmt: str = "csv", compress: bool = None) -> int:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Неподдерживаемый формат выгрузки: {fmt}")
+
+        if compress is None:
+            compress = path.endswith(".gz")
+
+        if compress:
+            output_file = gzip.open(path, "wt", compresslevel=6, encoding="utf-8", newline="")
+        else:
+            output_file = open(path, "w", encoding="utf-8", newline="")
+
+        written = 0
+        with output_file as output:
+            writer = csv.writer(output) if fmt == "csv" else None
+            if writer:
+                writer.writerow(fields)
+
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+
+                if writer:
+                    writer.writerows(chunk)
+                else:
+                    output.write("".join(
+                        json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n" for row in chunk
+                    ))
+                written += len(chunk)
+
+        return written
@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from typing import Dict, Tuple
+
+DEFAULT_EXPENSE_CATEGORIES = ("Продукты", "Зарплата", "Аренда", "Коммунальные услуги", "Прочее")
+
+
+def _next_month(day: date) -> date:
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+
+class CalendarRollup:
+    def __init__(self):
+        self.days: Dict[date, float] = {}
+        self.months: Dict[Tuple[int, int], float] = {}
+        self.years: Dict[int, float] = {}
+
+    def add(self, day: date, amount: float):
+        month = (day.year, day.month)
+        self.days[day] = self.days.get(day, 0.0) + amount
+        self.months[month] = self.months.get(month, 0.0) + amount
+        self.years[day.year] = self.years.get(day.year, 0.0) + amount
+
+    def total(self, start_day: date, end_day: date) -> float:
+        # Диапазон раскладывается на целые годы, месяцы и оставшиеся дни,
+        # поэтому число обращений не зависит от количества заказов
+        total = 0.0
+        day = start_day
+        while day <= end_day:
+            if day.month == 1 and day.day == 1 and date(day.year, 12, 31) <= end_day:
+                total += self.years.get(day.year, 0.0)
+                day = date(day.year + 1, 1, 1)
+            elif day.day == 1 and _next_month(day) - timedelta(days=1) <= end_day:
+                total += self.months.get((day.year, day.month), 0.0)
+                day = _next_month(day)
+            else:
+                total += self.days.get(day, 0.0)
+                day += timedelta(days=1)
+        return total
+
+
+class ExpenseLedger:
+    def __init__(self):
+        self.categories: Dict[str, CalendarRollup] = {
+            category: CalendarRollup() for category in DEFAULT_EXPENSE_CATEGORIES
+        }
+
+    def record(self, category: str, amount: float, day: date):
+        if category not in self.categories:
+            self.categories[category] = CalendarRollup()
+        self.categories[category].add(day, amount)
+
+    def totals(self, start_day: date, end_day: date) -> Dict[str, float]:
+        return {
+            category: rollup.total(start_day, end_day)
+            for category, rollup in self.categories.items()
+        }
@@ -0,0 +1,85 @@
+import heapq
+import math
+from typing import Dict, List, Tuple, Hashable, Iterable
+
+
+class SpaceSavingCounter:
+    """Space-Saving: не более capacity счетчиков, завышение каждого не больше total / capacity."""
+
+    def __init__(self, capacity: int = None, epsilon: float = 0.01):
+        if capacity is None:
+            capacity = math.ceil(1 / epsilon)
+        self.capacity = max(1, capacity)
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+        # Возвраты по ключам, вычитаются из оценок при чтении
+        self.refunds: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._sequence = 0
+
+    def add(self, key: Hashable, count: int = 1):
+        self.total += count
+
+        if key in self.counts:
+            self.counts[key] += count
+            return
+
+        if len(self.counts) < self.capacity:
+            self._track(key, count, 0)
+            return
+
+        min_key, min_count = self._pop_min()
+        del self.counts[min_key]
+        del self.errors[min_key]
+        self._track(key, min_count + count, min_count)
+
+    def subtract(self, key: Hashable, count: int = 1):
+        """Учесть возврат ранее добавленного.
+
+        Возвраты копятся в отдельном точном счетчике и вычитаются только при чтении: сами
+        счетчики Space-Saving лишь растут, поэтому сохраняется гарантия
+        count - error <= истинное значение <= count для проданного, а после вычета
+        возвратов - и для итогового значения.
+        """
+        self.refunds[key] = self.refunds.get(key, 0) + count
+
+    def update(self, pairs: Iterable[Tuple[Hashable, int]]):
+        for key, count in pairs:
+            self.add(key, count)
+
+    def merge(self, other: "SpaceSavingCounter"):
+        self.update(other.items())
+
+    def items(self):
+        if not self.refunds:
+            return self.counts.items()
+        # Оценка не ниже истинного значения, а оно не отрицательно; полностью возвращенные ключи не выдаются
+        refunds = self.refunds
+        net = ((key, count - refunds.get(key, 0)) for key, count in self.counts.items())
+        return [(key, count) for key, count in net if count > 0]
+
+    def top(self, n: int) -> List[Tuple[Hashable, int]]:
+        return heapq.nlargest(n, self.items(), key=lambda x: x[1])
+
+    def error_bound(self) -> int:
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def _track(self, key: Hashable, count: int, error: int):
+        self.counts[key] = count
+        self.errors[key] = error
+        self._sequence += 1
+        heapq.heappush(self._heap, (count, self._sequence, key))
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        # Значения в куче только занижены (счетчики растут), поэтому устаревшие
+        # записи достаточно вернуть обратно с актуальным значением
+        while True:
+            count, _, key = heapq.heappop(self._heap)
+            current = self.counts[key]
+            if current == count:
+                return key, count
+            self._sequence += 1
+            heapq.heappush(self._heap, (current, self._sequence, key))
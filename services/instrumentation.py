@@ -0,0 +1,236 @@
+import inspect
+import os
+import threading
+import time
+from functools import wraps
+from typing import Dict, List, Any, Callable, Iterable, Tuple
+
+from services.latency_histogram import LatencyHistogram
+
+FACADE_LAYER = "facade"
+
+# Атрибут фасада: слой, под которым учитываются вызовы его методов
+SERVICE_LAYERS = {
+    "payment_service": "payment",
+    "notification_service": "notification",
+    "report_service": "report",
+    "export_service": "export",
+    "inventory_adapter": "adapter",
+    "staff_adapter": "adapter"
+}
+
+METRIC_PREFIX = "restaurant"
+
+# Сколько сырых замеров копится до переноса в гистограмму
+FOLD_THRESHOLD = 4096
+
+
+class OperationStats:
+    """Замеры сначала дописываются в список (в наносекундах) и переносятся в гистограмму пачками."""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.samples: List[int] = []
+        self.errors = 0
+
+    def fold(self):
+        # Замеры, дописанные другим потоком во время переноса, остаются в хвосте списка
+        samples = self.samples
+        count = len(samples)
+        self.histogram.record_many(samples[:count], 1 / 1000)
+        del samples[:count]
+
+    def reset(self):
+        self.histogram = LatencyHistogram()
+        self.samples.clear()
+        self.errors = 0
+
+
+class Instrumentation:
+    """Счетчики вызовов и гистограммы задержек (в микросекундах) по слоям и операциям.
+
+    Замеры ставятся обертками на экземпляры фасада и его сервисов и полностью снимаются
+    методом detach, поэтому выключенная инструментация не стоит ничего. Сервисы, которые
+    фасад еще не создал, не создаются ради замеров: обертки ставятся после вызова фасада,
+    при котором сервис появился, так что самый первый вызов сервиса не замеряется.
+    """
+
+    def __init__(self, exclude: Iterable[str] = ()):
+        self.exclude = set(exclude)
+        self.stats: Dict[Tuple[str, str], OperationStats] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._patched: List[Tuple[Any, str]] = []
+        # Атрибут фасада: слой - сервисы, которые будут инструментированы после создания
+        self._pending: Dict[str, str] = {}
+        self._facade = None
+
+    def attach(self, facade):
+        if self._facade is not None:
+            raise ValueError("Инструментация уже подключена")
+
+        self._facade = facade
+        self._pending.update(SERVICE_LAYERS)
+        self._instrument_created()
+        self._instrument(facade, FACADE_LAYER, self.exclude)
+
+    def detach(self):
+        with self._lock:
+            self._pending.clear()
+        for target, name in self._patched:
+            target.__dict__.pop(name, None)
+        self._patched = []
+        self._facade = None
+
+    @property
+    def attached(self) -> bool:
+        return self._facade is not None
+
+    def reset(self):
+        # Объекты статистики остаются на месте: на них ссылаются установленные обертки
+        with self._lock:
+            for stats in self.stats.values():
+                stats.reset()
+            self.started = time.time()
+
+    def _stats_for(self, layer: str, operation: str) -> OperationStats:
+        key = (layer, operation)
+        stats = self.stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.setdefault(key, OperationStats())
+        return stats
+
+    def _instrument_created(self):
+        # Каждый сервис забирается из списка ожидания под блокировкой и оборачивается ровно один раз
+        facade = self._facade
+        if facade is None:
+            return
+        facade_dict = facade.__dict__
+        with self._lock:
+            created = [(attribute, self._pending.pop(attribute)) for attribute in list(self._pending)
+                       if attribute in facade_dict]
+        for attribute, layer in created:
+            self._instrument(facade_dict[attribute], layer)
+
+    def _instrument(self, target: Any, layer: str, exclude: Iterable[str] = ()):
+        for name, _ in inspect.getmembers(type(target), inspect.isfunction):
+            if name.startswith("_") or name in exclude:
+                continue
+            setattr(target, name, self._wrap(getattr(target, name), layer, name))
+            self._patched.append((target, name))
+
+    def _wrap(self, method: Callable, layer: str, operation: str) -> Callable:
+        stats = self._stats_for(layer, operation)
+        samples = stats.samples
+        lock = self._lock
+        clock = time.perf_counter_ns
+        # Проверка новых сервисов нужна только после вызовов фасада
+        pending = self._pending if layer == FACADE_LAYER else None
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return method(*args, **kwargs)
+            except BaseException:
+                with lock:
+                    stats.errors += 1
+                raise
+            finally:
+                samples.append(clock() - started)
+                if len(samples) >= FOLD_THRESHOLD:
+                    with lock:
+                        stats.fold()
+                if pending:
+                    self._instrument_created()
+
+        return wrapper
+
+    # --- Export ---
+
+    def _folded_items(self) -> List[Tuple[Tuple[str, str], OperationStats]]:
+        with self._lock:
+            for stats in self.stats.values():
+                stats.fold()
+            return [(key, stats) for key, stats in sorted(self.stats.items()) if stats.histogram.count]
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        items = self._folded_items()
+        for (layer, operation), stats in items:
+            histogram = stats.histogram
+            percentiles = histogram.percentiles((50, 95, 99))
+            result.setdefault(layer, {})[operation] = {
+                "count": histogram.count,
+                "errors": stats.errors,
+                "total_us": histogram.total,
+                "mean_us": histogram.mean(),
+                "p50_us": percentiles[50],
+                "p95_us": percentiles[95],
+                "p99_us": percentiles[99],
+                "max_us": histogram.max
+            }
+        return result
+
+    def format_text(self) -> str:
+        elapsed = time.time() - self.started
+        result = f"=== МЕТРИКИ ОПЕРАЦИЙ (за {elapsed:.1f} с) ===\n"
+        snapshot = self.snapshot()
+        if not snapshot:
+            return result + "Вызовы еще не зарегистрированы\n"
+
+        for layer, operations in snapshot.items():
+            result += f"\n[{layer}]\n"
+            result += (f"{'операция':>30} {'вызовов':>9} {'ошибок':>7} {'в сек':>9} "
+                       f"{'p50, мкс':>10} {'p95, мкс':>10} {'p99, мкс':>10} {'макс, мкс':>10}\n")
+            for operation, stats in operations.items():
+                rate = stats["count"] / elapsed if elapsed > 0 else 0.0
+                result += (f"{operation:>30} {stats['count']:>9} {stats['errors']:>7} {rate:>9.1f} "
+                           f"{stats['p50_us']:>10.1f} {stats['p95_us']:>10.1f} {stats['p99_us']:>10.1f} "
+                           f"{stats['max_us']:>10.1f}\n")
+        return result
+
+    def format_prometheus(self) -> str:
+        """Текстовый формат экспозиции Prometheus: гистограмма задержек в секундах и счетчик ошибок."""
+        latency = f"{METRIC_PREFIX}_operation_duration_seconds"
+        errors = f"{METRIC_PREFIX}_operation_errors_total"
+        items = self._folded_items()
+        with self._lock:
+            lines = [
+                f"# HELP {latency} Длительность операций фасада и сервисов.",
+                f"# TYPE {latency} histogram"
+            ]
+            for (layer, operation), stats in items:
+                labels = f'layer="{layer}",operation="{operation}"'
+                for bound, cumulative in stats.histogram.bucket_bounds():
+                    lines.append(f'{latency}_bucket{{{labels},le="{bound / 1e6:.9g}"}} {cumulative}')
+                lines.append(f'{latency}_bucket{{{labels},le="+Inf"}} {stats.histogram.count}')
+                lines.append(f"{latency}_sum{{{labels}}} {stats.histogram.total / 1e6:.9g}")
+                lines.append(f"{latency}_count{{{labels}}} {stats.histogram.count}")
+
+            lines.append(f"# HELP {errors} Операции, завершившиеся исключением.")
+            lines.append(f"# TYPE {errors} counter")
+            for (layer, operation), stats in items:
+                lines.append(f'{errors}{{layer="{layer}",operation="{operation}"}} {stats.errors}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str, fmt: str = None) -> bool:
+        """Записать снимок в файл; формат по умолчанию определяется расширением (.prom - Prometheus)."""
+        if fmt is None:
+            fmt = "prometheus" if path.endswith(".prom") else "text"
+        if fmt not in ("text", "prometheus"):
+            print(f"Неизвестный формат метрик: {fmt}")
+            return False
+
+        content = self.format_prometheus() if fmt == "prometheus" else self.format_text()
+        # Файл заменяется целиком, чтобы сборщик метрик не прочитал его наполовину записанным
+        temporary = f"{path}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as output:
+                output.write(content)
+            os.replace(temporary, path)
+        except OSError as error:
+            print(f"Ошибка записи метрик в {path}: {error}")
+            return False
+        return True
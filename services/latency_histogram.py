@@ -0,0 +1,102 @@
+import math
+from typing import Dict, Iterable, Sequence, Tuple
+
+_ZERO_BUCKET = -(10 ** 9)
+
+
+class LatencyHistogram:
+    """Лог-линейная гистограмма в духе HDR: относительная погрешность около 1 / (2 * sub_buckets)."""
+
+    def __init__(self, sub_buckets: int = 32):
+        self.sub_buckets = sub_buckets
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float, count: int = 1):
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value <= 0:
+            key = _ZERO_BUCKET
+        else:
+            mantissa, exponent = math.frexp(value)
+            key = exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def record_many(self, values: Sequence[float], scale: float = 1.0):
+        """Записать пачку значений, умноженных на scale; быстрее, чем record в цикле."""
+        if not values:
+            return
+        low = min(values) * scale
+        high = max(values) * scale
+        self.count += len(values)
+        self.total += sum(values) * scale
+        if low < self.min:
+            self.min = low
+        if high > self.max:
+            self.max = high
+
+        buckets = self.buckets
+        sub_buckets = self.sub_buckets
+        frexp = math.frexp
+        for value in values:
+            value *= scale
+            if value <= 0:
+                key = _ZERO_BUCKET
+            else:
+                mantissa, exponent = frexp(value)
+                key = exponent * sub_buckets + int((mantissa - 0.5) * 2 * sub_buckets)
+            buckets[key] = buckets.get(key, 0) + 1
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.sub_buckets != self.sub_buckets:
+            raise ValueError("Нельзя объединить гистограммы с разной точностью")
+
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, level: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(level / 100 * self.count))
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                return min(max(self._bucket_value(key), self.min), self.max)
+        return self.max
+
+    def percentiles(self, levels: Iterable[float] = (50, 95, 99)) -> Dict[float, float]:
+        return {level: self.percentile(level) for level in levels}
+
+    def bucket_bounds(self) -> Iterable[Tuple[float, int]]:
+        """Верхние границы корзин по возрастанию с накопленными счетчиками."""
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if key == _ZERO_BUCKET:
+                yield 0.0, seen
+            else:
+                exponent, sub_bucket = divmod(key, self.sub_buckets)
+                yield (0.5 + (sub_bucket + 1) / (2 * self.sub_buckets)) * 2.0 ** exponent, seen
+
+    def _bucket_value(self, key: int) -> float:
+        if key == _ZERO_BUCKET:
+            return 0.0
+        exponent, sub_bucket = divmod(key, self.sub_buckets)
+        return (0.5 + (sub_bucket + 0.5) / (2 * self.sub_buckets)) * 2.0 ** exponent
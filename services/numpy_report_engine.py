@@ -0,0 +1,158 @@
+from typing import Dict, List, Any, Sequence
+from datetime import datetime, timedelta
+
+from models.order import Order
+from interfaces.report_interface import ReportGenerator, SalesReportGenerator, EXACT_TOP_DISHES
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy необязателен: без него отчет по продажам строится обычным генератором
+    np = None
+
+
+def create_sales_report_generator(engine: "NumpyReportEngine" = None) -> SalesReportGenerator:
+    if np is None:
+        return SalesReportGenerator()
+    return NumpySalesReportGenerator(engine)
+
+
+class OrderArrays:
+    EPOCH = datetime(1970, 1, 1)
+
+    def __init__(self, orders: List[Order]):
+        if np is None:
+            raise ImportError("Для векторизованных отчетов нужен пакет numpy")
+        self.orders = orders
+
+        items = [item for order in orders for item in order.items]
+        dish_index: Dict[str, int] = {}
+
+        self.item_order = np.repeat(
+            np.arange(len(orders), dtype=np.int64),
+            [len(order.items) for order in orders]
+        )
+        self.item_dish = np.array(
+            [dish_index.setdefault(item.menu_item.name, len(dish_index)) for item in items],
+            dtype=np.int64
+        )
+        self.item_quantity = np.array([item.quantity for item in items], dtype=np.int64)
+        self.item_price = np.array([item.menu_item.get_price() for item in items], dtype=np.float64)
+        self.dish_names = list(dish_index)
+        self.order_totals = np.bincount(
+            self.item_order,
+            weights=self.item_price * self.item_quantity,
+            minlength=len(orders)
+        )
+        self._creation_times = None
+
+    @property
+    def creation_times(self) -> "np.ndarray":
+        if self._creation_times is None:
+            second = timedelta(seconds=1)
+            self._creation_times = np.array(
+                [(order.creation_time - self.EPOCH) // second for order in self.orders],
+                dtype=np.int64
+            ).astype("datetime64[s]")
+        return self._creation_times
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+
+class NumpyReportEngine:
+    TIME_BUCKETS = {
+        "hour": "datetime64[h]",
+        "day": "datetime64[D]",
+        "month": "datetime64[M]"
+    }
+
+    def extract(self, orders: List[Order]) -> OrderArrays:
+        return OrderArrays(orders)
+
+    def revenue(self, arrays: OrderArrays) -> float:
+        return float(arrays.order_totals.sum())
+
+    def average_check(self, arrays: OrderArrays) -> float:
+        if not len(arrays):
+            return 0.0
+        return float(arrays.order_totals.mean())
+
+    def dish_counts(self, arrays: OrderArrays) -> Dict[str, int]:
+        counts = np.bincount(arrays.item_dish, weights=arrays.item_quantity, minlength=len(arrays.dish_names))
+        return dict(zip(arrays.dish_names, counts.astype(np.int64).tolist()))
+
+    def time_histogram(self, arrays: OrderArrays, bucket: str = "hour") -> Dict[str, Any]:
+        if bucket == "hour_of_day":
+            keys = (arrays.creation_times - arrays.creation_times.astype("datetime64[D]")).astype("timedelta64[h]")
+            positions = keys.astype(np.int64)
+            labels = [f"{hour:02d}:00" for hour in range(24)]
+            orders = np.bincount(positions, minlength=24)
+            revenue = np.bincount(positions, weights=arrays.order_totals, minlength=24)
+        else:
+            keys = arrays.creation_times.astype(self.TIME_BUCKETS[bucket])
+            unique_keys, positions = np.unique(keys, return_inverse=True)
+            labels = [str(key) for key in unique_keys]
+            orders = np.bincount(positions, minlength=len(unique_keys))
+            revenue = np.bincount(positions, weights=arrays.order_totals, minlength=len(unique_keys))
+
+        return {
+            "labels": labels,
+            "orders": orders.tolist(),
+            "revenue": revenue.tolist()
+        }
+
+    def percentiles(self, arrays: OrderArrays, levels: Sequence[float] = (50, 90, 95, 99)) -> Dict[float, float]:
+        if not len(arrays):
+            return {level: 0.0 for level in levels}
+        values = np.percentile(arrays.order_totals, levels)
+        return dict(zip(levels, values.tolist()))
+
+
+class NumpySalesReportGenerator(SalesReportGenerator):
+    def __init__(self, engine: NumpyReportEngine = None):
+        super().__init__()
+        self.engine = engine or NumpyReportEngine()
+
+    def summarize(self, orders: List[Order]) -> Dict[str, Any]:
+        # Приближенный режим популярных блюд считается скетчем базового генератора
+        if self.top_dishes_mode != EXACT_TOP_DISHES:
+            return super().summarize(orders)
+
+        arrays = self.engine.extract(orders)
+        return {
+            "start": orders[0].creation_time.date(),
+            "end": orders[-1].creation_time.date(),
+            "orders": len(arrays),
+            "revenue": self.engine.revenue(arrays),
+            "dish_counts": self.engine.dish_counts(arrays)
+        }
+
+
+class NumpySalesStatisticsReportGenerator(ReportGenerator):
+    def __init__(self, engine: NumpyReportEngine = None, bucket: str = "hour_of_day"):
+        self.engine = engine or NumpyReportEngine()
+        self.bucket = bucket
+
+    def generate_report(self, orders: List[Order]) -> str:
+        if not orders:
+            return "Нет данных для статистики продаж"
+
+        arrays = self.engine.extract(orders)
+        histogram = self.engine.time_histogram(arrays, self.bucket)
+
+        result = "=== СТАТИСТИКА ПРОДАЖ ===\n"
+        result += f"Количество заказов: {len(arrays)}\n"
+        result += f"Общая выручка: {self.engine.revenue(arrays):.2f} лей.\n"
+        result += f"Средний чек: {self.engine.average_check(arrays):.2f} лей.\n"
+
+        result += "\nПерцентили суммы заказа:\n"
+        for level, value in self.engine.percentiles(arrays).items():
+            result += f"  p{level:g}: {value:.2f} лей.\n"
+
+        result += "\nРаспределение по времени:\n"
+        for label, count, revenue in zip(histogram["labels"], histogram["orders"], histogram["revenue"]):
+            if count:
+                result += f"  {label}: {count} заказов, {revenue:.2f} лей.\n"
+
+        return result
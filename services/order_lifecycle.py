@@ -0,0 +1,90 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Dict, List, Any
+
+from models.order import (
+    Order,
+    STATUS_CREATED,
+    STATUS_COOKING,
+    STATUS_READY,
+    STATUS_DELIVERED,
+    PAID
+)
+from services.latency_histogram import LatencyHistogram
+
+# Этап: (название, начальный статус, конечный статус)
+LIFECYCLE_STAGES = (
+    ("До кухни", STATUS_CREATED, STATUS_COOKING),
+    ("Кухня", STATUS_COOKING, STATUS_READY),
+    ("Подача", STATUS_READY, STATUS_DELIVERED),
+    ("Оплата", STATUS_DELIVERED, PAID),
+    ("Полный цикл", STATUS_CREATED, PAID)
+)
+
+
+class OrderLifecycleTracker:
+    def __init__(self, bucket_minutes: int = 60):
+        self.bucket_size = timedelta(minutes=bucket_minutes)
+        self.buckets: Dict[datetime, Dict[str, Any]] = {}
+        self._bucket_starts: List[datetime] = []
+        self._stages_by_end: Dict[str, List[tuple]] = {}
+        for stage in LIFECYCLE_STAGES:
+            self._stages_by_end.setdefault(stage[2], []).append(stage)
+
+    def on_order_changed(self, order: Order):
+        transition = order.last_transition
+        if transition is None:
+            return
+
+        bucket = self._get_bucket(order.creation_time)
+        if transition == STATUS_CREATED:
+            bucket["orders"] += 1
+            return
+
+        finished_at = order.get_status_time(transition)
+        for name, start_status, _ in self._stages_by_end.get(transition, ()):
+            started_at = order.get_status_time(start_status)
+            if started_at is not None:
+                bucket["stages"][name].record((finished_at - started_at).total_seconds())
+
+    def snapshot(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        low = bisect_left(self._bucket_starts, self._bucket_start(start_time))
+        high = bisect_right(self._bucket_starts, end_time)
+        return [
+            {"start": bucket_start, **self.buckets[bucket_start]}
+            for bucket_start in self._bucket_starts[low:high]
+        ]
+
+    def _bucket_start(self, moment: datetime) -> datetime:
+        day_start = datetime.combine(moment.date(), datetime.min.time())
+        return day_start + ((moment - day_start) // self.bucket_size) * self.bucket_size
+
+    def _get_bucket(self, moment: datetime) -> Dict[str, Any]:
+        bucket_start = self._bucket_start(moment)
+        bucket = self.buckets.get(bucket_start)
+        if bucket is None:
+            bucket = {
+                "orders": 0,
+                "stages": {name: LatencyHistogram() for name, _, _ in LIFECYCLE_STAGES}
+            }
+            self.buckets[bucket_start] = bucket
+            insort(self._bucket_starts, bucket_start)
+        return bucket
+
+
+def merge_lifecycle_buckets(snapshots: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Объединить снимки нескольких трекеров (например, разных заведений) по началу корзины."""
+    merged: Dict[datetime, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for bucket in snapshot:
+            target = merged.get(bucket["start"])
+            if target is None:
+                target = merged[bucket["start"]] = {
+                    "start": bucket["start"],
+                    "orders": 0,
+                    "stages": {name: LatencyHistogram() for name, _, _ in LIFECYCLE_STAGES}
+                }
+            target["orders"] += bucket["orders"]
+            for stage, histogram in bucket["stages"].items():
+                target["stages"][stage].merge(histogram)
+    return [merged[start] for start in sorted(merged)]
@@ -0,0 +1,167 @@
+import multiprocessing
+import os
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Any, Tuple, Union
+
+from interfaces.report_interface import EXACT_TOP_DISHES, APPROXIMATE_TOP_DISHES
+from models.order import Order
+from services.heavy_hitters import SpaceSavingCounter
+
+# Заказы, унаследованные дочерними процессами при fork: в пул передаются только границы партиций
+_SHARED_ORDERS: List[Order] = []
+
+
+def _new_dish_counter(top_dishes_mode: str, epsilon: float):
+    if top_dishes_mode == APPROXIMATE_TOP_DISHES:
+        return SpaceSavingCounter(epsilon=epsilon)
+    return {}
+
+
+def _summarize_partition(task: Tuple[Union[Tuple[int, int], List[Order]], str, float]) -> Dict[str, Any]:
+    partition, top_dishes_mode, epsilon = task
+    if isinstance(partition, tuple):
+        low, high = partition
+        orders = _SHARED_ORDERS[low:high]
+    else:
+        orders = partition
+
+    summary = {"start": None, "end": None, "orders": 0, "revenue": 0.0}
+    dish_counts = _new_dish_counter(top_dishes_mode, epsilon)
+
+    for order in orders:
+        # Те же правила, что у DailySalesAggregator: оплаченные и не возвращенные заказы
+        if not order.is_paid():
+            continue
+
+        if summary["start"] is None:
+            summary["start"] = order.creation_time.date()
+        summary["end"] = order.creation_time.date()
+        summary["orders"] += 1
+        summary["revenue"] += order.get_total_price()
+
+        if isinstance(dish_counts, SpaceSavingCounter):
+            for item in order.items:
+                dish_counts.add(item.menu_item.name, item.quantity)
+        else:
+            for item in order.items:
+                dish_name = item.menu_item.name
+                dish_counts[dish_name] = dish_counts.get(dish_name, 0) + item.quantity
+
+    if isinstance(dish_counts, SpaceSavingCounter):
+        summary["dish_counts"] = dish_counts.counts
+        summary["dish_count_error"] = dish_counts.error_bound()
+    else:
+        summary["dish_counts"] = dish_counts
+    return summary
+
+
+def merge_sales_summaries(summaries: List[Dict[str, Any]], top_dishes_mode: str = EXACT_TOP_DISHES,
+                          epsilon: float = 0.01) -> Dict[str, Any]:
+    """Сложить частичные сводки; погрешности приближенных сводок суммируются."""
+    merged = {"start": None, "end": None, "orders": 0, "revenue": 0.0}
+    dish_counts = _new_dish_counter(top_dishes_mode, epsilon)
+    error = 0
+
+    for summary in summaries:
+        if not summary["orders"]:
+            continue
+
+        if merged["start"] is None or summary["start"] < merged["start"]:
+            merged["start"] = summary["start"]
+        if merged["end"] is None or summary["end"] > merged["end"]:
+            merged["end"] = summary["end"]
+        merged["orders"] += summary["orders"]
+        merged["revenue"] += summary["revenue"]
+        error += summary.get("dish_count_error") or 0
+
+        if isinstance(dish_counts, SpaceSavingCounter):
+            dish_counts.update(summary["dish_counts"].items())
+        else:
+            for dish_name, count in summary["dish_counts"].items():
+                dish_counts[dish_name] = dish_counts.get(dish_name, 0) + count
+
+    if isinstance(dish_counts, SpaceSavingCounter):
+        merged["dish_counts"] = dish_counts.counts
+        merged["dish_count_error"] = dish_counts.error_bound() + error
+    else:
+        merged["dish_counts"] = dish_counts
+        if error:
+            merged["dish_count_error"] = error
+    return merged
+
+
+class ParallelReportExecutor:
+    """Пул процессов создается один раз и переиспользуется между отчетами.
+
+    При fork процессы пула видят заказы на момент своего запуска, поэтому пул
+    пересоздается, только если с тех пор заказы менялись (сменилось поколение).
+    """
+
+    def __init__(self, workers: int = None, partitions_per_worker: int = 4, always_pool: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions_per_worker = partitions_per_worker
+        # По умолчанию один процесс и короткие диапазоны считаются без пула; always_pool - для замеров самого пула
+        self.always_pool = always_pool
+        self.use_fork = "fork" in multiprocessing.get_all_start_methods()
+        self._pool = None
+        self._pool_generation = None
+
+    def close(self):
+        global _SHARED_ORDERS
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_generation = None
+        _SHARED_ORDERS = []
+
+    def _get_pool(self, orders: List[Order], generation: Any):
+        global _SHARED_ORDERS
+        if self.use_fork:
+            if self._pool is not None and generation is not None and generation == self._pool_generation:
+                return self._pool
+            self.close()
+            _SHARED_ORDERS = orders
+            self._pool = multiprocessing.get_context("fork").Pool(self.workers)
+            self._pool_generation = generation
+        elif self._pool is None:
+            self._pool = multiprocessing.get_context().Pool(self.workers)
+        return self._pool
+
+    def summarize_sales(self, orders: List[Order], start_date: datetime, end_date: datetime,
+                        top_dishes_mode: str = EXACT_TOP_DISHES, epsilon: float = 0.01,
+                        generation: Any = None) -> Dict[str, Any]:
+        """generation - счетчик изменений заказов; без него пул при fork создается заново для каждого отчета."""
+        # Заказы хранятся в порядке создания, поэтому диапазон и партиции находятся бинарным поиском
+        start_time = datetime.combine(start_date.date(), time.min)
+        end_time = datetime.combine(end_date.date() + timedelta(days=1), time.min)
+        low = bisect_left(orders, start_time, key=lambda order: order.creation_time)
+        high = bisect_left(orders, end_time, lo=low, key=lambda order: order.creation_time)
+
+        if not self.always_pool and (self.workers == 1 or high - low < self.workers):
+            summary = _summarize_partition((orders[low:high], top_dishes_mode, epsilon))
+            return merge_sales_summaries([summary], top_dishes_mode, epsilon)
+
+        partitions = self._partition_by_time(orders, low, high, start_time, end_time)
+        pool = self._get_pool(orders, generation)
+        if self.use_fork:
+            tasks = [(partition, top_dishes_mode, epsilon) for partition in partitions]
+        else:
+            tasks = [(orders[part_low:part_high], top_dishes_mode, epsilon) for part_low, part_high in partitions]
+
+        return merge_sales_summaries(pool.map(_summarize_partition, tasks), top_dishes_mode, epsilon)
+
+    def _partition_by_time(self, orders: List[Order], low: int, high: int,
+                           start_time: datetime, end_time: datetime) -> List[Tuple[int, int]]:
+        count = self.workers * self.partitions_per_worker
+        step = (end_time - start_time) / count
+
+        bounds = [low]
+        for index in range(1, count):
+            boundary = start_time + step * index
+            bounds.append(bisect_left(orders, boundary, lo=bounds[-1], hi=high,
+                                      key=lambda order: order.creation_time))
+        bounds.append(high)
+
+        return [(bounds[i], bounds[i + 1]) for i in range(count) if bounds[i] < bounds[i + 1]]
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Iterator
 from interfaces.payment_interface import PaymentInterface, PaymentProcessor
 from models.order import Order
 
@@ -40,7 +40,7 @@ class StandardPaymentInterface(PaymentInterface):
         success = self.processor.refund_payment(transaction_id, transaction["amount"])
 
         if success:
-            order.payment_status = "Refunded"
+            order.mark_as_refunded()
             return True
 
         return False
@@ -62,6 +62,10 @@ class StandardPaymentInterface(PaymentInterface):
             for tx_id, details in self.transactions.items()
        ]
 
+    def iter_transactions(self) -> Iterator[Dict]:
+        for tx_id, details in self.transactions.items():
+            yield {**details, "transaction_id": tx_id}
+
 
 class PaymentService:
     def __init__(self):
@@ -108,3 +112,11 @@ class PaymentService:
         online_transactions = self.online_interface.get_transaction_history()
 
         return cash_transactions + card_transactions + online_transactions
+
+    def iter_transactions(self) -> Iterator[Dict]:
+        for payment_type, interface in (("cash", self.cash_interface),
+                                        ("card", self.card_interface),
+                                        ("online", self.online_interface)):
+            for transaction in interface.iter_transactions():
+                transaction["payment_type"] = payment_type
+                yield transaction
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, Any, Hashable, Optional, Tuple
+
+
+class ReportCache:
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._bucket_versions: Dict[date, int] = {}
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate_day(self, day: date):
+        self._version += 1
+        self._bucket_versions[day] = self._version
+
+    def get(self, key: Hashable) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or not self._is_fresh(entry):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        entry["version"] = self._version
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["value"]
+
+    def put(self, key: Hashable, value: str, day_range: Tuple[date, date] = None):
+        self._entries[key] = {"value": value, "range": day_range, "version": self._version}
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        if entry["version"] == self._version:
+            return True
+
+        # Отчет без диапазона зависит от всех заказов
+        if entry["range"] is None:
+            return False
+
+        first_day, last_day = entry["range"]
+        if (last_day - first_day).days >= len(self._bucket_versions):
+            return all(version <= entry["version"] for day, version in self._bucket_versions.items()
+                       if first_day <= day <= last_day)
+
+        day = first_day
+        while day <= last_day:
+            if self._bucket_versions.get(day, 0) > entry["version"]:
+                return False
+            day += timedelta(days=1)
+        return True
@@ -0,0 +1,74 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+_DATE = r"\d{4}-\d{2}-\d{2}"
+_RANGE_PATTERN = re.compile(rf"^({_DATE})\s*(?:-|:|\.\.|—)\s*({_DATE})$")
+
+_ALIASES = {
+    "день": "day", "сегодня": "day", "текущий день": "day", "day": "day", "today": "day",
+    "вчера": "yesterday", "yesterday": "yesterday",
+    "неделя": "week", "текущая неделя": "week", "week": "week",
+    "прошлая неделя": "last_week", "last week": "last_week",
+    "месяц": "month", "текущий месяц": "month", "month": "month",
+    "прошлый месяц": "last_month", "last month": "last_month",
+    "год": "year", "текущий год": "year", "year": "year",
+    "прошлый год": "last_year", "last year": "last_year"
+}
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _month_end(day: date) -> date:
+    if day.month == 12:
+        return date(day.year, 12, 31)
+    return date(day.year, day.month + 1, 1) - timedelta(days=1)
+
+
+def parse_period(period: str, today: date = None) -> Optional[Tuple[date, date]]:
+    if today is None:
+        today = date.today()
+
+    text = period.strip().lower()
+    alias = _ALIASES.get(text)
+
+    if alias == "day":
+        return today, today
+    if alias == "yesterday":
+        yesterday = today - timedelta(days=1)
+        return yesterday, yesterday
+    if alias == "week":
+        return today - timedelta(days=today.weekday()), today
+    if alias == "last_week":
+        start = today - timedelta(days=today.weekday() + 7)
+        return start, start + timedelta(days=6)
+    if alias == "month":
+        return today.replace(day=1), today
+    if alias == "last_month":
+        end = today.replace(day=1) - timedelta(days=1)
+        return end.replace(day=1), end
+    if alias == "year":
+        return date(today.year, 1, 1), today
+    if alias == "last_year":
+        return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+
+    try:
+        match = _RANGE_PATTERN.match(text)
+        if match:
+            start, end = _parse_date(match.group(1)), _parse_date(match.group(2))
+            return (start, end) if start <= end else None
+        if re.fullmatch(_DATE, text):
+            day = _parse_date(text)
+            return day, day
+        if re.fullmatch(r"\d{4}-\d{2}", text):
+            start = datetime.strptime(text, "%Y-%m").date()
+            return start, _month_end(start)
+        if re.fullmatch(r"\d{4}", text):
+            year = int(text)
+            return date(year, 1, 1), date(year, 12, 31)
+    except ValueError:
+        return None
+
+    return None
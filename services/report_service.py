@@ -1,62 +1,170 @@
-from typing import List, Dict
-from datetime import datetime, timedelta
-from models.order import OrderManager
+from typing import List, Dict, Any
+from datetime import date, datetime, timedelta
+from models.order import Order, OrderManager, REFUNDED
 from interfaces.report_interface import (
     ReportGenerator,
     SalesReportGenerator,
     InventoryReportGenerator,
-    FinancialReportGenerator
+    FinancialReportGenerator,
+    LifecycleReportGenerator,
+    ReorderReportGenerator,
+    EXACT_TOP_DISHES,
+    APPROXIMATE_TOP_DISHES
 )
+from services.sales_aggregator import DailySalesAggregator
+from services.report_cache import ReportCache
+from services.financial_rollups import ExpenseLedger
+from services.report_period import parse_period
+from services.order_lifecycle import OrderLifecycleTracker
+
+AGGREGATED_EXECUTION = "aggregated"
+PARALLEL_EXECUTION = "parallel"
 
 
 class ReportService:
-    def __init__(self, order_manager: OrderManager):
+    def __init__(self, order_manager: OrderManager, cache_size: int = 128):
         self.order_manager = order_manager
         self.generators = {
             "sales": SalesReportGenerator(),
             "inventory": InventoryReportGenerator(),
-            "financial": FinancialReportGenerator()
+            "financial": FinancialReportGenerator(),
+            "lifecycle": LifecycleReportGenerator(),
+            "reorder": ReorderReportGenerator()
         }
+        self.sales_aggregator = DailySalesAggregator()
+        self.expense_ledger = ExpenseLedger()
+        self.execution_mode = AGGREGATED_EXECUTION
+        self.parallel_executor = None
+        self.cache = ReportCache(cache_size)
+        self.lifecycle_tracker = OrderLifecycleTracker()
+        # Счетчик изменений заказов: по нему параллельный режим решает, можно ли переиспользовать пул
+        self._orders_generation = 0
+        self.order_manager.add_listener(self._on_order_changed)
+        self.order_manager.add_listener(self.lifecycle_tracker.on_order_changed)
 
-    def generate_sales_report(self, start_date: datetime = None, end_date: datetime = None) -> str:
-        all_orders = self.order_manager.get_all_orders()
+    def _on_order_changed(self, order: Order):
+        self._orders_generation += 1
+        # Возвращенный заказ вычитается из агрегатов, чтобы они совпадали со списком заказов
+        if order.payment_status == REFUNDED:
+            self.sales_aggregator.remove_order(order)
+        self.cache.invalidate_day(order.creation_time.date())
+
+    def record_paid_order(self, order: Order):
+        # Повторная оплата того же заказа не учитывается
+        if self.sales_aggregator.record_order(order):
+            self.cache.invalidate_day(order.creation_time.date())
+
+    def record_expense(self, category: str, amount: float, day: date = None) -> bool:
+        if amount < 0:
+            print(f"Сумма расхода не может быть отрицательной: {amount}")
+            return False
+
+        if day is None:
+            day = date.today()
+
+        self.expense_ledger.record(category, amount, day)
+        self.cache.invalidate_day(day)
+        return True
+
+    def set_top_dishes_mode(self, mode: str, epsilon: float = 0.01) -> bool:
+        if mode not in (EXACT_TOP_DISHES, APPROXIMATE_TOP_DISHES):
+            print(f"Неизвестный режим подсчета популярных блюд: {mode}")
+            return False
+
+        self.sales_aggregator.top_dishes_mode = mode
+        self.sales_aggregator.epsilon = epsilon
+        self.generators["sales"].top_dishes_mode = mode
+        self.generators["sales"].epsilon = epsilon
+        self.cache.clear()
+        return True
+
+    def set_execution_mode(self, mode: str, workers: int = None) -> bool:
+        if mode == PARALLEL_EXECUTION:
+            # multiprocessing загружается только при включении параллельного режима
+            from services.parallel_report import ParallelReportExecutor
+            self.close()
+            self.parallel_executor = ParallelReportExecutor(workers)
+        elif mode == AGGREGATED_EXECUTION:
+            self.close()
+        else:
+            print(f"Неизвестный режим выполнения отчетов: {mode}")
+            return False
+
+        self.execution_mode = mode
+        self.cache.clear()
+        return True
+
+    def close(self):
+        if self.parallel_executor is not None:
+            self.parallel_executor.close()
+            self.parallel_executor = None
 
+    def generate_sales_report(self, start_date: datetime = None, end_date: datetime = None) -> str:
         if start_date is None:
             start_date = datetime.now() - timedelta(days=30)
 
         if end_date is None:
             end_date = datetime.now()
 
-        filtered_orders = [
-            order for order in all_orders
-            if start_date <= order.creation_time <= end_date
-        ]
+        day_range = (start_date.date(), end_date.date())
+        cache_key = ("sales",) + day_range
+        report = self.cache.get(cache_key)
+        if report is not None:
+            return report
+
+        if self.execution_mode == PARALLEL_EXECUTION:
+            summary = self.parallel_executor.summarize_sales(
+                self.order_manager.get_all_orders(), start_date, end_date,
+                self.sales_aggregator.top_dishes_mode, self.sales_aggregator.epsilon, self._orders_generation)
+        else:
+            summary = self.sales_aggregator.summarize(*day_range)
+
+        report = self.generators["sales"].render_summary(summary)
+        self.cache.put(cache_key, report, day_range)
+        return report
+
+    def generate_lifecycle_report(self, start_date: datetime = None, end_date: datetime = None) -> str:
+        if start_date is None:
+            start_date = datetime.now() - timedelta(days=1)
+
+        if end_date is None:
+            end_date = datetime.now()
 
-        return self.generators["sales"].generate_report(filtered_orders)
+        buckets = self.lifecycle_tracker.snapshot(start_date, end_date)
+        return self.generators["lifecycle"].generate_report(buckets)
 
     def generate_inventory_report(self, inventory_data: Dict[str, Dict]) -> str:
         return self.generators["inventory"].generate_report(inventory_data)
 
     def generate_financial_report(self, period: str) -> str:
-        all_orders = self.order_manager.get_all_orders()
-        revenue = sum(order.get_total_price() for order in all_orders)
+        day_range = parse_period(period)
+        if day_range is None:
+            return f"Некорректный период отчета: {period}"
 
+        cache_key = ("financial", period) + day_range
+        report = self.cache.get(cache_key)
+        if report is not None:
+            return report
+
+        start_day, end_day = day_range
         data = {
-            "revenue": revenue,
-            "expenses": {
-                "Продукты": revenue * 0.4,
-                "Зарплата": revenue * 0.3,
-                "Аренда": revenue * 0.1,
-                "Коммунальные услуги": revenue * 0.05,
-                "Прочее": revenue * 0.05
-            },
-            "period": period
+            "revenue": self.sales_aggregator.revenue_rollup.total(start_day, end_day),
+            "expenses": self.expense_ledger.totals(start_day, end_day),
+            "period": f"{period} ({start_day.strftime('%Y-%m-%d')} - {end_day.strftime('%Y-%m-%d')})"
         }
 
-        return self.generators["financial"].generate_report(data)
+        report = self.generators["financial"].generate_report(data)
+        self.cache.put(cache_key, report, day_range)
+        return report
 
     def add_custom_report_generator(self, name: str, generator: ReportGenerator):
         self.generators[name] = generator
+        self.cache.clear()
+
+    def generate_report(self, report_type: str, data: Any) -> str:
+        if report_type not in self.generators:
+            return f"Неизвестный тип отчета: {report_type}"
+        return self.generators[report_type].generate_report(data)
 
     def get_available_report_types(self) -> List[str]:
         return list(self.generators.keys())
@@ -0,0 +1,107 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Dict, List, Any, Tuple
+from models.order import Order
+from interfaces.report_interface import EXACT_TOP_DISHES, APPROXIMATE_TOP_DISHES
+from services.heavy_hitters import SpaceSavingCounter
+from services.financial_rollups import CalendarRollup
+
+
+class DailySalesAggregator:
+    def __init__(self, top_dishes_mode: str = EXACT_TOP_DISHES, epsilon: float = 0.01):
+        self.buckets: Dict[date, Dict[str, Any]] = {}
+        self._days: List[date] = []
+        self.top_dishes_mode = top_dishes_mode
+        self.epsilon = epsilon
+        self.revenue_rollup = CalendarRollup()
+        # Учтенные заказы: номер -> (день, выручка, позиции), чтобы не учесть оплату дважды и вычесть возврат
+        self._recorded: Dict[int, Tuple[date, float, Tuple[Tuple[str, int], ...]]] = {}
+
+    def record_order(self, order: Order) -> bool:
+        if order.order_id in self._recorded:
+            return False
+
+        entry = (
+            order.creation_time.date(),
+            order.get_total_price(),
+            tuple((item.menu_item.name, item.quantity) for item in order.items)
+        )
+        self._recorded[order.order_id] = entry
+        self._apply(*entry, sign=1)
+        return True
+
+    def remove_order(self, order: Order) -> bool:
+        # Вычитается ровно то, что было учтено при оплате, даже если заказ потом менялся
+        entry = self._recorded.pop(order.order_id, None)
+        if entry is None:
+            return False
+
+        self._apply(*entry, sign=-1)
+        return True
+
+    def _apply(self, day: date, revenue: float, items: Tuple[Tuple[str, int], ...], sign: int):
+        bucket = self.buckets.get(day)
+        if bucket is None:
+            bucket = {"revenue": 0.0, "orders": 0, "dish_counts": self._new_dish_counter()}
+            self.buckets[day] = bucket
+            insort(self._days, day)
+
+        bucket["revenue"] += sign * revenue
+        bucket["orders"] += sign
+        self.revenue_rollup.add(day, sign * revenue)
+
+        dish_counts = bucket["dish_counts"]
+        if isinstance(dish_counts, SpaceSavingCounter):
+            for dish_name, quantity in items:
+                if sign > 0:
+                    dish_counts.add(dish_name, quantity)
+                else:
+                    dish_counts.subtract(dish_name, quantity)
+        else:
+            for dish_name, quantity in items:
+                count = dish_counts.get(dish_name, 0) + sign * quantity
+                if count > 0:
+                    dish_counts[dish_name] = count
+                else:
+                    dish_counts.pop(dish_name, None)
+
+    def summarize(self, start_day: date, end_day: date) -> Dict[str, Any]:
+        days = self._days[bisect_left(self._days, start_day):bisect_right(self._days, end_day)]
+
+        summary = {
+            "start": days[0] if days else start_day,
+            "end": days[-1] if days else end_day,
+            "orders": 0,
+            "revenue": 0.0
+        }
+
+        dish_counts = self._new_dish_counter()
+        bucket_error = 0
+        for day in days:
+            bucket = self.buckets[day]
+            summary["orders"] += bucket["orders"]
+            summary["revenue"] += bucket["revenue"]
+            if isinstance(bucket["dish_counts"], SpaceSavingCounter):
+                bucket_error += bucket["dish_counts"].error_bound()
+
+            if isinstance(dish_counts, SpaceSavingCounter):
+                dish_counts.update(bucket["dish_counts"].items())
+            else:
+                for dish_name, count in bucket["dish_counts"].items():
+                    dish_counts[dish_name] = dish_counts.get(dish_name, 0) + count
+
+        if isinstance(dish_counts, SpaceSavingCounter):
+            summary["dish_counts"] = dict(dish_counts.items())
+            summary["dish_count_error"] = dish_counts.error_bound() + bucket_error
+        else:
+            summary["dish_counts"] = dish_counts
+            # Дни, посчитанные до переключения в точный режим, остаются приближенными
+            if bucket_error > 0:
+                summary["dish_count_error"] = bucket_error
+
+        return summary
+
+    def _new_dish_counter(self):
+        if self.top_dishes_mode == APPROXIMATE_TOP_DISHES:
+            return SpaceSavingCounter(epsilon=self.epsilon)
+        return {}
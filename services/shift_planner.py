@@ -0,0 +1,129 @@
+import math
+from datetime import date, timedelta
+from typing import Dict, List, Any, Iterable, Mapping, Set, Tuple
+
+from models.order import Order
+
+MONTHLY_WORK_HOURS = 168
+
+# Должность: сколько заказов в час обслуживает один сотрудник (0 - не зависит от нагрузки)
+# и сколько сотрудников должно быть на месте в часы работы в любом случае
+DEFAULT_ROLE_COVERAGE = {
+    "Шеф-повар": {"orders_per_hour": 0, "minimum": 1},
+    "Повар": {"orders_per_hour": 10, "minimum": 1},
+    "Официант": {"orders_per_hour": 6, "minimum": 1},
+    "Администратор": {"orders_per_hour": 0, "minimum": 1}
+}
+
+
+def hourly_load_profile(orders: Iterable[Order]) -> List[List[float]]:
+    """Среднее число заказов по дням недели и часам: profile[weekday][hour]."""
+    counts = [[0] * 24 for _ in range(7)]
+    days_seen: List[Set[date]] = [set() for _ in range(7)]
+
+    for order in orders:
+        created = order.creation_time
+        weekday = created.weekday()
+        counts[weekday][created.hour] += 1
+        days_seen[weekday].add(created.date())
+
+    return [
+        [count / len(days_seen[weekday]) if days_seen[weekday] else 0.0 for count in counts[weekday]]
+        for weekday in range(7)
+    ]
+
+
+class ShiftPlanner:
+    """Жадное покрытие почасовой потребности сменами фиксированной длины.
+
+    Для каждого дня и должности на каждом шаге выбирается шаблон смены, который закрывает
+    больше всего непокрытых часов на час работы, и назначается самый дешевый свободный сотрудник.
+    """
+
+    def __init__(self, coverage: Dict[str, Dict[str, float]] = None, open_hour: int = 8,
+                 close_hour: int = 24, shift_lengths: Tuple[int, ...] = (8, 6, 4),
+                 max_weekly_hours: int = 40):
+        self.coverage = coverage or DEFAULT_ROLE_COVERAGE
+        self.open_hour = open_hour
+        self.close_hour = close_hour
+        self.max_weekly_hours = max_weekly_hours
+        self.templates = [
+            (start, start + length)
+            for length in sorted(shift_lengths, reverse=True)
+            for start in range(open_hour, close_hour - length + 1)
+        ]
+
+    def requirements(self, load: List[float]) -> Dict[str, List[int]]:
+        result = {}
+        for role, rule in self.coverage.items():
+            need = [0] * 24
+            for hour in range(self.open_hour, self.close_hour):
+                by_load = math.ceil(load[hour] / rule["orders_per_hour"]) if rule["orders_per_hour"] else 0
+                need[hour] = max(by_load, rule["minimum"])
+            result[role] = need
+        return result
+
+    def plan(self, staff: Iterable[Mapping[str, Any]], load_profile: List[List[float]],
+             start: date, days: int = 7, busy: Set[Tuple[str, date]] = frozenset()) -> Dict[str, Any]:
+        staff_by_role: Dict[str, List[Tuple[float, str]]] = {}
+        for member in staff:
+            hourly_rate = member["salary"] / MONTHLY_WORK_HOURS
+            staff_by_role.setdefault(member["role"], []).append((hourly_rate, member["id"]))
+        for members in staff_by_role.values():
+            members.sort()
+
+        weekly_hours: Dict[Tuple[str, int], int] = {}
+        shifts = []
+        cost = 0.0
+        uncovered: Dict[str, int] = {}
+
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            week = offset // 7
+
+            for role, need in self.requirements(load_profile[day.weekday()]).items():
+                available = [
+                    (rate, emp_id) for rate, emp_id in staff_by_role.get(role, [])
+                    if (emp_id, day) not in busy
+                ]
+
+                while any(need):
+                    assignment = self._best_assignment(need, available, weekly_hours, week)
+                    if assignment is None:
+                        break
+
+                    (shift_start, shift_end), (rate, emp_id) = assignment
+                    available.remove((rate, emp_id))
+                    weekly_hours[(emp_id, week)] = weekly_hours.get((emp_id, week), 0) + shift_end - shift_start
+                    for hour in range(shift_start, shift_end):
+                        if need[hour]:
+                            need[hour] -= 1
+
+                    cost += rate * (shift_end - shift_start)
+                    shifts.append({
+                        "emp_id": emp_id,
+                        "date": day.strftime("%Y-%m-%d"),
+                        "start": f"{shift_start:02d}:00",
+                        "end": f"{shift_end % 24:02d}:00"
+                    })
+
+                if any(need):
+                    uncovered[role] = uncovered.get(role, 0) + sum(need)
+
+        return {"shifts": shifts, "cost": cost, "uncovered": uncovered}
+
+    def _best_assignment(self, need: List[int], available: List[Tuple[float, str]],
+                         weekly_hours: Dict[Tuple[str, int], int], week: int):
+        scored = []
+        for shift_start, shift_end in self.templates:
+            covered = sum(1 for hour in range(shift_start, shift_end) if need[hour])
+            if covered:
+                scored.append((-covered / (shift_end - shift_start), -covered, shift_start, shift_end))
+        scored.sort()
+
+        for _, _, shift_start, shift_end in scored:
+            length = shift_end - shift_start
+            for rate, emp_id in available:
+                if weekly_hours.get((emp_id, week), 0) + length <= self.max_weekly_hours:
+                    return (shift_start, shift_end), (rate, emp_id)
+        return None
@@ -0,0 +1,89 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from models.menu_item import MenuItem
+from models.order import OrderManager
+from services.report_cache import ReportCache
+from services.report_service import ReportService
+
+DAY = date(2025, 4, 10)
+
+
+class ReportCacheTest(unittest.TestCase):
+    def test_hit_until_a_day_in_range_changes(self):
+        cache = ReportCache()
+        cache.put("week", "отчет", (DAY, DAY + timedelta(days=6)))
+        self.assertEqual(cache.get("week"), "отчет")
+
+        cache.invalidate_day(DAY + timedelta(days=3))
+        self.assertIsNone(cache.get("week"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_change_outside_range_keeps_entry(self):
+        cache = ReportCache()
+        cache.put("week", "отчет", (DAY, DAY + timedelta(days=6)))
+        cache.invalidate_day(DAY - timedelta(days=1))
+        cache.invalidate_day(DAY + timedelta(days=7))
+        self.assertEqual(cache.get("week"), "отчет")
+
+    def test_long_range_checks_only_changed_days(self):
+        cache = ReportCache()
+        cache.put("year", "отчет", (DAY, DAY + timedelta(days=364)))
+        cache.invalidate_day(DAY - timedelta(days=30))
+        self.assertEqual(cache.get("year"), "отчет")
+        cache.invalidate_day(DAY + timedelta(days=200))
+        self.assertIsNone(cache.get("year"))
+
+    def test_entry_without_range_depends_on_every_day(self):
+        cache = ReportCache()
+        cache.put("all", "отчет")
+        cache.invalidate_day(date(2000, 1, 1))
+        self.assertIsNone(cache.get("all"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ReportCache(max_entries=2)
+        cache.put("a", "A", (DAY, DAY))
+        cache.put("b", "B", (DAY, DAY))
+        self.assertEqual(cache.get("a"), "A")
+
+        cache.put("c", "C", (DAY, DAY))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(cache.get("c"), "C")
+
+
+class ReportServiceCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.order_manager = OrderManager()
+        self.report_service = ReportService(self.order_manager)
+        self.tea = MenuItem("Чай", "", 10.0)
+
+    def pay(self, day: date, quantity: int = 1):
+        order = self.order_manager.create_order(1)
+        order.creation_time = datetime.combine(day, datetime.min.time()) + timedelta(hours=12)
+        order.add_item(self.tea, quantity)
+        order.mark_as_paid("cash")
+        self.report_service.record_paid_order(order)
+        return order
+
+    def report(self, first: date, last: date) -> str:
+        return self.report_service.generate_sales_report(
+            datetime.combine(first, datetime.min.time()), datetime.combine(last, datetime.min.time()))
+
+    def test_payment_invalidates_only_reports_covering_its_day(self):
+        self.pay(DAY)
+        first_week = self.report(DAY, DAY + timedelta(days=6))
+        second_week = self.report(DAY + timedelta(days=7), DAY + timedelta(days=13))
+
+        self.pay(DAY + timedelta(days=2), quantity=3)
+        hits = self.report_service.cache.hits
+        self.assertEqual(self.report(DAY + timedelta(days=7), DAY + timedelta(days=13)), second_week)
+        self.assertEqual(self.report_service.cache.hits, hits + 1)
+
+        updated = self.report(DAY, DAY + timedelta(days=6))
+        self.assertNotEqual(updated, first_week)
+        self.assertIn("Чай: 4", updated)
+
+
+if __name__ == "__main__":
+    unittest.main()
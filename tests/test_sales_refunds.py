@@ -0,0 +1,125 @@
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from interfaces.report_interface import APPROXIMATE_TOP_DISHES
+from models.menu_item import MenuItem
+from models.order import OrderManager
+from services.heavy_hitters import SpaceSavingCounter
+from services.report_service import ReportService
+from services.sales_aggregator import DailySalesAggregator
+
+DAY = date(2025, 4, 10)
+TEA = MenuItem("Чай", "", 10.0)
+SOUP = MenuItem("Суп", "", 25.0)
+
+
+def make_order(order_manager: OrderManager, *items):
+    order = order_manager.create_order(1)
+    order.creation_time = datetime.combine(DAY, datetime.min.time()) + timedelta(hours=12)
+    for menu_item, quantity in items:
+        order.add_item(menu_item, quantity)
+    order.mark_as_paid("cash")
+    return order
+
+
+class SalesAggregatorRefundTest(unittest.TestCase):
+    def setUp(self):
+        self.order_manager = OrderManager()
+        self.aggregator = DailySalesAggregator()
+
+    def test_order_is_counted_once(self):
+        order = make_order(self.order_manager, (TEA, 2))
+        self.assertTrue(self.aggregator.record_order(order))
+        self.assertFalse(self.aggregator.record_order(order))
+
+        summary = self.aggregator.summarize(DAY, DAY)
+        self.assertEqual((summary["orders"], summary["revenue"]), (1, 20.0))
+
+    def test_refund_subtracts_what_was_recorded(self):
+        kept = make_order(self.order_manager, (TEA, 1), (SOUP, 1))
+        refunded = make_order(self.order_manager, (TEA, 3))
+        self.aggregator.record_order(kept)
+        self.aggregator.record_order(refunded)
+
+        # Изменение заказа после оплаты не влияет на вычитаемые значения
+        refunded.add_item(SOUP, 5)
+        self.assertTrue(self.aggregator.remove_order(refunded))
+        self.assertFalse(self.aggregator.remove_order(refunded))
+
+        summary = self.aggregator.summarize(DAY, DAY)
+        self.assertEqual((summary["orders"], summary["revenue"]), (1, 35.0))
+        self.assertEqual(summary["dish_counts"], {"Чай": 1, "Суп": 1})
+        self.assertEqual(self.aggregator.revenue_rollup.total(DAY, DAY), 35.0)
+
+    def test_fully_refunded_dish_disappears(self):
+        order = make_order(self.order_manager, (SOUP, 2))
+        self.aggregator.record_order(order)
+        self.aggregator.remove_order(order)
+        self.assertEqual(self.aggregator.summarize(DAY, DAY)["dish_counts"], {})
+
+    def test_refund_in_approximate_mode(self):
+        aggregator = DailySalesAggregator(APPROXIMATE_TOP_DISHES)
+        order = make_order(self.order_manager, (TEA, 3))
+        aggregator.record_order(make_order(self.order_manager, (TEA, 1)))
+        aggregator.record_order(order)
+        aggregator.remove_order(order)
+        self.assertEqual(aggregator.summarize(DAY, DAY)["dish_counts"], {"Чай": 1})
+
+
+class SpaceSavingRefundTest(unittest.TestCase):
+    def test_refunds_do_not_lower_the_inherited_minimum(self):
+        counter = SpaceSavingCounter(capacity=2)
+        counter.add("a", 5)
+        counter.add("b", 5)
+        counter.add("c", 1)
+        counter.subtract("c", 1)
+        counter.subtract("b", 5)
+        # "a" вытеснен с пятью продажами и возвращается: оценка не может быть ниже шести
+        counter.add("a", 1)
+
+        estimates = dict(counter.items())
+        self.assertGreaterEqual(estimates["a"], 6)
+        self.assertLessEqual(estimates["a"] - counter.errors["a"], 6)
+
+    def test_refunds_keep_the_error_bound(self):
+        for seed in range(50):
+            rng = random.Random(seed)
+            counter = SpaceSavingCounter(capacity=5)
+            true_counts = {}
+            sold = []
+            for _ in range(300):
+                if sold and rng.random() < 0.25:
+                    key, count = sold.pop(rng.randrange(len(sold)))
+                    counter.subtract(key, count)
+                    true_counts[key] -= count
+                else:
+                    key, count = min(int(rng.expovariate(0.3)), 19), rng.randint(1, 3)
+                    counter.add(key, count)
+                    true_counts[key] = true_counts.get(key, 0) + count
+                    sold.append((key, count))
+
+            for key, estimate in counter.items():
+                self.assertLessEqual(true_counts[key], estimate)
+                self.assertLessEqual(estimate - counter.errors[key], true_counts[key])
+
+
+class ReportServiceRefundTest(unittest.TestCase):
+    def test_refund_after_caching_updates_the_report(self):
+        order_manager = OrderManager()
+        report_service = ReportService(order_manager)
+        start = datetime.combine(DAY, datetime.min.time())
+        for quantity in (1, 4):
+            report_service.record_paid_order(make_order(order_manager, (TEA, quantity)))
+
+        report = report_service.generate_sales_report(start, start)
+        self.assertIn("Чай: 5", report)
+
+        order_manager.get_order(2).mark_as_refunded()
+        report = report_service.generate_sales_report(start, start)
+        self.assertIn("Чай: 1", report)
+        self.assertNotIn("Чай: 5", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from datetime import date, datetime
+
+from adapters.legacy_system_adapter import LegacyEmployeeSystem, StaffAdapter
+from adapters.shift_intervals import MAX_SHIFT_DURATION, ShiftIntervalIndex, parse_shift, shift_intervals
+
+
+def make_index(*shifts):
+    index = ShiftIntervalIndex()
+    intervals, errors = shift_intervals([
+        {"emp_id": emp_id, "date": day, "start": start, "end": end} for emp_id, day, start, end in shifts
+    ])
+    assert not errors
+    index.add_many(intervals)
+    return index
+
+
+class ParseShiftTest(unittest.TestCase):
+    def test_overnight_shift_ends_next_day(self):
+        self.assertEqual(parse_shift("2025-04-10", "22:00", "02:00"),
+                         (datetime(2025, 4, 10, 22), datetime(2025, 4, 11, 2)))
+
+    def test_equal_start_and_end_is_a_full_day(self):
+        start, end = parse_shift("2025-04-10", "08:00", "08:00")
+        self.assertEqual(end - start, MAX_SHIFT_DURATION)
+
+
+class ShiftConflictTest(unittest.TestCase):
+    def test_shifts_touching_at_midnight_do_not_conflict(self):
+        index = make_index(("1", "2025-04-10", "16:00", "00:00"))
+        self.assertIsNone(index.find_conflict("1", datetime(2025, 4, 11), datetime(2025, 4, 11, 8)))
+
+    def test_overnight_shift_conflicts_after_midnight(self):
+        index = make_index(("1", "2025-04-10", "22:00", "02:00"))
+        conflict = index.find_conflict("1", datetime(2025, 4, 11, 1), datetime(2025, 4, 11, 5))
+        self.assertEqual(conflict[:3], (datetime(2025, 4, 10, 22), datetime(2025, 4, 11, 2), "1"))
+
+    def test_full_day_shift_conflicts_until_its_last_minute(self):
+        index = make_index(("1", "2025-04-10", "08:00", "08:00"))
+        self.assertIsNotNone(index.find_conflict("1", datetime(2025, 4, 11, 7, 59), datetime(2025, 4, 11, 9)))
+        self.assertIsNone(index.find_conflict("1", datetime(2025, 4, 11, 8), datetime(2025, 4, 11, 9)))
+
+    def test_other_employees_do_not_conflict(self):
+        index = make_index(("1", "2025-04-10", "22:00", "02:00"))
+        self.assertIsNone(index.find_conflict("2", datetime(2025, 4, 11, 1), datetime(2025, 4, 11, 5)))
+
+    def test_batch_conflicts_inside_the_batch(self):
+        intervals, _ = shift_intervals([
+            {"emp_id": "1", "date": "2025-04-10", "start": "20:00", "end": "01:00"},
+            {"emp_id": "1", "date": "2025-04-11", "start": "00:30", "end": "06:00"}
+        ])
+        self.assertEqual(len(ShiftIntervalIndex().find_batch_conflicts(intervals)), 1)
+
+    def test_conflicting_batch_is_rejected_as_a_whole(self):
+        system = LegacyEmployeeSystem()
+        self.assertFalse(system.add_shifts([
+            {"emp_id": "1", "date": "2025-04-12", "start": "08:00", "end": "12:00"},
+            {"emp_id": "4", "date": "2025-04-11", "start": "01:00", "end": "05:00"}
+        ]))
+        self.assertEqual(system.get_shifts_between(datetime(2025, 4, 12), datetime(2025, 4, 13)), [])
+
+
+class ShiftQueryTest(unittest.TestCase):
+    def test_full_day_shift_is_found_at_the_lookback_boundary(self):
+        index = make_index(("1", "2025-04-10", "08:00", "08:00"))
+        self.assertEqual(len(index.working_at(datetime(2025, 4, 11, 7, 59))), 1)
+        self.assertEqual(index.working_at(datetime(2025, 4, 11, 8)), [])
+
+    def test_overlapping_finds_shifts_started_before_the_range(self):
+        index = make_index(("1", "2025-04-10", "08:00", "08:00"), ("2", "2025-04-10", "16:00", "00:00"))
+        found = index.overlapping(datetime(2025, 4, 11), datetime(2025, 4, 12))
+        self.assertEqual([interval[2] for interval in found], ["1"])
+
+    def test_busy_days_cover_second_and_overnight_shifts(self):
+        adapter = StaffAdapter(LegacyEmployeeSystem())
+        self.assertTrue(adapter.import_schedule([
+            {"emp_id": "1", "date": "2025-04-10", "start": "20:00", "end": "03:00"}
+        ]))
+
+        busy = adapter.get_busy_days(date(2025, 4, 10), date(2025, 4, 12))
+        self.assertIn(("1", date(2025, 4, 11)), busy)
+        self.assertIn(("4", date(2025, 4, 11)), busy)
+        # Смена до полуночи следующий день не занимает
+        self.assertNotIn(("2", date(2025, 4, 11)), busy)
+        self.assertFalse(any(day == date(2025, 4, 12) for _, day in busy))
+
+
+if __name__ == "__main__":
+    unittest.main()